@@ -1,4 +1,4 @@
 # API routes module
-from app.api.routes import airports, flights, aircraft, pilots, dashboard
+from app.api.routes import airports, flights, aircraft, pilots, dashboard, reports, stats, metrics, search, analytics, stream, seed
 
-__all__ = ["airports", "flights", "aircraft", "pilots", "dashboard"]
+__all__ = ["airports", "flights", "aircraft", "pilots", "dashboard", "reports", "stats", "metrics", "search", "analytics", "stream", "seed"]
@@ -1,24 +1,31 @@
 """Aircraft API routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.models import Aircraft, AircraftCategory
 from app.schemas.schemas import AircraftCreate, AircraftUpdate, AircraftResponse
+from app.services.cache import dashboard_cache
+from app.services.reference_data import reference_cache
+from app.services.search import id_in, matching_ids
+from app.services.pagination import decode_cursor, seek_condition, set_next_cursor
+from app.services.versions import AIRCRAFT, bump_versions, conditional
 
 router = APIRouter(prefix="/aircraft", tags=["Aircraft"])
 
 
-@router.get("", response_model=List[AircraftResponse])
+@router.get("", response_model=List[AircraftResponse], dependencies=[conditional(AIRCRAFT)])
 async def list_aircraft(
+    response: Response,
     category: Optional[AircraftCategory] = None,
-    search: Optional[str] = Query(None, description="Search by tail number or owner"),
+    search: Optional[str] = Query(None, description="Search by tail number, owner, make or model (word prefixes)"),
     is_active: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; overrides skip"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all aircraft with optional filtering."""
     query = select(Aircraft)
@@ -30,36 +37,33 @@ async def list_aircraft(
         query = query.where(Aircraft.is_active == is_active)
     
     if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            (Aircraft.tail_number.ilike(search_term)) |
-            (Aircraft.owner_name.ilike(search_term)) |
-            (Aircraft.manufacturer.ilike(search_term)) |
-            (Aircraft.model.ilike(search_term))
-        )
+        query = query.where(id_in(Aircraft.id, matching_ids(reference_cache.aircraft, search)))
+    
+    query = query.order_by(Aircraft.id)
+    if cursor:
+        query = query.where(seek_condition((Aircraft.id,), decode_cursor(cursor, (int,)), descending=False))
+    else:
+        query = query.offset(skip)
     
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    result = await db.execute(query.limit(limit))
+    rows = result.scalars().all()
+    set_next_cursor(response, rows, limit, "id")
+    return rows
 
 
-@router.get("/{aircraft_id}", response_model=AircraftResponse)
-async def get_aircraft(aircraft_id: int, db: AsyncSession = Depends(get_db)):
+@router.get("/{aircraft_id}", response_model=AircraftResponse, dependencies=[conditional(AIRCRAFT)])
+async def get_aircraft(aircraft_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific aircraft by ID."""
-    result = await db.execute(select(Aircraft).where(Aircraft.id == aircraft_id))
-    aircraft = result.scalar_one_or_none()
+    aircraft = await reference_cache.aircraft.fetch(db, aircraft_id)
     if not aircraft:
         raise HTTPException(status_code=404, detail="Aircraft not found")
     return aircraft
 
 
-@router.get("/tail/{tail_number}", response_model=AircraftResponse)
-async def get_aircraft_by_tail(tail_number: str, db: AsyncSession = Depends(get_db)):
+@router.get("/tail/{tail_number}", response_model=AircraftResponse, dependencies=[conditional(AIRCRAFT)])
+async def get_aircraft_by_tail(tail_number: str, db: AsyncSession = Depends(get_read_db)):
     """Get aircraft by tail number."""
-    result = await db.execute(
-        select(Aircraft).where(Aircraft.tail_number == tail_number.upper())
-    )
-    aircraft = result.scalar_one_or_none()
+    aircraft = await reference_cache.aircraft.fetch_by_key(db, tail_number.upper())
     if not aircraft:
         raise HTTPException(status_code=404, detail="Aircraft not found")
     return aircraft
@@ -69,18 +73,17 @@ async def get_aircraft_by_tail(tail_number: str, db: AsyncSession = Depends(get_
 async def create_aircraft(aircraft: AircraftCreate, db: AsyncSession = Depends(get_db)):
     """Register a new aircraft."""
     # Check for duplicate
-    existing = await db.execute(
-        select(Aircraft).where(Aircraft.tail_number == aircraft.tail_number.upper())
-    )
-    if existing.scalar_one_or_none():
+    if await reference_cache.aircraft.fetch_by_key(db, aircraft.tail_number.upper()):
         raise HTTPException(status_code=400, detail="Aircraft with this tail number already exists")
     
     db_aircraft = Aircraft(**aircraft.model_dump())
     db_aircraft.tail_number = db_aircraft.tail_number.upper()
     db.add(db_aircraft)
+    versions = await bump_versions(db, AIRCRAFT)
     await db.commit()
+    dashboard_cache.invalidate()
     await db.refresh(db_aircraft)
-    return db_aircraft
+    return reference_cache.aircraft.put(db_aircraft, versions[AIRCRAFT])
 
 
 @router.patch("/{aircraft_id}", response_model=AircraftResponse)
@@ -99,9 +102,11 @@ async def update_aircraft(
     for field, value in update_data.items():
         setattr(db_aircraft, field, value)
     
+    versions = await bump_versions(db, AIRCRAFT)
     await db.commit()
+    dashboard_cache.invalidate()
     await db.refresh(db_aircraft)
-    return db_aircraft
+    return reference_cache.aircraft.put(db_aircraft, versions[AIRCRAFT])
 
 
 @router.delete("/{aircraft_id}", status_code=204)
@@ -113,4 +118,7 @@ async def delete_aircraft(aircraft_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Aircraft not found")
     
     await db.delete(aircraft)
+    versions = await bump_versions(db, AIRCRAFT)
     await db.commit()
+    dashboard_cache.invalidate()
+    reference_cache.aircraft.remove(aircraft_id, versions[AIRCRAFT])
@@ -1,24 +1,47 @@
 """Airport API routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core.compression import Precompressed, precompressed_response
+from app.core.database import get_db, get_read_db
 from app.models.models import Airport
-from app.schemas.schemas import AirportCreate, AirportUpdate, AirportResponse
+from app.schemas.schemas import AirportCreate, AirportUpdate, AirportResponse, AirportCluster, NearbyAirport
+from app.services.airport_geo import airport_clusters, airports_within, nearby_airports
+from app.services.geo import BBox
+from app.services.cache import dashboard_cache, reference_list_cache
+from app.services.reference_data import reference_cache
+from app.services.search import id_in, matching_ids
+from app.services.pagination import decode_cursor, seek_condition, set_next_cursor
+from app.services.serializers import json_response
+from app.services.versions import AIRPORTS, bump_versions, conditional, reference_synced
 
 router = APIRouter(prefix="/airports", tags=["Airports"])
 
+BBOX_DESCRIPTION = "min_lon,min_lat,max_lon,max_lat; min_lon > max_lon crosses the antimeridian"
 
-@router.get("", response_model=List[AirportResponse])
+
+def parse_bbox(bbox: str) -> BBox:
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise HTTPException(status_code=400, detail="bbox is out of range")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+@router.get("", response_model=List[AirportResponse], dependencies=[conditional(AIRPORTS)])
 async def list_airports(
+    response: Response,
     state: Optional[str] = Query(None, description="Filter by state"),
-    search: Optional[str] = Query(None, description="Search by name or code"),
+    search: Optional[str] = Query(None, description="Search by name, code or city (word prefixes)"),
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; overrides skip"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all airports with optional filtering."""
     query = select(Airport)
@@ -27,36 +50,78 @@ async def list_airports(
         query = query.where(Airport.state == state.upper())
     
     if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            (Airport.name.ilike(search_term)) |
-            (Airport.icao_code.ilike(search_term)) |
-            (Airport.faa_code.ilike(search_term)) |
-            (Airport.city.ilike(search_term))
-        )
+        query = query.where(id_in(Airport.id, matching_ids(reference_cache.airports, search)))
+    
+    query = query.order_by(Airport.id)
+    if cursor:
+        query = query.where(seek_condition((Airport.id,), decode_cursor(cursor, (int,)), descending=False))
+    else:
+        query = query.offset(skip)
     
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    result = await db.execute(query.limit(limit))
+    rows = result.scalars().all()
+    set_next_cursor(response, rows, limit, "id")
+    return rows
 
 
-@router.get("/{airport_id}", response_model=AirportResponse)
-async def get_airport(airport_id: int, db: AsyncSession = Depends(get_db)):
+@router.get("/nearby", response_model=List[NearbyAirport], dependencies=[conditional(AIRPORTS)])
+async def get_nearby_airports(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_nm: float = Query(50, gt=0, le=1000, description="Search radius in nautical miles"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Airports within `radius_nm` of a position, nearest first, with great-circle distances."""
+    nearby = await nearby_airports(db, lat, lon, radius_nm, limit)
+    return [{**airport.model_dump(), "distance_nm": round(distance, 2)} for distance, airport in nearby]
+
+
+@router.get("/within", response_model=List[AirportResponse], dependencies=[conditional(AIRPORTS)])
+async def get_airports_within(
+    request: Request,
+    bbox: str = Query(..., description=BBOX_DESCRIPTION),
+    limit: int = Query(5000, ge=1, le=50000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Airports inside a bounding box, e.g. the visible map area."""
+    box = parse_bbox(bbox)
+    if reference_cache.loaded_at is None:
+        airports = await airports_within(db, box, limit)
+        return json_response(reference_cache.airports.json_array(airports))
+
+    async def encode() -> Precompressed:
+        return Precompressed(reference_cache.airports.json_array(await airports_within(db, box, limit)))
+
+    key = ("airports_within", box, limit, reference_cache.airports.version)
+    return precompressed_response(request, await reference_list_cache.get(key, encode))
+
+
+@router.get("/clusters", response_model=List[AirportCluster], dependencies=[reference_synced(AIRPORTS)])
+async def get_airport_clusters(
+    bbox: str = Query(..., description=BBOX_DESCRIPTION),
+    zoom: int = Query(..., ge=0, le=22, description="Web map zoom level"),
+):
+    """
+    Clustered map markers for the visible area: centroid, airport count,
+    busiest airport and total recent flights per cluster.
+    """
+    return await airport_clusters(parse_bbox(bbox), zoom)
+
+
+@router.get("/{airport_id}", response_model=AirportResponse, dependencies=[conditional(AIRPORTS)])
+async def get_airport(airport_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific airport by ID."""
-    result = await db.execute(select(Airport).where(Airport.id == airport_id))
-    airport = result.scalar_one_or_none()
+    airport = await reference_cache.airports.fetch(db, airport_id)
     if not airport:
         raise HTTPException(status_code=404, detail="Airport not found")
     return airport
 
 
-@router.get("/code/{icao_code}", response_model=AirportResponse)
-async def get_airport_by_code(icao_code: str, db: AsyncSession = Depends(get_db)):
+@router.get("/code/{icao_code}", response_model=AirportResponse, dependencies=[conditional(AIRPORTS)])
+async def get_airport_by_code(icao_code: str, db: AsyncSession = Depends(get_read_db)):
     """Get airport by ICAO code."""
-    result = await db.execute(
-        select(Airport).where(Airport.icao_code == icao_code.upper())
-    )
-    airport = result.scalar_one_or_none()
+    airport = await reference_cache.airports.fetch_by_key(db, icao_code.upper())
     if not airport:
         raise HTTPException(status_code=404, detail="Airport not found")
     return airport
@@ -66,18 +131,17 @@ async def get_airport_by_code(icao_code: str, db: AsyncSession = Depends(get_db)
 async def create_airport(airport: AirportCreate, db: AsyncSession = Depends(get_db)):
     """Create a new airport."""
     # Check for duplicate
-    existing = await db.execute(
-        select(Airport).where(Airport.icao_code == airport.icao_code.upper())
-    )
-    if existing.scalar_one_or_none():
+    if await reference_cache.airports.fetch_by_key(db, airport.icao_code.upper()):
         raise HTTPException(status_code=400, detail="Airport with this ICAO code already exists")
     
     db_airport = Airport(**airport.model_dump())
     db_airport.icao_code = db_airport.icao_code.upper()
     db.add(db_airport)
+    versions = await bump_versions(db, AIRPORTS)
     await db.commit()
+    dashboard_cache.invalidate()
     await db.refresh(db_airport)
-    return db_airport
+    return reference_cache.airports.put(db_airport, versions[AIRPORTS])
 
 
 @router.patch("/{airport_id}", response_model=AirportResponse)
@@ -96,9 +160,11 @@ async def update_airport(
     for field, value in update_data.items():
         setattr(db_airport, field, value)
     
+    versions = await bump_versions(db, AIRPORTS)
     await db.commit()
+    dashboard_cache.invalidate()
     await db.refresh(db_airport)
-    return db_airport
+    return reference_cache.airports.put(db_airport, versions[AIRPORTS])
 
 
 @router.delete("/{airport_id}", status_code=204)
@@ -110,4 +176,7 @@ async def delete_airport(airport_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Airport not found")
     
     await db.delete(airport)
+    versions = await bump_versions(db, AIRPORTS)
     await db.commit()
+    dashboard_cache.invalidate()
+    reference_cache.airports.remove(airport_id, versions[AIRPORTS])
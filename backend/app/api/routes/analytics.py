@@ -0,0 +1,47 @@
+"""Flight analytics API routes, answered from the in-memory column store."""
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Query
+
+from app.schemas.schemas import AnalyticsRow
+from app.services.analytics import flight_columns, parse_group_by
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/flights", response_model=List[AnalyticsRow], response_model_exclude_none=True)
+async def aggregate_flights(
+    group_by: Optional[str] = Query(
+        None, description="Comma-separated subset of: airport_id, aircraft_id, pilot_id, flight_type, operation"
+    ),
+    bucket: Optional[str] = Query(
+        None, pattern="^(hour|day|week|month|year)$", description="Also split by time bucket (weeks start Monday)"
+    ),
+    airport_id: Optional[int] = None,
+    aircraft_id: Optional[int] = None,
+    pilot_id: Optional[int] = None,
+    flight_type: Optional[str] = None,
+    operation: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=100_000, description="Max groups to return"),
+):
+    """
+    Flight count and passenger, fuel and cargo totals over every flight, archived ones
+    included, grouped by any mix of columns and an optional time bucket.
+    Ordered by bucket, then by flight count (highest first). Reflects this process's
+    writes immediately and other workers' writes after the next reload.
+    """
+    await flight_columns.wait_loaded()
+    return flight_columns.aggregate(
+        group_by=parse_group_by(group_by),
+        bucket=bucket,
+        airport_id=airport_id,
+        aircraft_id=aircraft_id,
+        pilot_id=pilot_id,
+        flight_type=flight_type,
+        operation=operation,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+    )
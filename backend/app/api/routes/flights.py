@@ -1,88 +1,125 @@
 """Flight API routes."""
 from typing import List, Optional
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 
-from app.core.database import get_db
-from app.models.models import Flight, Airport, Aircraft, Pilot
-from app.schemas.schemas import FlightCreate, FlightUpdate, FlightResponse
+from app.core.database import get_db, get_read_db
+from app.models.models import Flight
+from app.schemas.schemas import FlightCreate, FlightUpdate, FlightResponse, FlightBulkCreate, FlightBulkResult
+from app.services.analytics import flight_columns
+from app.services.archive import fetch_page, flight_archive
+from app.services.export import export_response, negotiate_format
+from app.services.flight_ingest import ingest_flights
+from app.services.flight_queries import FLIGHT_ORDER, filter_flights, flight_rows_query
+from app.services.movements import movement_broker, publish_deleted, publish_flights
+from app.services.pagination import decode_cursor, set_next_cursor
+from app.services import pilot_stats, rollups
+from app.services.cache import dashboard_cache
+from app.services.reference_data import reference_cache
+from app.services.serializers import flight_json, flights_json, json_response, parse_fieldset, query_columns
+from app.services.versions import FLIGHT_RESPONSE_TABLES, FLIGHTS, PILOTS, bump_versions, conditional, reference_synced
 
 router = APIRouter(prefix="/flights", tags=["Flights"])
 
+FIELDS_DESCRIPTION = "Comma-separated flight columns to return (default: all)"
+EMBED_DESCRIPTION = "Comma-separated related objects to embed: airport, aircraft, pilot (default: all; empty for none)"
 
-@router.get("/pilot-history/{pilot_id}", response_model=List[FlightResponse])
+
+@router.get(
+    "/pilot-history/{pilot_id}",
+    response_model=List[FlightResponse],
+    dependencies=[conditional(*FLIGHT_RESPONSE_TABLES, clock_relative=True)],
+)
 async def get_pilot_flight_history(
     pilot_id: int,
     years_back: int = Query(10, ge=1, le=50, description="Number of years to look back"),
     skip: int = 0,
     limit: int = Query(500, le=5000, description="Max results to return"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; overrides skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    embed: Optional[str] = Query(None, description=EMBED_DESCRIPTION),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get complete flight history for a specific pilot.
     Defaults to last 10 years but can be extended up to 50 years.
+    The X-Next-Cursor response header holds the cursor for the next page.
+    Send `Accept: application/x-ndjson` or `text/csv` to stream the page instead.
+    `fields` and `embed` trim the JSON response; streamed pages always carry every column.
     """
     # Verify pilot exists
-    pilot_result = await db.execute(select(Pilot).where(Pilot.id == pilot_id))
-    pilot = pilot_result.scalar_one_or_none()
-    if not pilot:
+    if not await reference_cache.pilots.fetch(db, pilot_id):
         raise HTTPException(status_code=404, detail="Pilot not found")
     
-    lookback_date = datetime.now() - timedelta(days=years_back * 365)
-    
-    query = select(Flight).options(
-        selectinload(Flight.airport),
-        selectinload(Flight.aircraft),
-        selectinload(Flight.pilot_in_command)
-    ).where(
-        and_(
-            Flight.pic_id == pilot_id,
-            Flight.actual_time >= lookback_date
-        )
-    ).order_by(Flight.actual_time.desc()).offset(skip).limit(limit)
-    
-    result = await db.execute(query)
-    flights = result.scalars().all()
-    
-    response = []
-    for flight in flights:
-        flight_dict = {
-            "id": flight.id,
-            "airport_id": flight.airport_id,
-            "aircraft_id": flight.aircraft_id,
-            "pic_id": flight.pic_id,
-            "flight_type": flight.flight_type,
-            "operation": flight.operation,
-            "runway": flight.runway,
-            "scheduled_time": flight.scheduled_time,
-            "actual_time": flight.actual_time,
-            "origin_airport": flight.origin_airport,
-            "destination_airport": flight.destination_airport,
-            "passengers": flight.passengers,
-            "cargo_weight_lbs": flight.cargo_weight_lbs,
-            "fuel_gallons": flight.fuel_gallons,
-            "remarks": flight.remarks,
-            "squawk_code": flight.squawk_code,
-            "created_at": flight.created_at,
-            "updated_at": flight.updated_at,
-            "airport": flight.airport,
-            "aircraft": flight.aircraft,
-            "pilot": flight.pilot_in_command
-        }
-        response.append(flight_dict)
+    fmt = negotiate_format(accept)
+    fields, embed = parse_fieldset(fields, embed)
+    filters = dict(
+        pilot_id=pilot_id,
+        years_back=years_back,
+        after=decode_cursor(cursor, (datetime, int)) if cursor else None,
+    )
+    query = filter_flights(
+        flight_rows_query() if fmt else flight_rows_query(query_columns(fields, embed, "actual_time", "id")),
+        **filters,
+    ).order_by(*FLIGHT_ORDER)
+    if cursor:
+        skip = 0
+    if fmt:
+        return export_response(query, fmt, skip=skip, limit=limit, archive_filters=filters)
     
+    flights = await fetch_page(db, query, filters, skip, limit)
+    await reference_cache.load_related(db, flights, embed)
+    response = json_response(flights_json(flights, fields, embed))
+    set_next_cursor(response, flights, limit, "actual_time", "id")
     return response
 
 
-@router.get("", response_model=List[FlightResponse])
+@router.get("/export", dependencies=[reference_synced(PILOTS)])
+async def export_flights(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv|json)$", description="ndjson, csv or json"),
+    airport_id: Optional[int] = None,
+    aircraft_id: Optional[int] = None,
+    pilot_id: Optional[int] = None,
+    pilot_name: Optional[str] = Query(None, description="Search by pilot name (first or last, word prefixes)"),
+    flight_type: Optional[str] = None,
+    operation: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    years_back: Optional[int] = Query(None, ge=1, le=50, description="Number of years to look back"),
+):
+    """
+    Stream every matching flight, newest first, with no row cap.
+    Use this for full pilot logbooks and airport movement logs.
+    Archived flights are included when the date range reaches back to them.
+    """
+    filters = dict(
+        airport_id=airport_id,
+        aircraft_id=aircraft_id,
+        pilot_id=pilot_id,
+        pilot_name=pilot_name,
+        flight_type=flight_type,
+        operation=operation,
+        date_from=date_from,
+        date_to=date_to,
+        years_back=years_back,
+    )
+    query = filter_flights(flight_rows_query(), **filters).order_by(*FLIGHT_ORDER)
+    return export_response(query, fmt, filename="flights", archive_filters=filters)
+
+
+@router.get(
+    "",
+    response_model=List[FlightResponse],
+    dependencies=[conditional(*FLIGHT_RESPONSE_TABLES, clock_relative=True)],
+)
 async def list_flights(
     airport_id: Optional[int] = None,
     aircraft_id: Optional[int] = None,
     pilot_id: Optional[int] = None,
-    pilot_name: Optional[str] = Query(None, description="Search by pilot name (first or last)"),
+    pilot_name: Optional[str] = Query(None, description="Search by pilot name (first or last, word prefixes)"),
     flight_type: Optional[str] = None,
     operation: Optional[str] = None,
     date_from: Optional[datetime] = None,
@@ -90,121 +127,77 @@ async def list_flights(
     years_back: Optional[int] = Query(None, description="Number of years to look back (e.g., 10 for 10 years)"),
     skip: int = 0,
     limit: int = Query(100, le=1000, description="Max results to return (up to 1000)"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; overrides skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    embed: Optional[str] = Query(None, description=EMBED_DESCRIPTION),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List flights with optional filtering. Supports pilot name search and historical lookback."""
-    query = select(Flight).options(
-        selectinload(Flight.airport),
-        selectinload(Flight.aircraft),
-        selectinload(Flight.pilot_in_command)
+    """
+    List flights with optional filtering. Supports pilot name search and historical lookback.
+    The X-Next-Cursor response header holds the cursor for the next page.
+    Send `Accept: application/x-ndjson` or `text/csv` to stream the page instead.
+    `fields` and `embed` trim the JSON response; streamed pages always carry every column.
+    """
+    fmt = negotiate_format(accept)
+    fields, embed = parse_fieldset(fields, embed)
+    filters = dict(
+        airport_id=airport_id,
+        aircraft_id=aircraft_id,
+        pilot_id=pilot_id,
+        pilot_name=pilot_name,
+        flight_type=flight_type,
+        operation=operation,
+        date_from=date_from,
+        date_to=date_to,
+        years_back=years_back,
+        after=decode_cursor(cursor, (datetime, int)) if cursor else None,
     )
+    query = filter_flights(
+        flight_rows_query() if fmt else flight_rows_query(query_columns(fields, embed, "actual_time", "id")),
+        **filters,
+    ).order_by(*FLIGHT_ORDER)
+    if cursor:
+        skip = 0
+    if fmt:
+        return export_response(query, fmt, skip=skip, limit=limit, archive_filters=filters)
     
-    conditions = []
-    if airport_id:
-        conditions.append(Flight.airport_id == airport_id)
-    if aircraft_id:
-        conditions.append(Flight.aircraft_id == aircraft_id)
-    if pilot_id:
-        conditions.append(Flight.pic_id == pilot_id)
-    if flight_type:
-        conditions.append(Flight.flight_type == flight_type)
-    if operation:
-        conditions.append(Flight.operation == operation)
-    
-    # Handle date range - years_back takes precedence over date_from if both provided
-    if years_back:
-        lookback_date = datetime.now() - timedelta(days=years_back * 365)
-        conditions.append(Flight.actual_time >= lookback_date)
-    elif date_from:
-        conditions.append(Flight.actual_time >= date_from)
-    
-    if date_to:
-        conditions.append(Flight.actual_time <= date_to)
-    
-    # Pilot name search - join with Pilot table
-    if pilot_name:
-        search_term = f"%{pilot_name}%"
-        query = query.join(Pilot, Flight.pic_id == Pilot.id).where(
-            or_(
-                Pilot.first_name.ilike(search_term),
-                Pilot.last_name.ilike(search_term),
-                func.concat(Pilot.first_name, ' ', Pilot.last_name).ilike(search_term)
-            )
-        )
-    
-    if conditions:
-        query = query.where(and_(*conditions))
-    
-    query = query.order_by(Flight.actual_time.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    flights = result.scalars().all()
-    
-    # Map pilot relationship
-    response = []
-    for flight in flights:
-        flight_dict = {
-            "id": flight.id,
-            "airport_id": flight.airport_id,
-            "aircraft_id": flight.aircraft_id,
-            "pic_id": flight.pic_id,
-            "flight_type": flight.flight_type,
-            "operation": flight.operation,
-            "runway": flight.runway,
-            "scheduled_time": flight.scheduled_time,
-            "actual_time": flight.actual_time,
-            "origin_airport": flight.origin_airport,
-            "destination_airport": flight.destination_airport,
-            "passengers": flight.passengers,
-            "cargo_weight_lbs": flight.cargo_weight_lbs,
-            "fuel_gallons": flight.fuel_gallons,
-            "remarks": flight.remarks,
-            "squawk_code": flight.squawk_code,
-            "created_at": flight.created_at,
-            "updated_at": flight.updated_at,
-            "airport": flight.airport,
-            "aircraft": flight.aircraft,
-            "pilot": flight.pilot_in_command
-        }
-        response.append(flight_dict)
-    
+    flights = await fetch_page(db, query, filters, skip, limit)
+    await reference_cache.load_related(db, flights, embed)
+    response = json_response(flights_json(flights, fields, embed))
+    set_next_cursor(response, flights, limit, "actual_time", "id")
     return response
 
 
-@router.get("/{flight_id}", response_model=FlightResponse)
-async def get_flight(flight_id: int, db: AsyncSession = Depends(get_db)):
-    """Get a specific flight by ID."""
-    query = select(Flight).where(Flight.id == flight_id).options(
-        selectinload(Flight.airport),
-        selectinload(Flight.aircraft),
-        selectinload(Flight.pilot_in_command)
-    )
-    result = await db.execute(query)
-    flight = result.scalar_one_or_none()
+@router.get("/{flight_id}", response_model=FlightResponse, dependencies=[conditional(*FLIGHT_RESPONSE_TABLES)])
+async def get_flight(
+    flight_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    embed: Optional[str] = Query(None, description=EMBED_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a specific flight by ID, looking in the flight archive if it is not in the database."""
+    fields, embed = parse_fieldset(fields, embed)
+    result = await db.execute(flight_rows_query(query_columns(fields, embed, "id")).where(Flight.id == flight_id))
+    flight = result.first() or flight_archive.find(flight_id)
     if not flight:
         raise HTTPException(status_code=404, detail="Flight not found")
     
-    return {
-        **flight.__dict__,
-        "airport": flight.airport,
-        "aircraft": flight.aircraft,
-        "pilot": flight.pilot_in_command
-    }
+    await reference_cache.load_related(db, [flight], embed)
+    return json_response(flight_json(flight, fields, embed))
 
 
 @router.post("", response_model=FlightResponse, status_code=201)
 async def create_flight(flight: FlightCreate, db: AsyncSession = Depends(get_db)):
     """Log a new flight (takeoff/landing)."""
     # Verify foreign keys exist
-    airport = await db.execute(select(Airport).where(Airport.id == flight.airport_id))
-    if not airport.scalar_one_or_none():
+    if not await reference_cache.airports.fetch(db, flight.airport_id):
         raise HTTPException(status_code=400, detail="Airport not found")
     
-    aircraft = await db.execute(select(Aircraft).where(Aircraft.id == flight.aircraft_id))
-    if not aircraft.scalar_one_or_none():
+    if not await reference_cache.aircraft.fetch(db, flight.aircraft_id):
         raise HTTPException(status_code=400, detail="Aircraft not found")
     
-    pilot = await db.execute(select(Pilot).where(Pilot.id == flight.pic_id))
-    if not pilot.scalar_one_or_none():
+    if not await reference_cache.pilots.fetch(db, flight.pic_id):
         raise HTTPException(status_code=400, detail="Pilot not found")
     
     db_flight = Flight(**flight.model_dump())
@@ -212,23 +205,40 @@ async def create_flight(flight: FlightCreate, db: AsyncSession = Depends(get_db)
         db_flight.actual_time = datetime.utcnow()
     
     db.add(db_flight)
+    await rollups.record_flight(db, db_flight)
+    await pilot_stats.record_flight(db, db_flight)
+    await bump_versions(db, FLIGHTS)
     await db.commit()
+    dashboard_cache.invalidate()
     await db.refresh(db_flight)
+    flight_columns.upsert(db_flight)
     
-    # Load relationships
-    query = select(Flight).where(Flight.id == db_flight.id).options(
-        selectinload(Flight.airport),
-        selectinload(Flight.aircraft),
-        selectinload(Flight.pilot_in_command)
-    )
-    result = await db.execute(query)
-    flight = result.scalar_one()
+    await reference_cache.load_related(db, [db_flight])
+    body = flight_json(db_flight)
+    movement_broker.publish("created", db_flight, body)
+    return json_response(body, status_code=201)
+
+
+@router.post("/bulk", response_model=FlightBulkResult)
+async def create_flights_bulk(batch: FlightBulkCreate, db: AsyncSession = Depends(get_db)):
+    """Log many flights in one transaction.
+    
+    Each row takes the FlightCreate shape. Invalid rows and rows referencing a
+    missing airport, aircraft or pilot are reported in `errors` by index and
+    skipped; the remaining rows are still inserted.
+    """
+    ids, errors = await ingest_flights(db, batch.flights)
+    if any(flight_id is not None for flight_id in ids):
+        await bump_versions(db, FLIGHTS)
+    await db.commit()
+    dashboard_cache.invalidate()
+    await flight_columns.sync(db, ids)
+    await publish_flights(db, "created", ids)
     
     return {
-        **flight.__dict__,
-        "airport": flight.airport,
-        "aircraft": flight.aircraft,
-        "pilot": flight.pilot_in_command
+        "created": sum(1 for flight_id in ids if flight_id is not None),
+        "ids": ids,
+        "errors": errors
     }
 
 
@@ -244,13 +254,24 @@ async def update_flight(
     if not db_flight:
         raise HTTPException(status_code=404, detail="Flight not found")
     
+    before = rollups.flight_fact(db_flight)
+    stats_before = pilot_stats.flight_fact(db_flight)
     update_data = flight.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_flight, field, value)
+    await rollups.move_flight(db, before, db_flight)
+    await pilot_stats.move_flight(db, stats_before, db_flight)
+    await bump_versions(db, FLIGHTS)
     
     await db.commit()
+    dashboard_cache.invalidate()
     await db.refresh(db_flight)
-    return db_flight
+    flight_columns.upsert(db_flight)
+    
+    await reference_cache.load_related(db, [db_flight])
+    body = flight_json(db_flight)
+    movement_broker.publish("updated", db_flight, body)
+    return json_response(body)
 
 
 @router.delete("/{flight_id}", status_code=204)
@@ -261,5 +282,11 @@ async def delete_flight(flight_id: int, db: AsyncSession = Depends(get_db)):
     if not flight:
         raise HTTPException(status_code=404, detail="Flight not found")
     
+    await rollups.retract_flight(db, flight)
     await db.delete(flight)
+    await pilot_stats.retract_flight(db, flight)
+    await bump_versions(db, FLIGHTS)
     await db.commit()
+    dashboard_cache.invalidate()
+    flight_columns.remove(flight_id)
+    publish_deleted(flight)
@@ -0,0 +1,46 @@
+"""Runtime metrics API routes."""
+from typing import List
+from fastapi import APIRouter
+
+from app.core.database import engine, read_engine
+from app.core.pool import pool_stats
+from app.schemas.schemas import AnalyticsStoreStats, CacheStats, DatabasePoolStats, MovementStreamStats, ReferenceCacheStats
+from app.services.analytics import flight_columns
+from app.services.cache import cache_stats
+from app.services.movements import movement_broker
+from app.services.reference_data import reference_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/cache", response_model=List[CacheStats])
+async def get_cache_metrics():
+    """Hit/miss counters for this process's in-process caches."""
+    return cache_stats()
+
+
+@router.get("/reference-data", response_model=ReferenceCacheStats)
+async def get_reference_data_metrics():
+    """Versions, sizes and hit/miss counters of the airports/aircraft/pilots cache."""
+    return reference_cache.stats()
+
+
+@router.get("/db-pool", response_model=List[DatabasePoolStats])
+async def get_db_pool_metrics():
+    """Connection pool saturation and checkout wait times."""
+    pools = [pool_stats("primary", engine.pool)]
+    if read_engine is not engine:
+        pools.append(pool_stats("replica", read_engine.pool))
+    return pools
+
+
+@router.get("/analytics", response_model=AnalyticsStoreStats)
+async def get_analytics_metrics():
+    """Size and load state of the in-memory flight column store."""
+    return flight_columns.stats()
+
+
+@router.get("/stream", response_model=MovementStreamStats)
+async def get_stream_metrics():
+    """Subscribers and throughput of this process's live movement stream."""
+    return movement_broker.stats()
@@ -1,27 +1,43 @@
 """Pilot API routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.models import Pilot, PilotCertificate
-from app.schemas.schemas import PilotCreate, PilotUpdate, PilotResponse
+from app.schemas.schemas import PilotCreate, PilotUpdate, PilotResponse, PilotListItem, PilotStatsResponse, PilotCurrency
+from app.services.cache import dashboard_cache
+from app.services import pilot_stats
+from app.services.currency import CURRENCY_DAYS, CURRENCY_LANDINGS, CURRENCY_TAKEOFFS, pilot_currency
+from app.services.reference_data import reference_cache
+from app.services.search import id_in, matching_ids
+from app.services.pagination import decode_cursor, seek_condition, set_next_cursor
+from app.services.versions import FLIGHT_RESPONSE_TABLES, FLIGHTS, PILOTS, bump_versions, conditional
 
 router = APIRouter(prefix="/pilots", tags=["Pilots"])
 
 
-@router.get("", response_model=List[PilotResponse])
+@router.get("", response_model=List[PilotListItem], dependencies=[conditional(PILOTS, FLIGHTS)])
 async def list_pilots(
+    response: Response,
     certificate_type: Optional[PilotCertificate] = None,
-    search: Optional[str] = Query(None, description="Search by name or certificate number"),
+    search: Optional[str] = Query(None, description="Search by name or certificate number (word prefixes)"),
     is_active: Optional[bool] = None,
+    sort: str = Query(
+        "id",
+        pattern=pilot_stats.SORT_PATTERN,
+        description="id, last_name, total_flight_hours, flight_count, cross_country_count or last_flight_at; "
+                    "prefix with - for descending",
+    ),
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; overrides skip"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all pilots with optional filtering."""
-    query = select(Pilot)
+    """List all pilots with optional filtering, with their activity totals."""
+    listing = pilot_stats.pilot_list_query(sort)
+    query = listing.query
     
     if certificate_type:
         query = query.where(Pilot.certificate_type == certificate_type)
@@ -30,35 +46,67 @@ async def list_pilots(
         query = query.where(Pilot.is_active == is_active)
     
     if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            (Pilot.first_name.ilike(search_term)) |
-            (Pilot.last_name.ilike(search_term)) |
-            (Pilot.certificate_number.ilike(search_term))
-        )
+        query = query.where(id_in(Pilot.id, matching_ids(reference_cache.pilots, search)))
+    
+    if cursor:
+        query = query.where(seek_condition(
+            listing.columns, decode_cursor(cursor, listing.types), descending=listing.descending
+        ))
+    else:
+        query = query.offset(skip)
     
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    result = await db.execute(query.limit(limit))
+    rows = result.all()
+    set_next_cursor(response, rows, limit, *listing.attrs)
+    return rows
 
 
-@router.get("/{pilot_id}", response_model=PilotResponse)
-async def get_pilot(pilot_id: int, db: AsyncSession = Depends(get_db)):
+@router.get("/currency", response_model=List[PilotCurrency])
+async def get_pilot_currency(
+    days: int = Query(CURRENCY_DAYS, ge=1, le=3660, description="Recency window in days"),
+    takeoffs: int = Query(CURRENCY_TAKEOFFS, ge=1, le=100, description="Takeoffs required in the window"),
+    landings: int = Query(CURRENCY_LANDINGS, ge=1, le=100, description="Landings required in the window"),
+    require_medical: bool = Query(True, description="Also require an unexpired medical"),
+    is_current: Optional[bool] = Query(None, description="Only current (true) or lapsed (false) pilots"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Recency and medical status of every active pilot, with the date each pilot's
+    currency lapses. Touch-and-goes count as a takeoff and a landing.
+    """
+    pilots = await pilot_currency(
+        db, days=days, takeoffs=takeoffs, landings=landings, require_medical=require_medical
+    )
+    if is_current is not None:
+        pilots = [pilot for pilot in pilots if pilot["is_current"] == is_current]
+    return pilots
+
+
+@router.get("/{pilot_id}", response_model=PilotResponse, dependencies=[conditional(PILOTS)])
+async def get_pilot(pilot_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific pilot by ID."""
-    result = await db.execute(select(Pilot).where(Pilot.id == pilot_id))
-    pilot = result.scalar_one_or_none()
+    pilot = await reference_cache.pilots.fetch(db, pilot_id)
     if not pilot:
         raise HTTPException(status_code=404, detail="Pilot not found")
     return pilot
 
 
-@router.get("/certificate/{certificate_number}", response_model=PilotResponse)
-async def get_pilot_by_certificate(certificate_number: str, db: AsyncSession = Depends(get_db)):
+@router.get(
+    "/{pilot_id}/stats", response_model=PilotStatsResponse, dependencies=[conditional(*FLIGHT_RESPONSE_TABLES)]
+)
+async def get_pilot_stats(pilot_id: int, db: AsyncSession = Depends(get_read_db)):
+    """A pilot's flight totals and per year, flight type, aircraft category and airport counts."""
+    if not await reference_cache.pilots.fetch(db, pilot_id):
+        raise HTTPException(status_code=404, detail="Pilot not found")
+    return await pilot_stats.pilot_stats(db, pilot_id)
+
+
+@router.get(
+    "/certificate/{certificate_number}", response_model=PilotResponse, dependencies=[conditional(PILOTS)]
+)
+async def get_pilot_by_certificate(certificate_number: str, db: AsyncSession = Depends(get_read_db)):
     """Get pilot by certificate number."""
-    result = await db.execute(
-        select(Pilot).where(Pilot.certificate_number == certificate_number)
-    )
-    pilot = result.scalar_one_or_none()
+    pilot = await reference_cache.pilots.fetch_by_key(db, certificate_number)
     if not pilot:
         raise HTTPException(status_code=404, detail="Pilot not found")
     return pilot
@@ -68,17 +116,16 @@ async def get_pilot_by_certificate(certificate_number: str, db: AsyncSession = D
 async def create_pilot(pilot: PilotCreate, db: AsyncSession = Depends(get_db)):
     """Register a new pilot."""
     # Check for duplicate
-    existing = await db.execute(
-        select(Pilot).where(Pilot.certificate_number == pilot.certificate_number)
-    )
-    if existing.scalar_one_or_none():
+    if await reference_cache.pilots.fetch_by_key(db, pilot.certificate_number):
         raise HTTPException(status_code=400, detail="Pilot with this certificate number already exists")
     
     db_pilot = Pilot(**pilot.model_dump())
     db.add(db_pilot)
+    versions = await bump_versions(db, PILOTS)
     await db.commit()
+    dashboard_cache.invalidate()
     await db.refresh(db_pilot)
-    return db_pilot
+    return reference_cache.pilots.put(db_pilot, versions[PILOTS])
 
 
 @router.patch("/{pilot_id}", response_model=PilotResponse)
@@ -97,9 +144,11 @@ async def update_pilot(
     for field, value in update_data.items():
         setattr(db_pilot, field, value)
     
+    versions = await bump_versions(db, PILOTS)
     await db.commit()
+    dashboard_cache.invalidate()
     await db.refresh(db_pilot)
-    return db_pilot
+    return reference_cache.pilots.put(db_pilot, versions[PILOTS])
 
 
 @router.delete("/{pilot_id}", status_code=204)
@@ -110,5 +159,9 @@ async def delete_pilot(pilot_id: int, db: AsyncSession = Depends(get_db)):
     if not pilot:
         raise HTTPException(status_code=404, detail="Pilot not found")
     
+    await pilot_stats.forget_pilot(db, pilot_id)
     await db.delete(pilot)
+    versions = await bump_versions(db, PILOTS)
     await db.commit()
+    dashboard_cache.invalidate()
+    reference_cache.pilots.remove(pilot_id, versions[PILOTS])
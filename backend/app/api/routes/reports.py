@@ -0,0 +1,75 @@
+"""Report API routes."""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.models.models import Airport, Aircraft, Pilot
+from app.schemas.schemas import ReportKind, ReportRequest, ReportJobResponse
+from app.services.reports import DONE, ReportJob, report_manager
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+# Subject each report kind is about: (request field, model, required)
+REPORT_SUBJECTS = {
+    ReportKind.PILOT_LOGBOOK: ("pilot_id", Pilot, True),
+    ReportKind.AIRPORT_MOVEMENTS: ("airport_id", Airport, False),
+    ReportKind.AIRCRAFT: ("aircraft_id", Aircraft, True),
+}
+
+
+def _job_response(job: ReportJob) -> ReportJobResponse:
+    return ReportJobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        rows=job.rows,
+        pages=job.pages,
+        error=job.error,
+        download_url=f"/api/v1/reports/{job.id}/download" if job.status == DONE else None,
+    )
+
+
+@router.post("", response_model=ReportJobResponse, status_code=202)
+async def create_report(report: ReportRequest, db: AsyncSession = Depends(get_read_db)):
+    """
+    Queue a PDF report. Poll the returned job until its status is `done`,
+    then fetch `download_url`. Identical in-flight requests share one job.
+    """
+    field, model, required = REPORT_SUBJECTS[report.kind]
+    subject_id = getattr(report, field)
+    if subject_id is None:
+        if required:
+            raise HTTPException(status_code=400, detail=f"{field} is required for {report.kind.value} reports")
+    elif not await db.get(model, subject_id):
+        raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+    
+    params = report.model_dump(mode="json", exclude={"kind"}, exclude_none=True)
+    job = report_manager.submit(report.kind, params)
+    return _job_response(job)
+
+
+@router.get("/{job_id}", response_model=ReportJobResponse)
+async def get_report(job_id: str):
+    """Get the status of a report job."""
+    job = report_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return _job_response(job)
+
+
+@router.get("/{job_id}/download")
+async def download_report(job_id: str):
+    """Download a finished report."""
+    job = report_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if job.status != DONE:
+        raise HTTPException(status_code=409, detail=f"Report is {job.status}")
+    return FileResponse(
+        job.path,
+        media_type="application/pdf",
+        filename=f"{job.kind.value.replace('_', '-')}-{job.created_at:%Y-%m-%d}.pdf",
+    )
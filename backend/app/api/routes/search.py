@@ -0,0 +1,22 @@
+"""Typeahead search API routes."""
+from typing import List, Optional
+from fastapi import APIRouter, Query
+
+from app.schemas.schemas import SearchResult
+from app.services.search import parse_types, search
+from app.services.versions import AIRCRAFT, AIRPORTS, PILOTS, reference_synced
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=List[SearchResult], dependencies=[reference_synced(AIRPORTS, AIRCRAFT, PILOTS)])
+async def search_reference_data(
+    q: str = Query(..., min_length=1, max_length=100, description="Words to match, e.g. 'kbdu' or 'john smi'"),
+    types: Optional[str] = Query(None, description="Comma-separated subset of: airport, aircraft, pilot"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Search airports, aircraft and pilots by word prefix, best matches first.
+    Served from memory; suitable for search-as-you-type.
+    """
+    return search(q, parse_types(types), limit)
@@ -0,0 +1,42 @@
+"""Synthetic data seeding routes."""
+from fastapi import APIRouter, HTTPException
+
+from app.schemas.schemas import SeedJobResponse, SyntheticSeedRequest
+from app.services.synthetic import SeedJob, SyntheticSpec, seed_jobs
+
+router = APIRouter(prefix="/seed", tags=["Seed"])
+
+
+def _job_response(job: SeedJob) -> SeedJobResponse:
+    return SeedJobResponse(
+        id=job.id,
+        status=job.status,
+        phase=job.phase,
+        flights_written=job.flights_written,
+        flights_total=job.spec.flights,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        error=job.error,
+    )
+
+
+@router.post("/synthetic", response_model=SeedJobResponse, status_code=202)
+async def seed_synthetic(request: SyntheticSeedRequest):
+    """
+    Generate a reproducible synthetic dataset in the background. Poll the
+    returned job for progress. The database must be empty unless `force` is
+    set, which replaces all airports, aircraft, pilots and flights.
+    """
+    if seed_jobs.running:
+        raise HTTPException(status_code=409, detail=f"Seed job {seed_jobs.running.id} is still running")
+    job = seed_jobs.submit(SyntheticSpec(**request.model_dump()))
+    return _job_response(job)
+
+
+@router.get("/synthetic/{job_id}", response_model=SeedJobResponse)
+async def get_seed_job(job_id: str):
+    """Get the status and progress of a seed job."""
+    job = seed_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Seed job not found")
+    return _job_response(job)
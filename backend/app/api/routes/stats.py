@@ -0,0 +1,51 @@
+"""Traffic statistics API routes, answered from the flight rollups."""
+from datetime import datetime, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.schemas.schemas import TimeseriesPoint
+from app.services.rollups import DAY, timeseries_query
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+# Default window per granularity when date_from is not given
+DEFAULT_WINDOWS = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+
+
+@router.get("/timeseries", response_model=List[TimeseriesPoint])
+async def get_timeseries(
+    granularity: str = Query(DAY, pattern="^(hour|day)$", description="Bucket size: hour or day"),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    airport_id: Optional[int] = None,
+    flight_type: Optional[str] = None,
+    operation: Optional[str] = None,
+    group_by: Optional[str] = Query(
+        None, pattern="^(airport_id|flight_type|operation)$", description="Split each bucket by this column"
+    ),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Flight and passenger totals per hour or day. Empty buckets are omitted."""
+    date_to = date_to or datetime.utcnow()
+    date_from = date_from or date_to - DEFAULT_WINDOWS[granularity]
+    
+    result = await db.execute(timeseries_query(
+        granularity,
+        date_from,
+        date_to,
+        airport_id=airport_id,
+        flight_type=flight_type,
+        operation=operation,
+        group_by=group_by,
+    ))
+    return [
+        {
+            "bucket_start": row.bucket_start,
+            "group": str(getattr(row.group, "value", row.group)) if group_by else None,
+            "flight_count": row.flight_count,
+            "passengers": row.passengers,
+        }
+        for row in result.all()
+    ]
@@ -0,0 +1,91 @@
+"""Live flight movement push routes (Server-Sent Events and WebSocket)."""
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Header, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_settings
+from app.services.movements import movement_broker
+
+settings = get_settings()
+
+router = APIRouter(prefix="/stream", tags=["Stream"])
+
+# Tells EventSource clients how long to wait before reconnecting
+_RETRY_FRAME = b"retry: 3000\n\n"
+_KEEPALIVE_FRAME = b": keepalive\n\n"
+_KEEPALIVE_MESSAGE = '{"id":null,"event":"keepalive","flight":null}'
+
+
+@router.get("/movements")
+async def stream_movements(
+    airport_id: Optional[int] = None,
+    aircraft_id: Optional[int] = None,
+    pilot_id: Optional[int] = None,
+    cursor: Optional[str] = Query(None, description="Event id to resume after (Last-Event-ID takes precedence)"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Server-Sent Events stream of flight movements as they are logged: `created`,
+    `updated` and `deleted` events whose data is the flight, optionally filtered by
+    airport, aircraft or pilot. Reconnecting with the last event id replays what was
+    missed; a `reset` event means the id is too old and the client should refetch.
+    A client that falls too far behind gets a `lagged` event and is disconnected.
+    """
+    after = last_event_id or cursor
+
+    async def events():
+        subscription = movement_broker.subscribe(
+            airport_id=airport_id, aircraft_id=aircraft_id, pilot_id=pilot_id, after=after
+        )
+        try:
+            yield _RETRY_FRAME
+            while True:
+                try:
+                    movement = await subscription.next(settings.MOVEMENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield _KEEPALIVE_FRAME
+                    continue
+                if movement is None:
+                    yield movement_broker.lagged_notice().sse
+                    return
+                yield movement.sse
+        finally:
+            movement_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/movements/ws")
+async def movements_socket(
+    websocket: WebSocket,
+    airport_id: Optional[int] = None,
+    aircraft_id: Optional[int] = None,
+    pilot_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    """The movement stream over a WebSocket: one JSON message {id, event, flight} per event."""
+    await websocket.accept()
+    subscription = movement_broker.subscribe(
+        airport_id=airport_id, aircraft_id=aircraft_id, pilot_id=pilot_id, after=cursor
+    )
+    try:
+        while True:
+            try:
+                movement = await subscription.next(settings.MOVEMENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                await websocket.send_text(_KEEPALIVE_MESSAGE)
+                continue
+            if movement is None:
+                await websocket.send_text(movement_broker.lagged_notice().message.decode())
+                await websocket.close(code=1013)  # try again later
+                return
+            await websocket.send_text(movement.message.decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        movement_broker.unsubscribe(subscription)
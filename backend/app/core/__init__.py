@@ -1,5 +1,5 @@
 # Core module
 from app.core.config import get_settings
-from app.core.database import get_db, Base
+from app.core.database import get_db, get_read_db, Base
 
-__all__ = ["get_settings", "get_db", "Base"]
+__all__ = ["get_settings", "get_db", "get_read_db", "Base"]
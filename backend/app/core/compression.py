@@ -0,0 +1,239 @@
+"""Response compression negotiated from Accept-Encoding.
+
+CompressionMiddleware compresses text-like responses of at least
+COMPRESSION_MIN_BYTES with the best encoding the client accepts: zstd, then
+brotli, then gzip. brotli and zstd are used when their packages are
+installed; gzip is always available. A streamed response (NDJSON/CSV
+exports) is compressed chunk by chunk, each chunk flushed so rows still
+reach the client as they are produced. Server-Sent Events are left alone.
+
+Responses served from an in-process cache are compressed once instead: the
+cache stores a `Precompressed` body, which encodes itself at most once per
+encoding, and the route answers with `precompressed_response`. The middleware
+passes through any response that already has a Content-Encoding.
+
+A strong ETag names one exact body, so a compressed response carries the
+identity tag with the encoding appended ("abc" becomes "abc-br");
+`decoded_etag` maps a tag a client sends back to the identity one.
+"""
+import gzip
+import zlib
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import get_settings
+from app.core.encoding import JSON_MEDIA_TYPE
+
+try:
+    import brotli
+except ImportError:  # optional: brotli is offered when installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is offered when installed
+    zstandard = None
+
+settings = get_settings()
+
+# Preferred first when the client accepts several at the same q
+ENCODINGS: List[str] = [
+    *(["zstd"] if zstandard is not None else []),
+    *(["br"] if brotli is not None else []),
+    "gzip",
+]
+# Media types worth compressing; everything else (PDF, Parquet, images) already is or is tiny
+_COMPRESSIBLE_PREFIXES = (b"text/", b"application/json", b"application/x-ndjson", b"application/javascript")
+_UNCOMPRESSED_TYPES = (b"text/event-stream",)
+
+# Levels for bodies compressed per request, and for cached bodies compressed once
+_FAST_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+_BEST_LEVELS = {"gzip": 9, "br": 9, "zstd": 12}
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """The encoding to use for a request's Accept-Encoding, or None for identity."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def encoded_etag(tag: str, encoding: str) -> str:
+    """The strong ETag of the `encoding`-compressed body; weak tags stay as they are."""
+    if tag.startswith('"') and tag.endswith('"'):
+        return f'{tag[:-1]}-{encoding}"'
+    return tag
+
+
+def decoded_etag(tag: str) -> str:
+    """The identity-body ETag behind a tag made by `encoded_etag`."""
+    for encoding in ("zstd", "br", "gzip"):
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """`body` compressed in one piece."""
+    level = (_BEST_LEVELS if best else _FAST_LEVELS)[encoding]
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class StreamCompressor:
+    """Compresses a streamed body chunk by chunk, flushing after each chunk."""
+
+    def __init__(self, encoding: str):
+        level = _FAST_LEVELS[encoding]
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "zstd":
+            return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class Precompressed:
+    """A cached response body with its compressed forms, each made on first use."""
+
+    __slots__ = ("body", "_encoded")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None or len(self.body) < settings.COMPRESSION_MIN_BYTES:
+            return self.body
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            encoded = self._encoded[encoding] = compress(self.body, encoding, best=True)
+        return encoded
+
+
+def precompressed_response(request: Request, cached: Precompressed, media_type: str = JSON_MEDIA_TYPE) -> Response:
+    """Answer with the cached body in the encoding the client prefers."""
+    encoding = negotiate(request.headers.get("accept-encoding")) if settings.COMPRESSION_ENABLED else None
+    body = cached.encoded(encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if body is not cached.body:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _header(headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _compressible(headers) -> bool:
+    if _header(headers, b"content-encoding") is not None:
+        return False
+    content_type = (_header(headers, b"content-type") or b"").lower()
+    return content_type.startswith(_COMPRESSIBLE_PREFIXES) and not content_type.startswith(_UNCOMPRESSED_TYPES)
+
+
+def _encoded_headers(headers, encoding: str) -> list:
+    kept = [(key, value) for key, value in headers if key.lower() not in (b"content-length", b"vary", b"etag")]
+    vary = _header(headers, b"vary")
+    vary = vary + b", Accept-Encoding" if vary and b"accept-encoding" not in vary.lower() else vary or b"Accept-Encoding"
+    encoded = [*kept, (b"content-encoding", encoding.encode()), (b"vary", vary)]
+    etag = _header(headers, b"etag")
+    if etag is not None:
+        encoded.append((b"etag", encoded_etag(etag.decode("latin-1"), encoding).encode("latin-1")))
+    return encoded
+
+
+class CompressionMiddleware:
+    """Compress text-like responses with the encoding negotiated from Accept-Encoding.
+
+    Pure ASGI: a single-part body is compressed whole (or sent as is when below
+    COMPRESSION_MIN_BYTES), and a streamed body is compressed as it streams.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = next((value for key, value in scope["headers"] if key == b"accept-encoding"), b"")
+        encoding = negotiate(accept_encoding.decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor: Optional[StreamCompressor] = None
+
+        async def send_compressed(message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                if _compressible(message.get("headers", [])):
+                    start = message  # held until the first body part shows whether to compress
+                    return
+                await send(message)
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body:
+                    headers = start.get("headers", [])
+                    if len(body) >= settings.COMPRESSION_MIN_BYTES:
+                        body = compress(body, encoding)
+                        headers = [*_encoded_headers(headers, encoding), (b"content-length", str(len(body)).encode())]
+                    await send({**start, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    start = None
+                    return
+                compressor = StreamCompressor(encoding)
+                await send({**start, "headers": _encoded_headers(start.get("headers", []), encoding)})
+            data = compressor.chunk(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,5 +1,6 @@
 """Application configuration."""
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -10,6 +11,31 @@ class Settings(BaseSettings):
     # Database - supports both SQLite (dev) and PostgreSQL (prod)
     # Railway provides DATABASE_URL automatically when you add PostgreSQL
     DATABASE_URL: str = "sqlite+aiosqlite:///./airport_tracker.db"
+    # Optional replica for read-only routes; a client that just wrote keeps reading
+    # from the primary for READ_YOUR_WRITES_SECONDS
+    READ_DATABASE_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    
+    # Connection pool (file SQLite and PostgreSQL); timeouts fail fast rather than queue forever
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite pragmas: WAL lets readers run alongside the writer, busy_timeout makes
+    # concurrent writers wait for the lock instead of failing with "database is locked"
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456
+    
+    # PostgreSQL (asyncpg) connection settings; 0 disables a timeout
+    PG_APPLICATION_NAME: str = "airport-flight-tracker"
+    PG_STATEMENT_TIMEOUT_MS: int = 0
+    PG_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 0
+    PG_STATEMENT_CACHE_SIZE: int = 256
     
     # Security - MUST change in production
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -22,6 +48,43 @@ class Settings(BaseSettings):
     # CORS - Frontend URL for production
     FRONTEND_URL: str = "http://localhost:5173"
     
+    # Reports - rendered in a process pool, artifacts kept on local disk
+    REPORTS_DIR: str = "./reports"
+    REPORT_WORKERS: int = 2
+    REPORT_TTL_SECONDS: int = 3600
+    # Processes generating flights for synthetic datasets (POST /seed/synthetic)
+    SEED_WORKERS: int = 4
+    
+    # Flight archive - archive_flights.py moves flights older than ARCHIVE_AFTER_YEARS
+    # into monthly Parquet files here; flight queries reaching that far read them back
+    ARCHIVE_DIR: str = "./archive"
+    ARCHIVE_AFTER_YEARS: int = 10
+    
+    # Caching - dashboard stats are recomputed at most once per TTL unless a write invalidates them
+    DASHBOARD_CACHE_TTL_SECONDS: float = 15.0
+    # Airports/aircraft/pilots are held in memory and fully reloaded this often (0 disables)
+    REFERENCE_CACHE_REFRESH_SECONDS: int = 300
+    # Flight column store behind /analytics; write routes update it in place, and this
+    # full reload picks up other workers' writes (0 disables)
+    ANALYTICS_REFRESH_SECONDS: int = 900
+    # Conditional GETs - table change versions are re-read at most this often per process
+    # (other workers' writes can take this long to change an ETag), and responses may be
+    # reused this long without revalidating
+    ETAG_VERSION_TTL_SECONDS: float = 1.0
+    ETAG_MAX_AGE_SECONDS: int = 0
+    # Live movement stream - events kept for reconnecting clients to replay, events a
+    # subscriber may fall behind before it is dropped, and the keepalive interval
+    MOVEMENT_REPLAY_EVENTS: int = 1000
+    MOVEMENT_QUEUE_EVENTS: int = 256
+    MOVEMENT_HEARTBEAT_SECONDS: float = 15.0
+    # Per-airport flight counts used to weight the map clusters
+    AIRPORT_ACTIVITY_TTL_SECONDS: float = 60.0
+    # Encoded /airports/within responses, keyed by the airports version (so writes miss at once)
+    REFERENCE_LIST_CACHE_TTL_SECONDS: float = 300.0
+    # Response compression (zstd/brotli/gzip, negotiated) for bodies of at least this many bytes
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -29,13 +92,21 @@ class Settings(BaseSettings):
     @property
     def database_url(self) -> str:
         """Get the database URL, converting Railway's postgres:// to postgresql+asyncpg://"""
-        url = self.DATABASE_URL
-        # Railway uses postgres:// but SQLAlchemy needs postgresql+asyncpg://
-        if url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql+asyncpg://", 1)
-        elif url.startswith("postgresql://"):
-            url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        return url
+        return async_database_url(self.DATABASE_URL)
+    
+    @property
+    def read_database_url(self) -> Optional[str]:
+        return async_database_url(self.READ_DATABASE_URL) if self.READ_DATABASE_URL else None
+
+
+def async_database_url(url: str) -> str:
+    """`url` with the async driver SQLAlchemy needs."""
+    # Railway uses postgres:// but SQLAlchemy needs postgresql+asyncpg://
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
 
 
 @lru_cache()
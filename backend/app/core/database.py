@@ -1,16 +1,30 @@
-"""Database configuration and session management."""
+"""Database configuration and session management.
+
+Writes go to the primary engine (DATABASE_URL). Read-only routes use
+`get_read_db`, which reads from the READ_DATABASE_URL replica when one is
+configured. Read sessions never commit and, on PostgreSQL, run their
+transaction as READ ONLY DEFERRABLE.
+
+A replica may lag behind the primary, so reads go to the primary for
+READ_YOUR_WRITES_SECONDS after a write. That covers writes made through this
+process, and writes made through another worker by a client that echoes the
+X-Last-Write header it was sent with its last write.
+"""
+import time
+from typing import Optional
+
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import get_settings
+from app.core.pool import engine_options, install_sqlite_pragmas
 
 settings = get_settings()
 
 # Use the database_url property to handle Railway's postgres:// format
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.DEBUG,
-)
+engine = create_async_engine(settings.database_url, **engine_options(settings.database_url, settings, "primary"))
+install_sqlite_pragmas(engine, settings)
 
 async_session = async_sessionmaker(
     engine,
@@ -18,6 +32,20 @@ async_session = async_sessionmaker(
     expire_on_commit=False,
 )
 
+if settings.read_database_url:
+    read_engine = create_async_engine(
+        settings.read_database_url, **engine_options(settings.read_database_url, settings, "replica")
+    )
+    install_sqlite_pragmas(read_engine, settings)
+    read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+else:
+    read_engine = engine
+    read_session = async_session
+
+# Response header carrying the time (epoch ms) of a successful write
+LAST_WRITE_HEADER = "X-Last-Write"
+_last_local_write = 0.0
+
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
@@ -37,6 +65,67 @@ async def get_db():
             await session.close()
 
 
+def note_write() -> None:
+    """Record that a write just committed through this process."""
+    global _last_local_write
+    _last_local_write = time.time()
+
+
+def _wrote_recently(last_write: Optional[float]) -> bool:
+    return last_write is not None and time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+
+def _client_last_write(request: Optional[Request]) -> Optional[float]:
+    value = request.headers.get(LAST_WRITE_HEADER) if request is not None else None
+    try:
+        return int(value) / 1000 if value else None
+    except ValueError:
+        return None
+
+
+def read_session_for(request: Optional[Request] = None) -> AsyncSession:
+    """A session on the replica, or on the primary if a recent write must be visible."""
+    if read_session is async_session or _wrote_recently(_last_local_write) or _wrote_recently(
+        _client_last_write(request)
+    ):
+        return async_session()
+    return read_session()
+
+
+async def get_read_db(request: Request):
+    """Dependency for read-only routes: no commit, read-only transaction, replica if configured."""
+    async with read_session_for(request) as session:
+        if session.bind.dialect.name == "postgresql":
+            await session.connection(
+                execution_options={"postgresql_readonly": True, "postgresql_deferrable": True}
+            )
+        yield session
+
+
+class LastWriteMiddleware:
+    """Stamp successful non-GET responses with LAST_WRITE_HEADER and note the write.
+
+    Pure ASGI so streamed responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_stamp(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                note_write()
+                stamp = (LAST_WRITE_HEADER.lower().encode(), str(int(_last_local_write * 1000)).encode())
+                message = {**message, "headers": [*message.get("headers", []), stamp]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_stamp)
+
+
 async def create_tables():
     """Create all database tables."""
     from app.models import models  # noqa: F401
@@ -0,0 +1,33 @@
+"""JSON encoding shared by the hand-serialized responses.
+
+orjson is used when installed; otherwise the standard library encoder with
+the settings FastAPI's JSONResponse uses, so the bytes are the same either way.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode `value` compactly as UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(
+        value, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
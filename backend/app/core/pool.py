@@ -0,0 +1,167 @@
+"""Connection pool tuning and instrumentation.
+
+`engine_options` turns the DB_* / SQLITE_* / PG_* settings into
+create_async_engine arguments for the configured driver, and
+`install_sqlite_pragmas` applies the SQLite connection pragmas.
+
+SQLite (file databases) gets a real connection pool instead of
+SQLAlchemy's default of one new connection per session, plus WAL
+journaling, synchronous=NORMAL, a busy timeout and memory-mapped reads.
+With WAL, readers never block the writer. The busy timeout makes a second
+writer, for example another uvicorn worker, wait for the lock instead of
+failing with "database is locked".
+
+PostgreSQL (asyncpg) gets a bounded pool with pre-ping and recycling, plus
+per-connection server settings.
+
+`InstrumentedQueuePool` records how long each checkout waited for a
+connection and how often the pool ran out. These are reported with the
+pool's saturation (checked-out connections over its capacity) by
+`pool_stats`, which backs /metrics/db-pool.
+"""
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+# Recent checkout waits kept for percentiles
+WAIT_SAMPLE_SIZE = 1000
+
+
+class PoolMetrics:
+    """Checkout counters for one pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_checked_out = 0
+        self._recent_waits: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+    def record(self, wait: float, checked_out: int, timed_out: bool = False) -> None:
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self._recent_waits.append(wait)
+
+    def wait_percentile(self, fraction: float) -> float:
+        if not self._recent_waits:
+            return 0.0
+        waits = sorted(self._recent_waits)
+        return waits[min(len(waits) - 1, int(len(waits) * fraction))]
+
+
+# Keyed by pool logging name, which survives Pool.recreate() on dispose
+_metrics: Dict[str, PoolMetrics] = {}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times every checkout."""
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        return _metrics.setdefault(self._orig_logging_name or "default", PoolMetrics())
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - start, self.checkedout(), timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - start, self.checkedout())
+        return entry
+
+
+def _is_sqlite_memory(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, settings, name: str) -> Dict[str, Any]:
+    """create_async_engine keyword arguments for `url` under `settings`."""
+    parsed = make_url(url)
+    options: Dict[str, Any] = {"echo": settings.DEBUG}
+    if _is_sqlite_memory(parsed):
+        return options  # one shared connection (StaticPool); nothing to tune
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if parsed.get_backend_name() == "postgresql":
+        server_settings = {"application_name": settings.PG_APPLICATION_NAME}
+        if settings.PG_STATEMENT_TIMEOUT_MS:
+            server_settings["statement_timeout"] = str(settings.PG_STATEMENT_TIMEOUT_MS)
+        if settings.PG_IDLE_IN_TRANSACTION_TIMEOUT_MS:
+            server_settings["idle_in_transaction_session_timeout"] = str(settings.PG_IDLE_IN_TRANSACTION_TIMEOUT_MS)
+        options["connect_args"] = {
+            "server_settings": server_settings,
+            "statement_cache_size": settings.PG_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def sqlite_pragmas(settings) -> List[str]:
+    """PRAGMA statements run on every new SQLite connection."""
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = -{int(settings.SQLITE_CACHE_SIZE_KIB)}",
+        f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE_BYTES)}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if settings.SQLITE_JOURNAL_MODE:
+        pragmas.insert(0, f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    return pragmas
+
+
+def install_sqlite_pragmas(engine, settings) -> None:
+    """Run `sqlite_pragmas` on each new connection of a SQLite engine."""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(settings)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def pool_stats(name: str, pool: Pool) -> Dict[str, Any]:
+    """Size, saturation and checkout wait times of an engine's pool."""
+    stats: Dict[str, Any] = {"name": name, "pool_class": type(pool).__name__}
+    if isinstance(pool, InstrumentedQueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        metrics = pool.metrics
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            saturation=pool.checkedout() / capacity if capacity else 0.0,
+            peak_checked_out=metrics.peak_checked_out,
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            wait_ms_avg=1000 * metrics.total_wait / max(metrics.checkouts + metrics.timeouts, 1),
+            wait_ms_p95=1000 * metrics.wait_percentile(0.95),
+            wait_ms_max=1000 * metrics.max_wait,
+        )
+    return stats
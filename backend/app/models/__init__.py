@@ -1,4 +1,4 @@
 # Models module
-from app.models.models import Airport, Aircraft, Pilot, Flight, AircraftCategory, PilotCertificate, FlightType
+from app.models.models import Airport, Aircraft, Pilot, Flight, FlightRollup, PilotStats, PilotStatBreakdown, TableVersion, AircraftCategory, PilotCertificate, FlightType
 
-__all__ = ["Airport", "Aircraft", "Pilot", "Flight", "AircraftCategory", "PilotCertificate", "FlightType"]
+__all__ = ["Airport", "Aircraft", "Pilot", "Flight", "FlightRollup", "PilotStats", "PilotStatBreakdown", "TableVersion", "AircraftCategory", "PilotCertificate", "FlightType"]
@@ -1,7 +1,7 @@
 """SQLAlchemy models for Airport Flight Tracker."""
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Integer, Float, DateTime, ForeignKey, Text, Enum, Boolean
+from sqlalchemy import String, Integer, Float, DateTime, ForeignKey, Text, Enum, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -45,6 +45,10 @@ class FlightType(str, enum.Enum):
 class Airport(Base):
     """Airport model - FAA data for regional/municipal airports."""
     __tablename__ = "airports"
+    __table_args__ = (
+        # Bounding-box fallback for /airports/nearby and /airports/within
+        Index("ix_airports_latitude_longitude", "latitude", "longitude"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     icao_code: Mapped[str] = mapped_column(String(4), unique=True, index=True)
@@ -136,13 +140,23 @@ class Pilot(Base):
 class Flight(Base):
     """Flight log model - tracks individual takeoffs and landings."""
     __tablename__ = "flights"
+    __table_args__ = (
+        # Every flight listing orders by (actual_time, id), optionally filtered by
+        # one of the leading columns below. Keep in sync with migrations/versions.
+        Index("ix_flights_actual_time_id", "actual_time", "id", postgresql_include=["airport_id"]),
+        Index("ix_flights_pic_id_actual_time", "pic_id", "actual_time", "id"),
+        Index("ix_flights_airport_id_actual_time", "airport_id", "actual_time", "id"),
+        Index("ix_flights_aircraft_id_actual_time", "aircraft_id", "actual_time", "id"),
+        Index("ix_flights_flight_type_actual_time", "flight_type", "actual_time", "id"),
+        Index("ix_flights_operation_actual_time", "operation", "actual_time", "id"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
-    # Foreign keys
-    airport_id: Mapped[int] = mapped_column(Integer, ForeignKey("airports.id"), index=True)
-    aircraft_id: Mapped[int] = mapped_column(Integer, ForeignKey("aircraft.id"), index=True)
-    pic_id: Mapped[int] = mapped_column(Integer, ForeignKey("pilots.id"), index=True)
+    # Foreign keys (indexed through the composite indexes above)
+    airport_id: Mapped[int] = mapped_column(Integer, ForeignKey("airports.id"))
+    aircraft_id: Mapped[int] = mapped_column(Integer, ForeignKey("aircraft.id"))
+    pic_id: Mapped[int] = mapped_column(Integer, ForeignKey("pilots.id"))
     
     # Flight details
     flight_type: Mapped[FlightType] = mapped_column(Enum(FlightType))
@@ -177,3 +191,76 @@ class Flight(Base):
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class FlightRollup(Base):
+    """Pre-aggregated flight counts per airport, time bucket, flight type and operation.
+    
+    Maintained incrementally by the flight write routes (see app.services.rollups)
+    so dashboards and time series never scan the flights table.
+    """
+    __tablename__ = "flight_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity", "bucket_start", "airport_id", "flight_type", "operation",
+            name="uq_flight_rollups_key",
+        ),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    granularity: Mapped[str] = mapped_column(String(4))  # hour, day
+    bucket_start: Mapped[datetime] = mapped_column(DateTime)
+    airport_id: Mapped[int] = mapped_column(Integer, ForeignKey("airports.id"))
+    flight_type: Mapped[FlightType] = mapped_column(Enum(FlightType))
+    operation: Mapped[str] = mapped_column(String(20))
+    
+    flight_count: Mapped[int] = mapped_column(Integer, default=0)
+    passengers: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class PilotStats(Base):
+    """Logged activity of one pilot, over the flights they flew as PIC.
+    
+    Maintained incrementally by the flight write routes (see app.services.pilot_stats)
+    so pilot rosters can be sorted by activity without scanning the flights table.
+    """
+    __tablename__ = "pilot_stats"
+    __table_args__ = (
+        Index("ix_pilot_stats_flight_count", "flight_count", "pilot_id"),
+        Index("ix_pilot_stats_cross_country_count", "cross_country_count", "pilot_id"),
+        Index("ix_pilot_stats_last_flight_at", "last_flight_at", "pilot_id"),
+    )
+    
+    pilot_id: Mapped[int] = mapped_column(Integer, ForeignKey("pilots.id"), primary_key=True)
+    flight_count: Mapped[int] = mapped_column(Integer, default=0)
+    takeoffs: Mapped[int] = mapped_column(Integer, default=0)
+    landings: Mapped[int] = mapped_column(Integer, default=0)
+    cross_country_count: Mapped[int] = mapped_column(Integer, default=0)
+    passengers: Mapped[int] = mapped_column(Integer, default=0)
+    first_flight_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_flight_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+
+class PilotStatBreakdown(Base):
+    """A pilot's flight count per year, flight type, aircraft category or airport."""
+    __tablename__ = "pilot_stat_breakdowns"
+    __table_args__ = (
+        UniqueConstraint("pilot_id", "dimension", "key", name="uq_pilot_stat_breakdowns_key"),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    pilot_id: Mapped[int] = mapped_column(Integer, ForeignKey("pilots.id"))
+    dimension: Mapped[str] = mapped_column(String(20))  # year, flight_type, aircraft_category, airport
+    key: Mapped[str] = mapped_column(String(20))
+    flight_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class TableVersion(Base):
+    """Change counter of one table, bumped in every transaction that writes to it.
+    
+    Shared by all workers; the ETags of list and detail responses are derived from it.
+    """
+    __tablename__ = "table_versions"
+    
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
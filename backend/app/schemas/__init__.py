@@ -1,16 +1,24 @@
 # Schemas module
 from app.schemas.schemas import (
-    AirportCreate, AirportUpdate, AirportResponse,
+    AirportCreate, AirportUpdate, AirportResponse, NearbyAirport,
+    AirportCluster, AirportClusterMember,
     AircraftCreate, AircraftUpdate, AircraftResponse,
-    PilotCreate, PilotUpdate, PilotResponse,
+    PilotCreate, PilotUpdate, PilotResponse, PilotListItem, PilotStatCount, PilotStatsResponse, PilotCurrency,
     FlightCreate, FlightUpdate, FlightResponse,
-    DashboardStats
+    FlightBulkCreate, FlightBulkError, FlightBulkResult,
+    DashboardStats, CacheStats, DatabasePoolStats, ReferenceTableStats, ReferenceCacheStats, SearchResult, TimeseriesPoint,
+    SyntheticSeedRequest, SeedJobResponse,
+    ReportKind, ReportRequest, ReportJobResponse
 )
 
 __all__ = [
-    "AirportCreate", "AirportUpdate", "AirportResponse",
+    "AirportCreate", "AirportUpdate", "AirportResponse", "NearbyAirport",
+    "AirportCluster", "AirportClusterMember",
     "AircraftCreate", "AircraftUpdate", "AircraftResponse",
-    "PilotCreate", "PilotUpdate", "PilotResponse",
+    "PilotCreate", "PilotUpdate", "PilotResponse", "PilotListItem", "PilotStatCount", "PilotStatsResponse", "PilotCurrency",
     "FlightCreate", "FlightUpdate", "FlightResponse",
-    "DashboardStats"
+    "FlightBulkCreate", "FlightBulkError", "FlightBulkResult",
+    "DashboardStats", "CacheStats", "DatabasePoolStats", "ReferenceTableStats", "ReferenceCacheStats", "SearchResult", "TimeseriesPoint",
+    "SyntheticSeedRequest", "SeedJobResponse",
+    "ReportKind", "ReportRequest", "ReportJobResponse"
 ]
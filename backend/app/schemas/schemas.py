@@ -1,6 +1,7 @@
 """Pydantic schemas for API validation."""
+import enum
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from app.models.models import AircraftCategory, PilotCertificate, FlightType
@@ -49,6 +50,28 @@ class AirportResponse(AirportBase):
         from_attributes = True
 
 
+class NearbyAirport(AirportResponse):
+    """An airport with its great-circle distance from the query point."""
+    distance_nm: float
+
+
+class AirportClusterMember(BaseModel):
+    """The busiest airport of a map cluster."""
+    id: int
+    icao_code: str
+    name: str
+    flight_count: int
+
+
+class AirportCluster(BaseModel):
+    """A map marker standing for one or more nearby airports."""
+    latitude: float  # centroid of the member airports
+    longitude: float
+    count: int
+    weight: int  # flights at the member airports over the activity window
+    busiest: AirportClusterMember
+
+
 # Aircraft Schemas
 class AircraftBase(BaseModel):
     """Base aircraft schema."""
@@ -136,6 +159,56 @@ class PilotResponse(PilotBase):
         from_attributes = True
 
 
+class PilotListItem(PilotResponse):
+    """A pilot with activity totals, as listed by GET /pilots."""
+    flight_count: int = 0
+    cross_country_count: int = 0
+    last_flight_at: Optional[datetime] = None
+
+
+class PilotStatCount(BaseModel):
+    """Flights in one year, flight type, aircraft category or airport."""
+    key: str
+    label: Optional[str] = None
+    flight_count: int
+
+
+class PilotStatsResponse(BaseModel):
+    """A pilot's logged activity, over the flights they flew as PIC."""
+    pilot_id: int
+    flight_count: int
+    takeoffs: int
+    landings: int
+    cross_country_count: int
+    passengers: int
+    first_flight_at: Optional[datetime] = None
+    last_flight_at: Optional[datetime] = None
+    by_year: List[PilotStatCount]
+    by_flight_type: List[PilotStatCount]
+    by_aircraft_category: List[PilotStatCount]
+    by_airport: List[PilotStatCount]
+
+
+class PilotCurrency(BaseModel):
+    """Whether a pilot meets the recency and medical rules, and until when.
+
+    `current_until` is the earliest of the *_current_until dates and the
+    medical expiry; it is in the past for a pilot whose currency has lapsed,
+    and null when a requirement was never met in the window.
+    """
+    pilot_id: int
+    first_name: str
+    last_name: str
+    certificate_number: str
+    takeoffs: int
+    landings: int
+    takeoffs_current_until: Optional[datetime] = None
+    landings_current_until: Optional[datetime] = None
+    medical_expiry: Optional[datetime] = None
+    is_current: bool
+    current_until: Optional[datetime] = None
+
+
 # Flight Schemas
 class FlightBase(BaseModel):
     """Base flight schema."""
@@ -184,6 +257,28 @@ class FlightResponse(FlightBase):
         from_attributes = True
 
 
+class FlightBulkCreate(BaseModel):
+    """Schema for a bulk flight ingest.
+
+    Rows are validated individually against FlightCreate so that one bad row
+    is reported instead of rejecting the whole request.
+    """
+    flights: List[Dict[str, Any]] = Field(..., min_length=1, max_length=10_000)
+
+
+class FlightBulkError(BaseModel):
+    """A rejected row in a bulk flight ingest."""
+    index: int
+    detail: str
+
+
+class FlightBulkResult(BaseModel):
+    """Result of a bulk flight ingest."""
+    created: int
+    ids: List[Optional[int]]  # aligned with the request rows; null where rejected
+    errors: List[FlightBulkError]
+
+
 # Dashboard Schemas
 class DashboardStats(BaseModel):
     """Dashboard statistics."""
@@ -194,3 +289,164 @@ class DashboardStats(BaseModel):
     total_airports: int
     recent_flights: List[FlightResponse]
     busiest_airports: List[dict]
+
+
+class CacheStats(BaseModel):
+    """Hit/miss counters for one in-process cache."""
+    name: str
+    ttl_seconds: float
+    entries: int
+    hits: int
+    misses: int
+    refreshes: int
+    invalidations: int
+    hit_ratio: float
+
+
+class DatabasePoolStats(BaseModel):
+    """Connection pool usage for one database engine.
+
+    Only `name` and `pool_class` are reported for pools without a fixed size
+    (in-memory SQLite).
+    """
+    name: str
+    pool_class: str
+    size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    saturation: Optional[float] = None  # checked out / (size + max_overflow)
+    peak_checked_out: Optional[int] = None
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    wait_ms_avg: Optional[float] = None
+    wait_ms_p95: Optional[float] = None  # over the last 1000 checkouts
+    wait_ms_max: Optional[float] = None
+
+
+class ReferenceTableStats(BaseModel):
+    """Size, version and lookup counters for one reference-data table."""
+    name: str
+    version: int
+    db_version: int  # the table_versions counter the cached rows reflect
+    entries: int
+    hits: int
+    misses: int
+    indexed: int
+
+
+class ReferenceCacheStats(BaseModel):
+    """State of the in-memory airports/aircraft/pilots cache."""
+    loaded_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    tables: List[ReferenceTableStats]
+
+
+# Search Schemas
+class SearchResult(BaseModel):
+    """One typeahead match."""
+    type: str  # airport, aircraft or pilot
+    id: int
+    label: str
+    detail: Optional[str] = None
+    score: float
+
+
+# Stats Schemas
+class TimeseriesPoint(BaseModel):
+    """Flight totals for one time bucket."""
+    bucket_start: datetime
+    group: Optional[str] = None
+    flight_count: int
+    passengers: int
+
+
+# Analytics Schemas
+class AnalyticsRow(BaseModel):
+    """Flight totals for one group; only the grouped columns are set."""
+    bucket_start: Optional[datetime] = None
+    airport_id: Optional[int] = None
+    aircraft_id: Optional[int] = None
+    pilot_id: Optional[int] = None
+    flight_type: Optional[FlightType] = None
+    operation: Optional[str] = None
+    flight_count: int
+    passengers: int
+    fuel_gallons: float
+    cargo_weight_lbs: float
+
+
+class AnalyticsStoreStats(BaseModel):
+    """State of the in-memory flight column store."""
+    loaded_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    flights: int
+    memory_bytes: int
+
+
+class MovementStreamStats(BaseModel):
+    """State of the live movement broker."""
+    subscribers: int
+    published: int
+    lagged: int  # subscribers dropped for falling behind
+    replay_events: int
+    last_event_id: str
+
+
+# Seed Schemas
+class SyntheticSeedRequest(BaseModel):
+    """Size and random seed of a synthetic dataset; the same request generates the same data."""
+    flights: int = Field(100_000, ge=1, le=50_000_000)
+    airports: int = Field(250, ge=2, le=46_656)
+    aircraft: int = Field(3_000, ge=1, le=1_000_000)
+    pilots: int = Field(10_000, ge=1, le=1_000_000)
+    years: int = Field(15, ge=1, le=50)
+    seed: int = 42
+    end_date: Optional[datetime] = None  # last day of flights; today when omitted
+    force: bool = False  # replace existing data
+
+
+class SeedJobResponse(BaseModel):
+    """Status and progress of a synthetic seed job."""
+    id: str
+    status: str  # queued, running, done, failed
+    phase: Optional[str] = None  # clearing, reference, flights, rollups, pilot_stats, done
+    flights_written: int
+    flights_total: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+# Report Schemas
+class ReportKind(str, enum.Enum):
+    """Reports that can be rendered server-side."""
+    PILOT_LOGBOOK = "pilot_logbook"
+    AIRPORT_MOVEMENTS = "airport_movements"
+    AIRCRAFT = "aircraft"
+
+
+class ReportRequest(BaseModel):
+    """Schema for requesting a report."""
+    kind: ReportKind
+    pilot_id: Optional[int] = None
+    airport_id: Optional[int] = None
+    aircraft_id: Optional[int] = None
+    flight_type: Optional[FlightType] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    years_back: Optional[int] = Field(None, ge=1, le=50)
+
+
+class ReportJobResponse(BaseModel):
+    """Status of a report job."""
+    id: str
+    kind: ReportKind
+    status: str  # queued, running, done, failed
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    rows: Optional[int] = None
+    pages: Optional[int] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
@@ -0,0 +1 @@
+# Services module - business logic shared by the API routes
@@ -0,0 +1,103 @@
+"""Nearest-airport and bounding-box lookups.
+
+Both are answered from the spatial grid the reference cache keeps over airport
+positions. Until the cache has been loaded (for example when a script uses
+the app without its startup hook) they fall back to a latitude/longitude range
+query served by ix_airports_latitude_longitude, with great-circle distances
+measured in Python; no PostGIS or R-tree extension is needed.
+
+Map clusters come from the per-zoom ClusterIndex, weighted by each airport's
+flights over the last ACTIVITY_WINDOW_DAYS days (from the daily rollups,
+cached for AIRPORT_ACTIVITY_TTL_SECONDS).
+"""
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import read_session_for
+from app.models.models import Airport
+from app.schemas.schemas import AirportResponse
+from app.services.cache import airport_activity_cache
+from app.services.geo import BBox, Cluster, bbox_condition, great_circle_nm, radius_bbox
+from app.services.reference_data import reference_cache
+from app.services.rollups import airport_activity_query
+
+ACTIVITY_WINDOW_DAYS = 30
+
+
+async def _airports_in_bbox(db: AsyncSession, bbox: BBox) -> List[AirportResponse]:
+    result = await db.execute(select(Airport).where(bbox_condition(Airport.latitude, Airport.longitude, bbox)))
+    return [AirportResponse.model_validate(airport) for airport in result.scalars().all()]
+
+
+async def nearby_airports(
+    db: AsyncSession, lat: float, lon: float, radius_nm: float, limit: int
+) -> List[Tuple[float, AirportResponse]]:
+    """Up to `limit` (distance_nm, airport) pairs within `radius_nm`, nearest first."""
+    airports = reference_cache.airports
+    if reference_cache.loaded_at is not None:
+        nearest = airports.spatial.nearest(lat, lon, radius_nm, limit)
+        return [(distance, airports.get(airport_id)) for distance, airport_id in nearest]
+
+    candidates = []
+    for airport in await _airports_in_bbox(db, radius_bbox(lat, lon, radius_nm)):
+        distance = great_circle_nm(lat, lon, airport.latitude, airport.longitude)
+        if distance <= radius_nm:
+            candidates.append((distance, airport.id, airport))
+    return [(distance, airport) for distance, _, airport in heapq.nsmallest(limit, candidates)]
+
+
+async def airports_within(db: AsyncSession, bbox: BBox, limit: int) -> List[AirportResponse]:
+    """Airports inside `bbox`, by id."""
+    airports = reference_cache.airports
+    if reference_cache.loaded_at is not None:
+        return [airports.get(airport_id) for airport_id in sorted(airports.spatial.within(bbox))[:limit]]
+    return sorted(await _airports_in_bbox(db, bbox), key=lambda airport: airport.id)[:limit]
+
+
+async def _airport_activity() -> Dict[int, int]:
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    async with read_session_for() as db:
+        result = await db.execute(airport_activity_query(today_start - timedelta(days=ACTIVITY_WINDOW_DAYS)))
+        return {row.airport_id: int(row.flight_count) for row in result.all()}
+
+
+async def airport_clusters(bbox: BBox, zoom: int) -> List[dict]:
+    """Map markers for `bbox` at `zoom`, heaviest first.
+
+    Up to the index's max zoom these are the precomputed clusters of the
+    cells overlapping the box; beyond it every airport is its own marker.
+    """
+    if reference_cache.loaded_at is None:
+        await reference_cache.load()
+    activity = await airport_activity_cache.get("activity", _airport_activity)
+    airports = reference_cache.airports
+
+    if zoom > airports.clusters.max_zoom:
+        clusters = [
+            Cluster(airport.latitude, airport.longitude, 1, activity.get(airport.id, 0), airport.id)
+            for airport in (airports.get(airport_id) for airport_id in airports.spatial.within(bbox))
+        ]
+    else:
+        clusters = airports.clusters.clusters(bbox, zoom, activity)
+    clusters.sort(key=lambda cluster: (-cluster.weight, -cluster.count, cluster.busiest_id))
+
+    markers = []
+    for cluster in clusters:
+        busiest = airports.get(cluster.busiest_id)
+        markers.append({
+            "latitude": cluster.latitude,
+            "longitude": cluster.longitude,
+            "count": cluster.count,
+            "weight": cluster.weight,
+            "busiest": {
+                "id": busiest.id,
+                "icao_code": busiest.icao_code,
+                "name": busiest.name,
+                "flight_count": activity.get(busiest.id, 0),
+            },
+        })
+    return markers
@@ -0,0 +1,474 @@
+"""Columnar in-memory flight analytics.
+
+Every flight (including archived ones) is held as a set of NumPy arrays, one
+per column the aggregations need: int32 ids, int64 epoch-microsecond timestamps,
+uint8 flight type codes, int32 codes for the free-form operation and float32
+passengers, fuel and cargo, about 40 bytes a flight. Group-by and time-bucket queries then run
+as vectorized passes over those arrays instead of GROUP BYs over the row
+store.
+
+A query builds a boolean mask from its filters, turns each group-by column
+and the time bucket into a small integer code, and combines those into one
+key per flight. When the combined key space is small enough (it is for any
+realistic grouping) the groups are counted with np.bincount in one linear
+pass; otherwise they are found by sorting the keys.
+
+The store is loaded at startup and fully reloaded every
+ANALYTICS_REFRESH_SECONDS. The flight write routes keep this process's copy
+current between reloads by applying each committed change; writes arriving
+while a reload is running are replayed onto the new copy before it replaces
+the old one.
+"""
+import asyncio
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.models import Flight, FlightType
+from app.services.archive import flight_archive
+
+LOAD_CHUNK_ROWS = 50_000
+# How long a query waits for the first load before answering 503
+LOAD_WAIT_SECONDS = 10.0
+# Groupings whose combined key space fits in this many slots are counted with bincount
+DENSE_KEY_LIMIT = 1 << 24
+
+GROUP_COLUMNS = ("airport_id", "aircraft_id", "pilot_id", "flight_type", "operation")
+BUCKETS = ("hour", "day", "week", "month", "year")
+
+# Stored columns, in the order flights are read
+_FIELDS = ("id", "airport_id", "aircraft_id", "pic_id", "actual_time", "flight_type", "operation",
+           "passengers", "fuel_gallons", "cargo_weight_lbs")
+_DTYPES = {
+    "id": np.int32, "airport_id": np.int32, "aircraft_id": np.int32, "pic_id": np.int32,
+    "actual_time": np.int64, "flight_type": np.uint8, "operation": np.int32,
+    "passengers": np.float32, "fuel_gallons": np.float32, "cargo_weight_lbs": np.float32,
+    "live": np.bool_,
+}
+# Group-by name -> stored column
+_GROUP_SOURCES = {"airport_id": "airport_id", "aircraft_id": "aircraft_id", "pilot_id": "pic_id",
+                  "flight_type": "flight_type", "operation": "operation"}
+_SUMS = ("passengers", "fuel_gallons", "cargo_weight_lbs")
+
+FLIGHT_TYPES = list(FlightType)
+_FLIGHT_TYPE_CODES = {
+    key: code for code, member in enumerate(FLIGHT_TYPES) for key in (member, member.value, member.name)
+}
+
+
+def _epoch_micros(ts: datetime) -> int:
+    return int(np.datetime64(ts, "us").astype(np.int64))
+
+
+def _bucket_codes(seconds: np.ndarray, bucket: str) -> np.ndarray:
+    """Bucket index since the epoch for each timestamp (weeks start on Monday)."""
+    if bucket == "hour":
+        return seconds // 3600
+    if bucket == "day":
+        return seconds // 86400
+    if bucket == "week":
+        return (seconds // 86400 + 3) // 7  # 1970-01-01 was a Thursday
+    # Calendar buckets: convert each distinct day once and look the rest up
+    days = seconds // 86400
+    first = int(days.min())
+    unit = "M" if bucket == "month" else "Y"
+    table = np.arange(first, int(days.max()) + 1).astype("datetime64[D]").astype(f"datetime64[{unit}]")
+    return table.astype(np.int64)[days - first]
+
+
+def _bucket_starts(codes: np.ndarray, bucket: str) -> List[datetime]:
+    if bucket == "hour":
+        seconds = codes * 3600
+    elif bucket == "day":
+        seconds = codes * 86400
+    elif bucket == "week":
+        seconds = (codes * 7 - 3) * 86400
+    else:
+        unit = "M" if bucket == "month" else "Y"
+        seconds = codes.astype(f"datetime64[{unit}]").astype("datetime64[s]").astype(np.int64)
+    return seconds.astype("datetime64[s]").astype("datetime64[us]").tolist()
+
+
+def parse_group_by(group_by: Optional[str]) -> Sequence[str]:
+    """Validate a comma-separated `group_by=` parameter, keeping GROUP_COLUMNS order."""
+    if not group_by:
+        return ()
+    requested = {part.strip() for part in group_by.split(",") if part.strip()}
+    unknown = requested.difference(GROUP_COLUMNS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown group_by columns: {', '.join(sorted(unknown))}")
+    return tuple(name for name in GROUP_COLUMNS if name in requested)
+
+
+def _top_groups(counts: np.ndarray, buckets: Optional[np.ndarray], limit: int) -> np.ndarray:
+    """Indexes of the first `limit` groups by bucket, then by count (highest first).
+
+    Groups arrive in key order, so their buckets are already ascending and only
+    the buckets reaching the limit need sorting by count.
+    """
+    if buckets is None:
+        candidates = np.arange(len(counts))
+        if len(counts) > limit:
+            candidates = np.sort(np.argpartition(-counts, limit - 1)[:limit])
+        return candidates[np.argsort(-counts[candidates], kind="stable")]
+    end = len(counts)
+    if end > limit:
+        end = int(np.searchsorted(buckets, buckets[limit - 1], side="right"))
+    # np.lexsort sorts by its last key first
+    return np.lexsort((-counts[:end], buckets[:end]))[:limit]
+
+
+class FlightColumns:
+    """Flights as growable NumPy column arrays, kept sorted by id."""
+
+    def __init__(self):
+        self.size = 0
+        self.arrays = {name: np.zeros(0, dtype) for name, dtype in _DTYPES.items()}
+        self.operations: List[str] = []  # operation code -> name
+        self._operation_codes: Dict[str, int] = {}
+
+    def column(self, name: str) -> np.ndarray:
+        return self.arrays[name][:self.size]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def operation_code(self, operation: str, create: bool = True) -> Optional[int]:
+        code = self._operation_codes.get(operation)
+        if code is None and create:
+            code = len(self.operations)
+            self.operations.append(operation)
+            self._operation_codes[operation] = code
+        return code
+
+    def _encode(self, records: Sequence[tuple]) -> Dict[str, np.ndarray]:
+        count = len(records)
+        values = dict(zip(_FIELDS, zip(*records)))
+        encoded = {name: np.fromiter(values[name], _DTYPES[name], count)
+                   for name in ("id", "airport_id", "aircraft_id", "pic_id")}
+        encoded["actual_time"] = np.array(values["actual_time"], dtype="datetime64[us]").astype(np.int64)
+        encoded["flight_type"] = np.fromiter(
+            (_FLIGHT_TYPE_CODES[value] for value in values["flight_type"]), np.uint8, count
+        )
+        encoded["operation"] = np.fromiter(
+            (self.operation_code(value) for value in values["operation"]), np.int32, count
+        )
+        for name in _SUMS:
+            encoded[name] = np.fromiter((value or 0.0 for value in values[name]), np.float32, count)
+        encoded["live"] = np.ones(count, np.bool_)
+        return encoded
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        capacity = len(self.arrays["id"])
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+        for name, array in self.arrays.items():
+            grown = np.zeros(capacity, array.dtype)
+            grown[:self.size] = array[:self.size]
+            self.arrays[name] = grown
+
+    def extend(self, records: Sequence[tuple], keep_sorted: bool = True) -> None:
+        """Append flights given as tuples in _FIELDS order.
+
+        With keep_sorted=False the caller must call sort() before looking
+        flights up by id.
+        """
+        if not records:
+            return
+        encoded = self._encode(records)
+        self._reserve(len(records))
+        start, end = self.size, self.size + len(records)
+        for name, values in encoded.items():
+            self.arrays[name][start:end] = values
+        in_order = self.size == 0 or encoded["id"][0] > self.arrays["id"][self.size - 1]
+        self.size = end
+        if keep_sorted and not (in_order and np.all(encoded["id"][1:] > encoded["id"][:-1])):
+            self.sort()
+
+    def sort(self) -> None:
+        """Restore id order, keeping the last copy of any duplicated id."""
+        ids = self.column("id")
+        order = np.argsort(ids, kind="stable")
+        ids = ids[order]
+        keep = np.ones(len(order), np.bool_)
+        keep[:-1] = ids[1:] != ids[:-1]
+        order = order[keep]
+        for name, array in self.arrays.items():
+            array[:len(order)] = array[:self.size][order]
+        self.size = len(order)
+
+    def position(self, flight_id: int) -> Optional[int]:
+        ids = self.column("id")
+        index = int(np.searchsorted(ids, flight_id))
+        return index if index < self.size and ids[index] == flight_id else None
+
+    def upsert(self, record: tuple) -> None:
+        index = self.position(record[0])
+        if index is None:
+            self.extend([record])
+            return
+        for name, values in self._encode([record]).items():
+            self.arrays[name][index] = values[0]
+
+    def remove(self, flight_id: int) -> None:
+        index = self.position(flight_id)
+        if index is not None:
+            self.arrays["live"][index] = False
+
+
+def _record(flight) -> tuple:
+    return tuple(getattr(flight, name) for name in _FIELDS)
+
+
+class FlightColumnStore:
+    """The process-wide FlightColumns, with loading and incremental updates."""
+
+    def __init__(self):
+        self.columns = FlightColumns()
+        self.loaded_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._loaded = asyncio.Event()
+        # Changes made while a reload is running, replayed onto the new copy
+        self._pending: Optional[list] = None
+
+    async def load(self) -> None:
+        """(Re)load every flight from the database and the flight archive."""
+        columns = FlightColumns()
+        self._pending = []
+        try:
+            async with async_session() as db:
+                result = await db.stream(
+                    select(*(Flight.__table__.c[name] for name in _FIELDS))
+                    .execution_options(yield_per=LOAD_CHUNK_ROWS)
+                )
+                async for partition in result.partitions():
+                    columns.extend(partition, keep_sorted=False)
+            for batch in flight_archive.batches(LOAD_CHUNK_ROWS):
+                columns.extend([tuple(row[name] for name in _FIELDS) for row in batch], keep_sorted=False)
+            columns.sort()
+            for change in self._pending:
+                self._apply(columns, change)
+        finally:
+            self._pending = None
+        self.columns = columns
+        self.loaded_at = datetime.utcnow()
+        self._loaded.set()
+
+    async def keep_loaded(self, interval: float) -> None:
+        """Load now, then reload every `interval` seconds (0 loads once)."""
+        while True:
+            try:
+                await self.load()
+                self.last_error = None
+            except Exception as exc:  # keep serving the current copy; retry next interval
+                self.last_error = str(exc) or exc.__class__.__name__
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    def _apply(columns: FlightColumns, change) -> None:
+        record, flight_id = change
+        if record is not None:
+            columns.upsert(record)
+        else:
+            columns.remove(flight_id)
+
+    def _change(self, record: Optional[tuple], flight_id: int) -> None:
+        self._apply(self.columns, (record, flight_id))
+        if self._pending is not None:
+            self._pending.append((record, flight_id))
+
+    def upsert(self, flight) -> None:
+        """Record a committed insert or update of `flight` (ORM object or row)."""
+        self._change(_record(flight), flight.id)
+
+    def remove(self, flight_id: int) -> None:
+        """Record a committed delete."""
+        self._change(None, flight_id)
+
+    async def sync(self, db: AsyncSession, flight_ids: Iterable[int]) -> None:
+        """Re-read the given flights after a commit (used for bulk inserts)."""
+        flight_ids = sorted(flight_id for flight_id in flight_ids if flight_id is not None)
+        for start in range(0, len(flight_ids), LOAD_CHUNK_ROWS):
+            chunk = flight_ids[start:start + LOAD_CHUNK_ROWS]
+            result = await db.execute(
+                select(*(Flight.__table__.c[name] for name in _FIELDS)).where(Flight.id.in_(chunk))
+            )
+            for row in result.all():
+                self.upsert(row)
+
+    async def wait_loaded(self) -> None:
+        """Wait for the first load; 503 if it takes longer than LOAD_WAIT_SECONDS."""
+        if self._loaded.is_set():
+            return
+        try:
+            await asyncio.wait_for(self._loaded.wait(), LOAD_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Flight analytics are still loading")
+
+    def aggregate(
+        self,
+        *,
+        group_by: Sequence[str] = (),
+        bucket: Optional[str] = None,
+        airport_id: Optional[int] = None,
+        aircraft_id: Optional[int] = None,
+        pilot_id: Optional[int] = None,
+        flight_type: Optional[str] = None,
+        operation: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: int = 1000,
+    ) -> List[dict]:
+        """Flight count and passenger/fuel/cargo totals per group and time bucket.
+
+        Rows are ordered by bucket, then by flight count (highest first).
+        """
+        columns = self.columns
+        live = columns.column("live")
+        mask = None if live.all() else live.copy()
+
+        def keep(condition) -> None:
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        for value, name in ((airport_id, "airport_id"), (aircraft_id, "aircraft_id"), (pilot_id, "pic_id")):
+            if value:
+                keep(columns.column(name) == value)
+        if flight_type:
+            code = _FLIGHT_TYPE_CODES.get(flight_type)
+            if code is None:
+                return []
+            keep(columns.column("flight_type") == code)
+        if operation:
+            code = columns.operation_code(operation, create=False)
+            if code is None:
+                return []
+            keep(columns.column("operation") == code)
+        if date_from:
+            keep(columns.column("actual_time") >= _epoch_micros(date_from))
+        if date_to:
+            keep(columns.column("actual_time") <= _epoch_micros(date_to))
+        # Unfiltered queries read the columns as they are instead of gathering every row
+        selected = None if mask is None else np.flatnonzero(mask)
+        if selected is not None and not len(selected):
+            return []
+        if not columns.size:
+            return []
+
+        def gather(name: str) -> np.ndarray:
+            column = columns.column(name)
+            return column if selected is None else column[selected]
+
+        # (name, codes from 0, number of codes, offset back to the stored value)
+        keys = []
+        if bucket:
+            codes = _bucket_codes(gather("actual_time") // 1_000_000, bucket)
+            keys.append(("bucket_start", codes))
+        for name in group_by:
+            keys.append((name, gather(_GROUP_SOURCES[name]).astype(np.int64)))
+        keys = [(name, codes - codes.min(), int(codes.max() - codes.min()) + 1, int(codes.min()))
+                for name, codes in keys]
+
+        space = 1
+        for _, _, cardinality, _ in keys:
+            space *= cardinality
+        if not keys:
+            counts = np.array([len(gather("id"))])
+            sums = {name: np.array([gather(name).sum(dtype=np.float64)]) for name in _SUMS}
+            group_codes = []
+        elif space <= DENSE_KEY_LIMIT:
+            combined = keys[0][1]
+            for _, codes, cardinality, _ in keys[1:]:
+                combined = combined * cardinality
+                combined += codes
+            counts = np.bincount(combined, minlength=space)
+            groups = np.flatnonzero(counts)
+            counts = counts[groups]
+            sums = {name: np.bincount(combined, weights=gather(name), minlength=space)[groups] for name in _SUMS}
+            group_codes = []
+            remainder = groups
+            for _, _, cardinality, offset in reversed(keys):
+                group_codes.append(remainder % cardinality + offset)
+                remainder = remainder // cardinality
+            group_codes.reverse()
+        else:
+            unique, inverse = np.unique(np.stack([codes for _, codes, _, _ in keys]), axis=1, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            counts = np.bincount(inverse)
+            sums = {name: np.bincount(inverse, weights=gather(name)) for name in _SUMS}
+            group_codes = [unique[index] + offset for index, (_, _, _, offset) in enumerate(keys)]
+
+        order = _top_groups(counts, group_codes[0] if bucket else None, limit)
+
+        # The columns are float32: round the sums back to the stored precision
+        rows = [
+            {"flight_count": int(counts[i]), "passengers": int(round(sums["passengers"][i])),
+             "fuel_gallons": round(float(sums["fuel_gallons"][i]), 1),
+             "cargo_weight_lbs": round(float(sums["cargo_weight_lbs"][i]), 1)}
+            for i in order
+        ]
+        for (name, _, _, _), codes in zip(keys, group_codes):
+            codes = codes[order]
+            if name == "bucket_start":
+                values = _bucket_starts(codes, bucket)
+            elif name == "flight_type":
+                values = [FLIGHT_TYPES[code] for code in codes.tolist()]
+            elif name == "operation":
+                values = [columns.operations[code] for code in codes.tolist()]
+            else:
+                values = codes.tolist()
+            for row, value in zip(rows, values):
+                row[name] = value
+        return rows
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    def nth_latest(self, operations: Sequence[str], since: datetime, n: int) -> Dict[int, tuple]:
+        """Per pilot: (flights with one of `operations` since `since`, time of the n-th latest or None).
+
+        Pilots without any such flight are left out.
+        """
+        columns = self.columns
+        codes = [code for code in (columns.operation_code(name, create=False) for name in operations)
+                 if code is not None]
+        if not codes or not columns.size:
+            return {}
+        times = columns.column("actual_time")
+        mask = columns.column("live") & (times >= _epoch_micros(since)) & np.isin(columns.column("operation"), codes)
+        selected = np.flatnonzero(mask)
+        if not len(selected):
+            return {}
+        pilots, times = columns.column("pic_id")[selected], times[selected]
+        # By pilot, newest first within each pilot
+        order = np.lexsort((-times, pilots))
+        pilots, times = pilots[order], times[order]
+        starts = np.flatnonzero(np.r_[True, pilots[1:] != pilots[:-1]])
+        counts = np.diff(np.r_[starts, len(pilots)])
+        nth = times[np.minimum(starts + n - 1, len(times) - 1)].astype("datetime64[us]")
+        return {
+            pilot: (count, moment if count >= n else None)
+            for pilot, count, moment in zip(pilots[starts].tolist(), counts.tolist(), nth.tolist())
+        }
+
+    def stats(self) -> dict:
+        return {
+            "loaded_at": self.loaded_at,
+            "last_error": self.last_error,
+            "flights": int(np.count_nonzero(self.columns.column("live"))),
+            "memory_bytes": self.columns.nbytes,
+        }
+
+
+flight_columns = FlightColumnStore()
@@ -0,0 +1,351 @@
+"""Cold flight history archived to Parquet.
+
+`archive_flights` moves every flight older than a cutoff out of the database
+one calendar month at a time: the month is written to
+ARCHIVE_DIR/flights-YYYY-MM.parquet (zstd-compressed, one row group per
+batch), then deleted from `flights` in ARCHIVE_BATCH_ROWS-sized chunks that
+are committed separately, and on PostgreSQL the emptied monthly partition is
+dropped. The traffic rollups are left alone, so dashboards and time series
+keep the full history.
+
+The archive horizon is the end of the newest archived month. A flight query
+whose date range starts before the horizon (or has no start) reads the
+archive too: `fetch_page` and the exports merge archived flights into the
+database rows in FLIGHT_ORDER, reading month files newest first and only as
+far back as the page needs.
+
+Parquet support comes from pyarrow, imported on first use; without it the
+archive can be neither written nor read.
+"""
+import heapq
+import operator
+import os
+import re
+from collections import namedtuple
+from datetime import datetime
+from functools import reduce
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.models import Flight, FlightType
+from app.services.flight_queries import FLIGHT_FIELDS, flight_rows_query, lookback_start
+from app.services.partitions import add_months, drop_partition, month_start
+from app.services.reference_data import reference_cache
+from app.services.search import matching_ids
+from app.services.versions import FLIGHTS, bump_versions
+
+settings = get_settings()
+
+ARCHIVE_BATCH_ROWS = 5000
+_FILE_NAME = re.compile(r"^flights-(\d{4})-(\d{2})\.parquet$")
+
+# An archived flight; has the same attributes as a flight_rows_query row
+ArchivedFlight = namedtuple("ArchivedFlight", FLIGHT_FIELDS)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("The flight archive needs pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _schema(pa):
+    types = {"INTEGER": pa.int64(), "FLOAT": pa.float64(), "DATETIME": pa.timestamp("us")}
+    return pa.schema([
+        pa.field(name, types.get(str(Flight.__table__.c[name].type), pa.string()))
+        for name in FLIGHT_FIELDS
+    ])
+
+
+def _flight_type_value(flight_type: str) -> str:
+    for member in FlightType:
+        if flight_type in (member.value, member.name):
+            return member.value
+    return flight_type
+
+
+def _record(row) -> dict:
+    record = {name: row[name] for name in FLIGHT_FIELDS}
+    record["flight_type"] = FlightType(record["flight_type"]).value
+    return record
+
+
+def _archived_flight(record: dict) -> ArchivedFlight:
+    record["flight_type"] = FlightType(record["flight_type"])
+    return ArchivedFlight(**record)
+
+
+def _sort_key(flight) -> tuple:
+    return (flight.actual_time, flight.id)
+
+
+class FlightArchive:
+    """The monthly Parquet files under one directory."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._listing: Tuple[Optional[int], List[datetime]] = (None, [])
+
+    def path(self, month: datetime) -> Path:
+        return self.directory / f"flights-{month.year}-{month.month:02d}.parquet"
+
+    def months(self) -> List[datetime]:
+        """Archived months, oldest first. Re-listed only when the directory changes."""
+        try:
+            modified = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if self._listing[0] != modified:
+            months = []
+            for entry in os.listdir(self.directory):
+                match = _FILE_NAME.match(entry)
+                if match:
+                    months.append(datetime(int(match[1]), int(match[2]), 1))
+            self._listing = (modified, sorted(months))
+        return self._listing[1]
+
+    def horizon(self) -> Optional[datetime]:
+        """End of the newest archived month; nothing after it is archived."""
+        months = self.months()
+        return add_months(months[-1], 1) if months else None
+
+    def reaches(self, date_from: Optional[datetime] = None, years_back: Optional[int] = None, **_) -> bool:
+        """Whether a query with these filter_flights filters can match archived flights."""
+        horizon = self.horizon()
+        if horizon is None:
+            return False
+        start = lookback_start(years_back) if years_back else date_from
+        return start is None or start < horizon
+
+    def _tables(
+        self,
+        *,
+        airport_id: Optional[int] = None,
+        aircraft_id: Optional[int] = None,
+        pilot_id: Optional[int] = None,
+        pilot_name: Optional[str] = None,
+        flight_type: Optional[str] = None,
+        operation: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        years_back: Optional[int] = None,
+        after: Optional[tuple] = None,
+    ):
+        """The matching rows of each month file in range, newest month first, read lazily."""
+        months = self.months()
+        if not months:
+            return
+        pa = _pyarrow()
+        field = pa.compute.field
+        conditions = []
+        if airport_id:
+            conditions.append(field("airport_id") == airport_id)
+        if aircraft_id:
+            conditions.append(field("aircraft_id") == aircraft_id)
+        if pilot_id:
+            conditions.append(field("pic_id") == pilot_id)
+        if pilot_name:
+            pilot_ids = matching_ids(reference_cache.pilots, pilot_name)
+            if not pilot_ids:
+                return
+            conditions.append(field("pic_id").isin(sorted(pilot_ids)))
+        if flight_type:
+            conditions.append(field("flight_type") == _flight_type_value(flight_type))
+        if operation:
+            conditions.append(field("operation") == operation)
+        # Same precedence as filter_flights: years_back wins over date_from
+        start = lookback_start(years_back) if years_back else date_from
+        if start:
+            conditions.append(field("actual_time") >= start)
+        if date_to:
+            conditions.append(field("actual_time") <= date_to)
+        if after:
+            actual_time, flight_id = after
+            conditions.append(
+                (field("actual_time") < actual_time)
+                | ((field("actual_time") == actual_time) & (field("id") < flight_id))
+            )
+        expression = reduce(operator.and_, conditions) if conditions else None
+
+        for month in reversed(months):
+            if start and add_months(month, 1) <= start:
+                break
+            if (date_to and month > date_to) or (after and month > after[0]):
+                continue
+            yield pa.parquet.read_table(self.path(month), filters=expression)
+
+    def rows(self, **filters) -> Iterator[ArchivedFlight]:
+        """Archived flights matching the filter_flights filters, in FLIGHT_ORDER.
+
+        Month files are opened lazily, newest first, so taking the first few
+        rows reads only the newest months in range.
+        """
+        for table in self._tables(**filters):
+            table = table.sort_by([("actual_time", "descending"), ("id", "descending")])
+            for batch in table.to_batches():
+                for record in batch.to_pylist():
+                    yield _archived_flight(record)
+
+    def bounds(self, **filters) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Earliest and latest actual_time of the archived flights matching the filters."""
+        first = last = None
+        for table in self._tables(**filters):
+            if table.num_rows:
+                low, high = _pyarrow().compute.min_max(table.column("actual_time")).values()
+                first = min(first, low.as_py()) if first else low.as_py()
+                last = max(last, high.as_py()) if last else high.as_py()
+        return first, last
+
+    def count(self, **filters) -> int:
+        """Number of archived flights matching the filter_flights filters."""
+        return sum(table.num_rows for table in self._tables(**filters))
+
+    def clear(self) -> int:
+        """Delete every month file (for a reseed that replaces all flights). Returns the files removed."""
+        removed = 0
+        for month in self.months():
+            self.path(month).unlink(missing_ok=True)
+            removed += 1
+        if self.directory.is_dir():
+            for leftover in self.directory.glob("flights-*.parquet.tmp"):
+                leftover.unlink(missing_ok=True)
+        self._listing = (None, [])
+        return removed
+
+    def find(self, flight_id: int) -> Optional[ArchivedFlight]:
+        """An archived flight by id."""
+        months = self.months()
+        if not months:
+            return None
+        pa = _pyarrow()
+        for month in reversed(months):
+            table = pa.parquet.read_table(self.path(month), filters=pa.compute.field("id") == flight_id)
+            if table.num_rows:
+                return _archived_flight(table.slice(0, 1).to_pylist()[0])
+        return None
+
+    def batches(self, batch_rows: int = ARCHIVE_BATCH_ROWS) -> Iterator[List[dict]]:
+        """Every archived flight as plain records, batch_rows at a time (any order)."""
+        months = self.months()
+        if not months:
+            return
+        pa = _pyarrow()
+        for month in months:
+            for batch in pa.parquet.ParquetFile(self.path(month)).iter_batches(batch_size=batch_rows):
+                yield batch.to_pylist()
+
+    async def write_month(self, db: AsyncSession, month: datetime, batch_rows: int) -> Tuple[int, int]:
+        """Write the month's flights to its Parquet file. Returns (rows written, highest id read).
+
+        A month that already has a file (an earlier run, or flights logged
+        late) is rewritten with the old rows followed by the new ones; rows
+        already in the file are not written twice.
+        """
+        pa = _pyarrow()
+        schema = _schema(pa)
+        path = self.path(month)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(path.name + ".tmp")
+        in_range = (Flight.actual_time >= month, Flight.actual_time < add_months(month, 1))
+        written = last_id = 0
+        writer = pa.parquet.ParquetWriter(temporary, schema, compression="zstd")
+        try:
+            archived_ids = set()
+            if path.exists():
+                existing = pa.parquet.read_table(path, schema=schema)
+                archived_ids = set(existing.column("id").to_pylist())
+                writer.write_table(existing)
+            while True:
+                result = await db.execute(
+                    flight_rows_query().where(*in_range, Flight.id > last_id).order_by(Flight.id).limit(batch_rows)
+                )
+                rows = result.mappings().all()
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+                fresh = [_record(row) for row in rows if row["id"] not in archived_ids]
+                if fresh:
+                    writer.write_table(pa.Table.from_pylist(fresh, schema=schema))
+                    written += len(fresh)
+        except BaseException:
+            writer.close()
+            temporary.unlink(missing_ok=True)
+            raise
+        writer.close()
+        os.replace(temporary, path)
+        return written, last_id
+
+
+flight_archive = FlightArchive(settings.ARCHIVE_DIR)
+
+
+async def fetch_page(db: AsyncSession, query: Select, filters: Dict, skip: int = 0, limit: int = 100) -> Sequence:
+    """One page of a flight query, with archived flights merged in when it reaches the archive.
+
+    `query` is built with filter_flights(**filters) and ordered by
+    FLIGHT_ORDER, without offset or limit. The archive is only read when the
+    database page comes back short or ends before the archive horizon.
+    """
+    result = await db.execute(query.offset(skip).limit(limit))
+    flights = result.all()
+    if not flight_archive.reaches(**filters):
+        return flights
+    if len(flights) == limit and flights[-1].actual_time >= flight_archive.horizon():
+        return flights
+    if skip:
+        result = await db.execute(query.limit(skip + limit))
+        flights = result.all()
+    archived = islice(flight_archive.rows(**filters), skip + limit)
+    merged = heapq.merge(flights, archived, key=_sort_key, reverse=True)
+    return list(islice(merged, skip, skip + limit))
+
+
+async def archive_flights(
+    db: AsyncSession,
+    older_than_years: int,
+    dry_run: bool = False,
+    batch_rows: int = ARCHIVE_BATCH_ROWS,
+) -> List[Tuple[datetime, int]]:
+    """Archive every month that ends more than `older_than_years` ago.
+
+    Returns (month, flights) for each month with flights to archive; with
+    `dry_run` nothing is written or deleted.
+    """
+    cutoff = month_start(lookback_start(older_than_years))
+    oldest = await db.scalar(select(func.min(Flight.actual_time)).where(Flight.actual_time < cutoff))
+    if oldest is None:
+        return []
+
+    archived = []
+    month = month_start(oldest)
+    while month < cutoff:
+        following = add_months(month, 1)
+        in_range = (Flight.actual_time >= month, Flight.actual_time < following)
+        count = await db.scalar(select(func.count()).select_from(Flight).where(*in_range))
+        if count and not dry_run:
+            _, last_id = await flight_archive.write_month(db, month, batch_rows)
+            await db.commit()
+            while True:
+                chunk = select(Flight.id).where(*in_range, Flight.id <= last_id).order_by(Flight.id).limit(batch_rows)
+                result = await db.execute(
+                    delete(Flight).where(Flight.id.in_(chunk)).execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                if not result.rowcount:
+                    break
+            await drop_partition(await db.connection(), month)
+            await bump_versions(db, FLIGHTS)
+            await db.commit()
+        if count:
+            archived.append((month, count))
+        month = following
+    return archived
@@ -0,0 +1,105 @@
+"""In-process response caches.
+
+Values are cached per process, so each uvicorn worker keeps its own copy; the
+TTLs used here are short enough that this does not matter. Write routes call
+`invalidate()` after committing so their own changes show up immediately.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+from app.core.config import get_settings
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+
+
+class TTLCache:
+    """A small keyed TTL cache with single-flight refresh.
+
+    When an entry is missing or expired, the first caller starts one refresh
+    task and every concurrent caller for the same key awaits that task, so a
+    burst of requests causes a single recompute. The refresh runs as its own
+    task, so a waiter that disconnects does not cancel it for the others.
+    With `max_entries`, storing a new key beyond that evicts the oldest one.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.invalidations = 0
+        _caches.append(self)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, calling `loader` at most once per refresh."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self.hits += 1
+            return entry.value
+
+        self.misses += 1
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, loader, self._generation))
+            self._pending[key] = task
+            task.add_done_callback(lambda t: self._refresh_done(key, t))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        self.refreshes += 1
+        value = await loader()
+        # A write that landed while we were loading makes this value stale
+        if generation == self._generation:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(value, time.monotonic() + self.ttl_seconds)
+            if self.max_entries is not None and len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        return value
+
+    def _refresh_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            task.exception()  # waiters see it; mark it retrieved if they all left
+
+    def invalidate(self) -> None:
+        """Drop every entry. Refreshes already in flight are not stored."""
+        self._generation += 1
+        self._entries.clear()
+        self._pending.clear()
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_caches: List[TTLCache] = []
+
+
+def cache_stats() -> List[dict]:
+    """Counters for every cache created in this process."""
+    return [cache.stats() for cache in _caches]
+
+
+dashboard_cache = TTLCache("dashboard", get_settings().DASHBOARD_CACHE_TTL_SECONDS)
+airport_activity_cache = TTLCache("airport_activity", get_settings().AIRPORT_ACTIVITY_TTL_SECONDS)
+reference_list_cache = TTLCache("reference_lists", get_settings().REFERENCE_LIST_CACHE_TTL_SECONDS, max_entries=64)
@@ -0,0 +1,117 @@
+"""Pilot currency: recent takeoffs and landings plus a valid medical.
+
+A pilot is current when they have made at least `takeoffs` takeoffs and
+`landings` landings in the last `days` days (a touch-and-go counts as one of
+each) and, unless waived, their medical has not expired. The recency part
+lapses `days` days after the n-th most recent takeoff or landing, so each
+pilot's currency runs until the earliest of those dates and the medical
+expiry.
+
+The counts come from the in-memory flight column store once it is loaded,
+and otherwise from one query that ranks each pilot's recent flights with
+window functions and aggregates the ranks per pilot.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Flight, Pilot
+from app.services.analytics import flight_columns
+
+CURRENCY_DAYS = 90
+CURRENCY_TAKEOFFS = 3
+CURRENCY_LANDINGS = 3
+
+TAKEOFF_OPERATIONS = ("takeoff", "touch_and_go")
+LANDING_OPERATIONS = ("landing", "touch_and_go")
+
+_PILOT_COLUMNS = (Pilot.id, Pilot.first_name, Pilot.last_name, Pilot.certificate_number, Pilot.medical_expiry)
+
+
+def _events_query(since: datetime, takeoffs: int, landings: int):
+    """Active pilots with their recent takeoff/landing counts and n-th latest times."""
+    is_takeoff = Flight.operation.in_(TAKEOFF_OPERATIONS)
+    is_landing = Flight.operation.in_(LANDING_OPERATIONS)
+    newest_first = dict(partition_by=Flight.pic_id, order_by=(Flight.actual_time.desc(), Flight.id.desc()))
+    ranked = select(
+        Flight.pic_id,
+        Flight.actual_time,
+        is_takeoff.label("is_takeoff"),
+        is_landing.label("is_landing"),
+        func.sum(case((is_takeoff, 1), else_=0)).over(**newest_first).label("takeoff_rank"),
+        func.sum(case((is_landing, 1), else_=0)).over(**newest_first).label("landing_rank"),
+    ).where(
+        Flight.actual_time >= since,
+        Flight.operation.in_(set(TAKEOFF_OPERATIONS + LANDING_OPERATIONS)),
+    ).subquery()
+    events = select(
+        ranked.c.pic_id,
+        func.sum(case((ranked.c.is_takeoff, 1), else_=0)).label("takeoffs"),
+        func.sum(case((ranked.c.is_landing, 1), else_=0)).label("landings"),
+        func.max(case((and_(ranked.c.is_takeoff, ranked.c.takeoff_rank == takeoffs), ranked.c.actual_time)))
+        .label("nth_takeoff"),
+        func.max(case((and_(ranked.c.is_landing, ranked.c.landing_rank == landings), ranked.c.actual_time)))
+        .label("nth_landing"),
+    ).group_by(ranked.c.pic_id).subquery()
+    return select(
+        *_PILOT_COLUMNS,
+        events.c.takeoffs,
+        events.c.landings,
+        events.c.nth_takeoff,
+        events.c.nth_landing,
+    ).outerjoin(events, events.c.pic_id == Pilot.id).where(Pilot.is_active.is_(True)).order_by(Pilot.id)
+
+
+async def _recent_events(db: AsyncSession, since: datetime, takeoffs: int, landings: int) -> List[dict]:
+    if not flight_columns.is_loaded:
+        result = await db.execute(_events_query(since, takeoffs, landings))
+        return [dict(row) for row in result.mappings().all()]
+
+    result = await db.execute(select(*_PILOT_COLUMNS).where(Pilot.is_active.is_(True)).order_by(Pilot.id))
+    recent_takeoffs = flight_columns.nth_latest(TAKEOFF_OPERATIONS, since, takeoffs)
+    recent_landings = flight_columns.nth_latest(LANDING_OPERATIONS, since, landings)
+    pilots = []
+    for row in result.mappings().all():
+        takeoff_count, nth_takeoff = recent_takeoffs.get(row["id"], (0, None))
+        landing_count, nth_landing = recent_landings.get(row["id"], (0, None))
+        pilots.append({**row, "takeoffs": takeoff_count, "landings": landing_count,
+                       "nth_takeoff": nth_takeoff, "nth_landing": nth_landing})
+    return pilots
+
+
+async def pilot_currency(
+    db: AsyncSession,
+    *,
+    days: int = CURRENCY_DAYS,
+    takeoffs: int = CURRENCY_TAKEOFFS,
+    landings: int = CURRENCY_LANDINGS,
+    require_medical: bool = True,
+    now: Optional[datetime] = None,
+) -> List[Dict]:
+    """Currency of every active pilot, as PilotCurrency dicts ordered by pilot id."""
+    now = now or datetime.utcnow()
+    window = timedelta(days=days)
+    pilots = []
+    for row in await _recent_events(db, now - window, takeoffs, landings):
+        takeoffs_until = row["nth_takeoff"] + window if row["nth_takeoff"] else None
+        landings_until = row["nth_landing"] + window if row["nth_landing"] else None
+        requirements = [takeoffs_until, landings_until]
+        if require_medical:
+            requirements.append(row["medical_expiry"])
+        current_until = None if None in requirements else min(requirements)
+        pilots.append({
+            "pilot_id": row["id"],
+            "first_name": row["first_name"],
+            "last_name": row["last_name"],
+            "certificate_number": row["certificate_number"],
+            "takeoffs": row["takeoffs"] or 0,
+            "landings": row["landings"] or 0,
+            "takeoffs_current_until": takeoffs_until,
+            "landings_current_until": landings_until,
+            "medical_expiry": row["medical_expiry"],
+            "is_current": current_until is not None and current_until > now,
+            "current_until": current_until,
+        })
+    return pilots
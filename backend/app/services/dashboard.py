@@ -0,0 +1,133 @@
+"""Dashboard statistics in as few database round trips as possible.
+
+A refresh issues three statements:
+
+* one aggregate for all five counters (rollup totals plus active aircraft,
+  active pilots and airports as scalar subqueries),
+* the recent flights, with airport, aircraft and pilot embedded from the
+  reference cache,
+* the busiest airports from the daily rollups.
+
+On PostgreSQL the three run concurrently, each on its own pooled connection,
+so the wall time is roughly one network round trip. SQLite gains nothing from
+parallel connections to a local file, so there they run one after another on
+a single session.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.compression import Precompressed
+from app.core.database import read_engine, read_session_for
+from app.core.encoding import dumps
+from app.models.models import Aircraft, Airport, Flight, FlightRollup, Pilot
+from app.schemas.schemas import DashboardStats
+from app.services.reference_data import reference_cache
+from app.services.rollups import DAY, busiest_airports_query
+
+RECENT_FLIGHTS_LIMIT = 10
+BUSIEST_AIRPORTS_LIMIT = 5
+
+
+def dashboard_window(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """(today_start, week_start) for the dashboard counters."""
+    now = now or datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return today_start, today_start - timedelta(days=7)
+
+
+def counters_query(today_start: datetime, week_start: datetime, dialect_name: str = "postgresql"):
+    """One row with every dashboard counter.
+
+    The today and week totals come from a single pass over the week's daily
+    rollups, using FILTER on PostgreSQL and an equivalent CASE elsewhere.
+    """
+    week_total = func.sum(FlightRollup.flight_count)
+    if dialect_name == "postgresql":
+        today_total = func.sum(FlightRollup.flight_count).filter(FlightRollup.bucket_start >= today_start)
+    else:
+        today_total = func.sum(case((FlightRollup.bucket_start >= today_start, FlightRollup.flight_count), else_=0))
+    flights = select(
+        func.coalesce(today_total, 0).label("total_flights_today"),
+        func.coalesce(week_total, 0).label("total_flights_week"),
+    ).where(
+        FlightRollup.granularity == DAY,
+        FlightRollup.bucket_start >= week_start,
+    ).subquery()
+
+    return select(
+        flights.c.total_flights_today,
+        flights.c.total_flights_week,
+        select(func.count(Aircraft.id)).where(Aircraft.is_active == True).scalar_subquery().label("total_aircraft"),
+        select(func.count(Pilot.id)).where(Pilot.is_active == True).scalar_subquery().label("total_pilots"),
+        select(func.count(Airport.id)).scalar_subquery().label("total_airports"),
+    )
+
+
+def recent_flights_query(limit: int = RECENT_FLIGHTS_LIMIT):
+    """Latest flights; related rows come from the reference cache."""
+    return select(Flight).order_by(Flight.actual_time.desc()).limit(limit)
+
+
+async def _counters(db: AsyncSession, today_start: datetime, week_start: datetime) -> dict:
+    result = await db.execute(counters_query(today_start, week_start, db.bind.dialect.name))
+    return dict(result.mappings().one())
+
+
+async def _recent_flights(db: AsyncSession) -> list:
+    result = await db.execute(recent_flights_query())
+    flights = result.scalars().all()
+    await reference_cache.load_related(db, flights)
+    return [{**flight.__dict__, **reference_cache.related(flight)} for flight in flights]
+
+
+async def _busiest_airports(db: AsyncSession, week_start: datetime) -> list:
+    result = await db.execute(busiest_airports_query(week_start, limit=BUSIEST_AIRPORTS_LIMIT))
+    return [
+        {
+            "id": row.id,
+            "icao_code": row.icao_code,
+            "name": row.name,
+            "flight_count": row.flight_count,
+        }
+        for row in result.all()
+    ]
+
+
+async def _in_own_session(query_fn, *args):
+    async with read_session_for() as db:
+        return await query_fn(db, *args)
+
+
+async def compute_dashboard_stats() -> DashboardStats:
+    """Build DashboardStats on sessions of its own.
+
+    The dashboard cache shares one computation between all waiting requests,
+    so this must not borrow any single request's session.
+    """
+    today_start, week_start = dashboard_window()
+    if read_engine.dialect.name == "sqlite":
+        async with read_session_for() as db:
+            counters = await _counters(db, today_start, week_start)
+            recent_flights = await _recent_flights(db)
+            busiest_airports = await _busiest_airports(db, week_start)
+    else:
+        counters, recent_flights, busiest_airports = await asyncio.gather(
+            _in_own_session(_counters, today_start, week_start),
+            _in_own_session(_recent_flights),
+            _in_own_session(_busiest_airports, week_start),
+        )
+    return DashboardStats(
+        **counters,
+        recent_flights=recent_flights,
+        busiest_airports=busiest_airports,
+    )
+
+
+async def compute_dashboard_json() -> Precompressed:
+    """DashboardStats encoded once, so cache hits are served without re-serializing or recompressing."""
+    stats = await compute_dashboard_stats()
+    return Precompressed(dumps(stats.model_dump(mode="json")))
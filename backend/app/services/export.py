@@ -0,0 +1,233 @@
+"""Streaming flight export (NDJSON, CSV and JSON arrays).
+
+Rows are read through a server-side cursor in chunks of EXPORT_CHUNK_ROWS and
+written to the client as each chunk arrives, so memory use stays flat however
+many flights match. Related airports, aircraft and pilots are fetched once per
+stream with one IN query per chunk and reused for every flight that refers to
+them. When the filters reach into the flight archive, archived flights are
+merged into the stream in order.
+"""
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Dict, Iterable, Optional
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app.core.database import read_session_for
+from app.core.encoding import dumps
+from app.models.models import Airport, Aircraft, Pilot
+from app.schemas.schemas import AirportResponse, AircraftResponse, PilotResponse
+from app.services.archive import flight_archive
+from app.services.flight_queries import FLIGHT_FIELDS
+
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "json": "application/json",
+}
+
+CSV_FIELDS = FLIGHT_FIELDS + ["airport_icao", "aircraft_tail_number", "pilot_name"]
+
+# Accept media types that select a streaming format, preferred first at the same q
+_STREAMING_MEDIA_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+
+def negotiate_format(accept: Optional[str]) -> Optional[str]:
+    """The streaming format an Accept header ranks above JSON, if any."""
+    if not accept:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept.split(","):
+        media_type, *params = item.split(";")
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = None
+        if weight is not None:
+            weights[media_type.strip().lower()] = weight
+    # JSON is the default, so a streaming format has to beat it (and never at q=0)
+    best, best_weight = None, max(weights.get("application/json", 0.0), weights.get("*/*", 0.0))
+    for media_type, fmt in _STREAMING_MEDIA_TYPES.items():
+        weight = weights.get(media_type, 0.0)
+        if weight > best_weight:
+            best, best_weight = fmt, weight
+    return best
+
+
+def _scalar(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+class RelatedLoader:
+    """Per-stream cache of serialized airports, aircraft and pilots."""
+
+    def __init__(self):
+        self.airports: Dict[int, dict] = {}
+        self.aircraft: Dict[int, dict] = {}
+        self.pilots: Dict[int, dict] = {}
+
+    async def load(self, session, rows) -> None:
+        for model, schema, cache, key in (
+            (Airport, AirportResponse, self.airports, "airport_id"),
+            (Aircraft, AircraftResponse, self.aircraft, "aircraft_id"),
+            (Pilot, PilotResponse, self.pilots, "pic_id"),
+        ):
+            missing = {row[key] for row in rows} - cache.keys()
+            if not missing:
+                continue
+            result = await session.execute(select(model).where(model.id.in_(missing)))
+            for obj in result.scalars():
+                cache[obj.id] = schema.model_validate(obj).model_dump(mode="json")
+            session.expunge_all()
+
+
+def _flight_document(row, related: RelatedLoader) -> dict:
+    document = {name: _scalar(row[name]) for name in FLIGHT_FIELDS}
+    document["airport"] = related.airports.get(row["airport_id"])
+    document["aircraft"] = related.aircraft.get(row["aircraft_id"])
+    document["pilot"] = related.pilots.get(row["pic_id"])
+    return document
+
+
+def _csv_record(row, related: RelatedLoader) -> list:
+    airport = related.airports.get(row["airport_id"]) or {}
+    aircraft = related.aircraft.get(row["aircraft_id"]) or {}
+    pilot = related.pilots.get(row["pic_id"])
+    pilot_name = f"{pilot['first_name']} {pilot['last_name']}" if pilot else None
+    values = [_scalar(row[name]) for name in FLIGHT_FIELDS]
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return values + [airport.get("icao_code"), aircraft.get("tail_number"), pilot_name]
+
+
+def _sort_key(row) -> tuple:
+    return (row["actual_time"], row["id"])
+
+
+async def merged_chunks(partitions, archived: Iterable, skip: int, limit: Optional[int]):
+    """Database row chunks with `archived` rows (both newest first) merged in, re-chunked."""
+    archived = iter(archived)
+    pending = next(archived, None)
+    chunk = []
+    position = 0
+
+    async def rows():
+        nonlocal pending
+        async for partition in partitions:
+            for row in partition:
+                while pending is not None and _sort_key(pending) > _sort_key(row):
+                    yield pending
+                    pending = next(archived, None)
+                yield row
+        while pending is not None:
+            yield pending
+            pending = next(archived, None)
+
+    async for row in rows():
+        position += 1
+        if position <= skip:
+            continue
+        chunk.append(row)
+        if len(chunk) == EXPORT_CHUNK_ROWS:
+            yield chunk
+            chunk = []
+        if limit is not None and position >= skip + limit:
+            break
+    if chunk:
+        yield chunk
+
+
+async def stream_flights(
+    query: Select,
+    fmt: str,
+    archived: Optional[Iterable] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Yield `query` (built on flight_rows_query) encoded as `fmt`, chunk by chunk.
+
+    `archived` rows (mappings in the same order as `query`) are merged in, and
+    `skip` and `limit` then apply to the merged rows.
+
+    Runs in its own sessions because the request's session is closed before a
+    streaming response body is sent.
+    """
+    related = RelatedLoader()
+    first = True
+    async with read_session_for() as session, read_session_for() as lookup_session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+        partitions = result.mappings().partitions()
+        if archived is not None:
+            partitions = merged_chunks(partitions, archived, skip, limit)
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_FIELDS)
+            yield buffer.getvalue().encode()
+        elif fmt == "json":
+            yield b"["
+
+        async for partition in partitions:
+            await related.load(lookup_session, partition)
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(_csv_record(row, related) for row in partition)
+                chunk = buffer.getvalue().encode()
+            elif fmt == "json":
+                chunk = b",".join(dumps(_flight_document(row, related)) for row in partition)
+                if not first:
+                    chunk = b"," + chunk
+            else:
+                chunk = b"".join(dumps(_flight_document(row, related)) + b"\n" for row in partition)
+            first = False
+            yield chunk
+
+        if fmt == "json":
+            yield b"]"
+
+
+def export_response(
+    query: Select,
+    fmt: str,
+    filename: Optional[str] = None,
+    *,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    archive_filters: Optional[Dict] = None,
+) -> StreamingResponse:
+    """Wrap stream_flights in a StreamingResponse with the right media type.
+
+    `query` is unpaged; `skip` and `limit` select the page. `archive_filters`
+    are the filter_flights keywords `query` was built with; when they reach
+    into the flight archive, matching archived flights are streamed too.
+    """
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    archived = None
+    if archive_filters is not None and flight_archive.reaches(**archive_filters):
+        archived = (row._asdict() for row in flight_archive.rows(**archive_filters))
+        if limit is not None:
+            query = query.limit(skip + limit)
+    else:
+        query = query.offset(skip).limit(limit)
+        skip = 0
+    return StreamingResponse(
+        stream_flights(query, fmt, archived, skip, limit),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers=headers,
+    )
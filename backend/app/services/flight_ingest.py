@@ -0,0 +1,85 @@
+"""Bulk flight ingest.
+
+A batch is validated row by row, its airport/aircraft/pilot references are
+checked against the reference cache (one `IN` query per table for any ids it
+does not hold yet), and the valid rows are written with a multi-row
+`INSERT ... RETURNING` in a single transaction together with their rollup
+and pilot stats deltas. Rows that fail validation are reported by index and skipped;
+they never abort the rest of the batch.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Flight
+from app.schemas.schemas import FlightCreate
+from app.services import pilot_stats, rollups
+from app.services.reference_data import reference_cache
+
+# (FlightCreate field, reference table, error message)
+_REFERENCES = [
+    ("airport_id", reference_cache.airports, "Airport not found"),
+    ("aircraft_id", reference_cache.aircraft, "Aircraft not found"),
+    ("pic_id", reference_cache.pilots, "Pilot not found"),
+]
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+
+async def ingest_flights(
+    db: AsyncSession, records: Sequence[Dict[str, Any]]
+) -> Tuple[List[Optional[int]], List[Dict[str, Any]]]:
+    """Insert every valid record. Returns (ids, errors).
+
+    `ids` is aligned with `records`: the new flight id, or None where the row
+    was rejected. `errors` holds {"index", "detail"} for each rejected row.
+    The caller commits.
+    """
+    ids: List[Optional[int]] = [None] * len(records)
+    errors: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, FlightCreate]] = []
+    for index, record in enumerate(records):
+        try:
+            valid.append((index, FlightCreate.model_validate(record)))
+        except ValidationError as exc:
+            errors.append({"index": index, "detail": _validation_message(exc)})
+
+    # One set-based existence check per referenced table, for ids not already cached
+    existing = {}
+    for field, table, _ in _REFERENCES:
+        existing[field] = await table.fetch_many(db, {getattr(flight, field) for _, flight in valid})
+
+    rows: List[Dict[str, Any]] = []
+    row_indexes: List[int] = []
+    now = datetime.utcnow()
+    for index, flight in valid:
+        missing = [message for field, _, message in _REFERENCES if getattr(flight, field) not in existing[field]]
+        if missing:
+            errors.append({"index": index, "detail": "; ".join(missing)})
+            continue
+        row = flight.model_dump()
+        row["actual_time"] = row["actual_time"] or now
+        rows.append(row)
+        row_indexes.append(index)
+
+    if rows:
+        # insertmanyvalues batches this into multi-row INSERT ... RETURNING statements
+        result = await db.execute(
+            insert(Flight).returning(Flight.id, sort_by_parameter_order=True),
+            rows,
+        )
+        for index, flight_id in zip(row_indexes, result.scalars().all()):
+            ids[index] = flight_id
+        await rollups.apply_deltas(db, added=[rollups.flight_fact(row) for row in rows])
+        await pilot_stats.apply_deltas(db, added=[pilot_stats.flight_fact(row) for row in rows])
+
+    errors.sort(key=lambda error: error["index"])
+    return ids, errors
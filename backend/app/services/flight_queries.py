@@ -0,0 +1,79 @@
+"""Flight query building blocks shared by the flight routes and tooling."""
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import Select, and_, select
+
+from app.models.models import Flight
+from app.schemas.schemas import FlightResponse
+from app.services.pagination import seek_condition
+from app.services.reference_data import reference_cache
+from app.services.search import id_in, matching_ids
+
+# Matches the composite ix_flights_*_actual_time indexes
+FLIGHT_ORDER = (Flight.actual_time.desc(), Flight.id.desc())
+
+# Flight columns in FlightResponse field order
+FLIGHT_FIELDS = [name for name in FlightResponse.model_fields if name in Flight.__table__.c]
+
+
+def flight_rows_query(fields: Iterable[str] = FLIGHT_FIELDS) -> Select:
+    """Core select over the given flight columns (default all), for use with filter_flights."""
+    return select(*(Flight.__table__.c[name] for name in FLIGHT_FIELDS if name in fields))
+
+
+def lookback_start(years_back: int) -> datetime:
+    """Start of a `years_back` lookback window ending now."""
+    return datetime.now() - timedelta(days=years_back * 365)
+
+
+def filter_flights(
+    query: Select,
+    *,
+    airport_id: Optional[int] = None,
+    aircraft_id: Optional[int] = None,
+    pilot_id: Optional[int] = None,
+    pilot_name: Optional[str] = None,
+    flight_type: Optional[str] = None,
+    operation: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    years_back: Optional[int] = None,
+    after: Optional[tuple] = None,
+) -> Select:
+    """Apply the standard flight filters to `query`.
+
+    `after` is a decoded (actual_time, id) cursor; only rows that sort after it
+    in FLIGHT_ORDER are kept.
+    """
+    conditions = []
+    if airport_id:
+        conditions.append(Flight.airport_id == airport_id)
+    if aircraft_id:
+        conditions.append(Flight.aircraft_id == aircraft_id)
+    if pilot_id:
+        conditions.append(Flight.pic_id == pilot_id)
+    if flight_type:
+        conditions.append(Flight.flight_type == flight_type)
+    if operation:
+        conditions.append(Flight.operation == operation)
+    
+    # Handle date range - years_back takes precedence over date_from if both provided
+    if years_back:
+        conditions.append(Flight.actual_time >= lookback_start(years_back))
+    elif date_from:
+        conditions.append(Flight.actual_time >= date_from)
+    
+    if date_to:
+        conditions.append(Flight.actual_time <= date_to)
+    
+    if after:
+        conditions.append(seek_condition((Flight.actual_time, Flight.id), after, descending=True))
+    
+    # Pilot name search - resolved to pilot ids by the in-memory search index
+    if pilot_name:
+        conditions.append(id_in(Flight.pic_id, matching_ids(reference_cache.pilots, pilot_name)))
+    
+    if conditions:
+        query = query.where(and_(*conditions))
+    return query
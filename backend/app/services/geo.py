@@ -0,0 +1,252 @@
+"""Spatial lookups over airport positions.
+
+`GeoGrid` buckets points into fixed one-degree latitude/longitude cells. A
+bounding-box query visits only the cells the box overlaps, and a radius query
+visits the cells of the circle's bounding box and measures great-circle
+distances to the points in them. Nearest-neighbour queries start from a small
+radius and double it until enough points are inside (or the maximum radius
+is reached), so a lookup in a dense area touches a handful of cells. Adding or
+removing a point is O(1), so the reference cache can keep the grid current on
+every airport write.
+
+The same bounding-box prefilter is available as SQL (`bbox_condition`) for
+when the in-memory grid is not loaded.
+
+`ClusterIndex` holds one grid per map zoom level, with cells sized to roughly
+a marker's footprint at that zoom, so every non-empty cell is a ready-made
+map cluster. Cluster summaries (centroid, weight, busiest member) are
+computed once per cell and reused until the cell's members or the weights
+change.
+"""
+import heapq
+import math
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+EARTH_RADIUS_NM = 3440.065
+NM_PER_DEGREE_LAT = 60.0
+CELL_DEGREES = 1.0
+# Nearest-neighbour searches start at this radius and double it
+INITIAL_SEARCH_RADIUS_NM = 10.0
+# Above this zoom level every airport is its own marker
+MAX_CLUSTER_ZOOM = 12
+
+BBox = Tuple[float, float, float, float]  # (min_lon, min_lat, max_lon, max_lat)
+Cell = Tuple[int, int]
+
+
+def great_circle_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance in nautical miles."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(lat: float, lon: float, radius_nm: float) -> BBox:
+    """A box containing every point within `radius_nm` of (lat, lon).
+
+    min_lon > max_lon means the box crosses the antimeridian; a box reaching a
+    pole spans every longitude.
+    """
+    dlat = radius_nm / NM_PER_DEGREE_LAT
+    min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if max_lat >= 90.0 or min_lat <= -90.0 or cos_lat <= 0 or dlat / cos_lat >= 180.0:
+        return (-180.0, min_lat, 180.0, max_lat)
+    dlon = dlat / cos_lat
+    return (normalize_lon(lon - dlon), min_lat, normalize_lon(lon + dlon), max_lat)
+
+
+def normalize_lon(lon: float) -> float:
+    """Longitude in [-180, 180)."""
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+def lon_ranges(min_lon: float, max_lon: float) -> List[Tuple[float, float]]:
+    """Split a longitude span crossing the antimeridian into two plain ranges."""
+    if min_lon <= max_lon:
+        return [(min_lon, max_lon)]
+    return [(min_lon, 180.0), (-180.0, max_lon)]
+
+
+def bbox_condition(lat_column, lon_column, bbox: BBox):
+    """SQL prefilter for points inside `bbox`; can use an index on (lat, lon)."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return and_(
+        lat_column.between(min_lat, max_lat),
+        or_(*(lon_column.between(low, high) for low, high in lon_ranges(min_lon, max_lon))),
+    )
+
+
+class GeoGrid:
+    """Points (id -> lat, lon) bucketed into fixed-size lat/lon cells."""
+
+    def __init__(self, cell_degrees: float = CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._lon_cells = math.ceil(360.0 / cell_degrees)
+        self._cells: Dict[Cell, Dict[int, Tuple[float, float]]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return (
+            math.floor(lat / self.cell_degrees),
+            math.floor((normalize_lon(lon) + 180.0) / self.cell_degrees) % self._lon_cells,
+        )
+
+    def build(self, points: Iterable[Tuple[int, float, float]]) -> None:
+        """Replace every point with (id, lat, lon) triples."""
+        self._cells = {}
+        self._points = {}
+        for point_id, lat, lon in points:
+            self.add(point_id, lat, lon)
+
+    def add(self, point_id: int, lat: Optional[float], lon: Optional[float]) -> None:
+        """Add or move a point; a point without coordinates is dropped."""
+        self.remove(point_id)
+        if lat is None or lon is None:
+            return
+        self._points[point_id] = (lat, lon)
+        self._cells.setdefault(self._cell(lat, lon), {})[point_id] = (lat, lon)
+
+    def remove(self, point_id: int) -> None:
+        position = self._points.pop(point_id, None)
+        if position is None:
+            return
+        cell = self._cell(*position)
+        members = self._cells[cell]
+        del members[point_id]
+        if not members:
+            del self._cells[cell]
+
+    def cell_of(self, point_id: int) -> Optional[Cell]:
+        position = self._points.get(point_id)
+        return self._cell(*position) if position is not None else None
+
+    def cells(self, bbox: BBox) -> Iterator[Tuple[Cell, Dict[int, Tuple[float, float]]]]:
+        """(cell, {id: (lat, lon)}) for every non-empty cell overlapping `bbox`."""
+        min_lon, min_lat, max_lon, max_lat = bbox
+        lat_cells = range(math.floor(min_lat / self.cell_degrees), math.floor(max_lat / self.cell_degrees) + 1)
+        lon_cells = set()
+        for low, high in lon_ranges(min_lon, max_lon):
+            first = math.floor((low + 180.0) / self.cell_degrees)
+            last = math.floor((high + 180.0) / self.cell_degrees)
+            lon_cells.update(index % self._lon_cells for index in range(first, last + 1))
+        if len(lat_cells) * len(lon_cells) > len(self._cells):
+            # A wide box on a fine grid: cheaper to filter the occupied cells
+            for cell, members in self._cells.items():
+                if cell[0] in lat_cells and cell[1] in lon_cells:
+                    yield cell, members
+            return
+        for lat_cell in lat_cells:
+            for lon_cell in lon_cells:
+                members = self._cells.get((lat_cell, lon_cell))
+                if members:
+                    yield (lat_cell, lon_cell), members
+
+    def within(self, bbox: BBox) -> List[int]:
+        """Ids of the points inside `bbox` (min_lon > max_lon crosses the antimeridian)."""
+        min_lon, min_lat, max_lon, max_lat = bbox
+        ranges = lon_ranges(min_lon, max_lon)
+        return [
+            point_id
+            for _, members in self.cells(bbox)
+            for point_id, (lat, lon) in members.items()
+            if min_lat <= lat <= max_lat and any(low <= lon <= high for low, high in ranges)
+        ]
+
+    def _within_radius(self, lat: float, lon: float, radius_nm: float) -> List[Tuple[float, int]]:
+        found = []
+        for _, members in self.cells(radius_bbox(lat, lon, radius_nm)):
+            for point_id, (point_lat, point_lon) in members.items():
+                distance = great_circle_nm(lat, lon, point_lat, point_lon)
+                if distance <= radius_nm:
+                    found.append((distance, point_id))
+        return found
+
+    def nearest(self, lat: float, lon: float, radius_nm: float, limit: int) -> List[Tuple[float, int]]:
+        """Up to `limit` (distance_nm, id) pairs within `radius_nm`, nearest first."""
+        search_radius = min(radius_nm, INITIAL_SEARCH_RADIUS_NM)
+        while True:
+            found = self._within_radius(lat, lon, search_radius)
+            # Anything outside the searched circle is farther than everything inside it
+            if len(found) >= limit or search_radius >= radius_nm or len(found) == len(self._points):
+                return heapq.nsmallest(limit, found)
+            search_radius = min(radius_nm, search_radius * 2)
+
+
+def cluster_cell_degrees(zoom: int) -> float:
+    """Cluster cell width at a map zoom level: a quarter of a 256px web map tile."""
+    return 360.0 / 2 ** (zoom + 2)
+
+
+class Cluster(NamedTuple):
+    latitude: float
+    longitude: float
+    count: int
+    weight: int
+    busiest_id: int
+
+
+class ClusterIndex:
+    """Points grouped into clusters for every zoom level up to MAX_CLUSTER_ZOOM."""
+
+    def __init__(self, max_zoom: int = MAX_CLUSTER_ZOOM):
+        self.max_zoom = max_zoom
+        self._levels = [GeoGrid(cluster_cell_degrees(zoom)) for zoom in range(max_zoom + 1)]
+        # Per level: cell -> (weights the summary was computed with, summary)
+        self._summaries: List[Dict[Cell, Tuple[Mapping[int, int], Cluster]]] = [{} for _ in self._levels]
+
+    def build(self, points: Iterable[Tuple[int, float, float]]) -> None:
+        points = list(points)
+        for level, summaries in zip(self._levels, self._summaries):
+            level.build(points)
+            summaries.clear()
+
+    def _touch(self, zoom: int, point_id: int) -> None:
+        cell = self._levels[zoom].cell_of(point_id)
+        if cell is not None:
+            self._summaries[zoom].pop(cell, None)
+
+    def add(self, point_id: int, lat: Optional[float], lon: Optional[float]) -> None:
+        for zoom, level in enumerate(self._levels):
+            self._touch(zoom, point_id)
+            level.add(point_id, lat, lon)
+            self._touch(zoom, point_id)
+
+    def remove(self, point_id: int) -> None:
+        for zoom, level in enumerate(self._levels):
+            self._touch(zoom, point_id)
+            level.remove(point_id)
+
+    def clusters(self, bbox: BBox, zoom: int, weights: Mapping[int, int]) -> List[Cluster]:
+        """Clusters of the cells overlapping `bbox` at `zoom` (0 to max_zoom).
+
+        `weights` maps point ids to their activity; a cluster's weight is the
+        sum over its members and its busiest member the one with the most.
+        """
+        summaries = self._summaries[zoom]
+        found = []
+        for cell, members in self._levels[zoom].cells(bbox):
+            cached = summaries.get(cell)
+            if cached is None or cached[0] is not weights:
+                cached = (weights, _summarize(members, weights))
+                summaries[cell] = cached
+            found.append(cached[1])
+        return found
+
+
+def _summarize(members: Mapping[int, Tuple[float, float]], weights: Mapping[int, int]) -> Cluster:
+    count = len(members)
+    return Cluster(
+        latitude=sum(lat for lat, _ in members.values()) / count,
+        longitude=sum(lon for _, lon in members.values()) / count,
+        count=count,
+        weight=sum(weights.get(point_id, 0) for point_id in members),
+        busiest_id=max(members, key=lambda point_id: (weights.get(point_id, 0), -point_id)),
+    )
@@ -0,0 +1,213 @@
+"""Live flight movements, pushed to subscribers as they are logged.
+
+The flight write routes publish every committed create, update and delete
+to `movement_broker`, an in-process pub/sub broker. Each event is encoded
+once, as an SSE frame and as a WebSocket message, and handed to the
+subscribers whose airport/aircraft/pilot filters match. Subscribers are
+indexed by their first filter, so publishing only visits the subscribers
+that can match, plus the unfiltered ones.
+
+Every subscriber has a bounded queue. One that falls MOVEMENT_QUEUE_EVENTS
+behind is dropped instead of buffering without limit; after draining what
+was queued it receives a `lagged` event and is disconnected. It can then
+reconnect with its last event id.
+
+The broker remembers the last MOVEMENT_REPLAY_EVENTS events. A subscriber
+that (re)connects with the id of an event still in that window first
+receives every later matching event. An older id, or one from another
+process or an earlier run of this one, gets a `reset` event instead, telling
+the client to refetch.
+
+The broker lives in one process: with several workers, each one streams the
+writes it handled itself.
+"""
+import asyncio
+import secrets
+from collections import deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.encoding import dumps
+from app.models.models import Flight
+from app.services.flight_queries import flight_rows_query
+from app.services.reference_data import reference_cache
+from app.services.serializers import flight_json
+
+settings = get_settings()
+
+# Flight attributes subscribers filter on (airport, aircraft, pilot), in index order
+_KEY_ATTRS = ("airport_id", "aircraft_id", "pic_id")
+# Flights fetched per query when publishing a bulk ingest
+PUBLISH_CHUNK_ROWS = 1000
+
+
+class Movement(NamedTuple):
+    """One published event, pre-encoded for both transports."""
+    seq: int
+    kind: str  # created, updated, deleted, or reset/lagged for control events
+    keys: Tuple[Optional[int], ...]  # airport_id, aircraft_id, pic_id
+    sse: bytes
+    message: bytes
+
+
+def _matches(filters: Tuple[Optional[int], ...], movement: Movement) -> bool:
+    return all(wanted is None or wanted == key for wanted, key in zip(filters, movement.keys))
+
+
+class Subscription:
+    """One subscriber's filters, replay backlog and bounded queue."""
+
+    def __init__(self, filters: Tuple[Optional[int], ...], backlog: Iterable[Movement], queue_events: int):
+        self.filters = filters
+        self.backlog: Deque[Movement] = deque(backlog)
+        self.queue: asyncio.Queue = asyncio.Queue(queue_events)
+        self.lagged = False
+
+    def matches(self, movement: Movement) -> bool:
+        return _matches(self.filters, movement)
+
+    def offer(self, movement: Movement) -> bool:
+        """Queue a movement; False (and the subscription marked lagged) when the queue is full."""
+        try:
+            self.queue.put_nowait(movement)
+        except asyncio.QueueFull:
+            self.lagged = True
+            return False
+        return True
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[Movement]:
+        """The next movement, or None once a lagged subscription has drained its queue.
+
+        Raises asyncio.TimeoutError when nothing arrives within `timeout`.
+        """
+        if self.backlog:
+            return self.backlog.popleft()
+        if self.lagged and self.queue.empty():
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class MovementBroker:
+    """Fans published movements out to subscriptions, keeping a replay window."""
+
+    def __init__(self, replay_events: int, queue_events: int):
+        # Distinguishes this run's event ids from another process's or an earlier run's
+        self.epoch = secrets.token_hex(4)
+        self.queue_events = queue_events
+        self.seq = 0
+        self.history: Deque[Movement] = deque(maxlen=replay_events)
+        self._subscribers: Dict[Tuple[int, Optional[int]], Set[Subscription]] = {}
+        self.subscriptions = 0
+        self.published = 0
+        self.lagged = 0
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def _encode(self, seq: int, kind: str, keys: Tuple, data: bytes, with_id: bool = True) -> Movement:
+        event_id = self.event_id(seq).encode()
+        sse = b"event: " + kind.encode() + b"\ndata: " + data + b"\n\n"
+        if with_id:
+            sse = b"id: " + event_id + b"\n" + sse
+        message = b'{"id":' + (b'"' + event_id + b'"' if with_id else b"null") + \
+            b',"event":"' + kind.encode() + b'","flight":' + data + b"}"
+        return Movement(seq, kind, keys, sse, message)
+
+    def reset(self) -> Movement:
+        """Tells a client its event id is unknown: refetch, then carry on from the current position."""
+        return self._encode(self.seq, "reset", (), b"null")
+
+    def lagged_notice(self) -> Movement:
+        """Tells a dropped subscriber to reconnect; carries no id so the client keeps its last one."""
+        return self._encode(self.seq, "lagged", (), b"null", with_id=False)
+
+    def _index_key(self, filters: Tuple[Optional[int], ...]) -> Tuple[int, Optional[int]]:
+        for position, value in enumerate(filters):
+            if value is not None:
+                return position, value
+        return -1, None
+
+    def publish(self, kind: str, flight, data: bytes) -> Movement:
+        """Record a movement and queue it for every matching subscriber."""
+        self.seq += 1
+        keys = tuple(getattr(flight, attr) for attr in _KEY_ATTRS)
+        movement = self._encode(self.seq, kind, keys, data)
+        self.history.append(movement)
+        self.published += 1
+        candidates = [self._subscribers.get((-1, None), ())]
+        candidates.extend(self._subscribers.get((position, key), ()) for position, key in enumerate(keys))
+        lagged = [
+            subscription
+            for subscribers in candidates
+            for subscription in subscribers
+            if subscription.matches(movement) and not subscription.offer(movement)
+        ]
+        for subscription in lagged:
+            self.lagged += 1
+            self.unsubscribe(subscription)
+        return movement
+
+    def _replay(self, after: Optional[str], filters: Tuple[Optional[int], ...]) -> List[Movement]:
+        if not after:
+            return []
+        epoch, _, seq = after.rpartition("-")
+        oldest = self.history[0].seq if self.history else self.seq + 1
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self.seq or int(seq) < oldest - 1:
+            return [self.reset()]
+        return [movement for movement in self.history if movement.seq > int(seq) and _matches(filters, movement)]
+
+    def subscribe(
+        self,
+        *,
+        airport_id: Optional[int] = None,
+        aircraft_id: Optional[int] = None,
+        pilot_id: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> Subscription:
+        """Start receiving movements, first replaying those after event id `after`."""
+        filters = (airport_id, aircraft_id, pilot_id)
+        subscription = Subscription(filters, self._replay(after, filters), self.queue_events)
+        self._subscribers.setdefault(self._index_key(filters), set()).add(subscription)
+        self.subscriptions += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        key = self._index_key(subscription.filters)
+        subscribers = self._subscribers.get(key)
+        if subscribers and subscription in subscribers:
+            subscribers.discard(subscription)
+            self.subscriptions -= 1
+            if not subscribers:
+                del self._subscribers[key]
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscriptions,
+            "published": self.published,
+            "lagged": self.lagged,
+            "replay_events": len(self.history),
+            "last_event_id": self.event_id(self.seq),
+        }
+
+
+movement_broker = MovementBroker(settings.MOVEMENT_REPLAY_EVENTS, settings.MOVEMENT_QUEUE_EVENTS)
+
+
+def publish_deleted(flight: Flight) -> None:
+    movement_broker.publish("deleted", flight, dumps({
+        "id": flight.id, "airport_id": flight.airport_id, "aircraft_id": flight.aircraft_id, "pic_id": flight.pic_id,
+    }))
+
+
+async def publish_flights(db: AsyncSession, kind: str, flight_ids: Iterable[int]) -> None:
+    """Publish committed flights by id (for bulk writes), in id order."""
+    flight_ids = sorted(flight_id for flight_id in flight_ids if flight_id is not None)
+    for start in range(0, len(flight_ids), PUBLISH_CHUNK_ROWS):
+        chunk = flight_ids[start:start + PUBLISH_CHUNK_ROWS]
+        result = await db.execute(flight_rows_query().where(Flight.id.in_(chunk)).order_by(Flight.id))
+        flights = result.all()
+        await reference_cache.load_related(db, flights)
+        for flight in flights:
+            movement_broker.publish(kind, flight, flight_json(flight))
@@ -0,0 +1,63 @@
+"""Keyset (cursor) pagination helpers.
+
+Offset pagination makes the database walk and discard every row before the
+requested page. A cursor instead records the sort key of the last row that
+was returned, so the next page can seek straight past it using the index.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """Decode a cursor produced by encode_cursor, checking it matches `types`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("wrong cursor arity")
+        values = []
+        for value, typ in zip(payload, types):
+            if typ is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif typ is int:
+                if not isinstance(value, int) or isinstance(value, bool):
+                    raise ValueError("expected an integer")
+                values.append(value)
+            else:
+                values.append(typ(value))
+        return tuple(values)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def seek_condition(columns: Sequence, values: Sequence, descending: bool):
+    """Row-value comparison that selects rows strictly after the cursor position."""
+    if len(columns) == 1:
+        key, target = columns[0], values[0]
+    else:
+        key, target = tuple_(*columns), tuple_(*values)
+    return key < target if descending else key > target
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int, *key_attrs: str) -> Optional[str]:
+    """Expose the cursor for the page after `rows` when the page came back full."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    cursor = encode_cursor(*(getattr(last, attr) for attr in key_attrs))
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
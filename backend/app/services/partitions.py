@@ -0,0 +1,85 @@
+"""Monthly partitions of the flights table on PostgreSQL.
+
+Migration 0005 turns `flights` into a table range-partitioned on actual_time
+with one partition per calendar month and a DEFAULT partition for the rest.
+`ensure_partitions` runs at startup and creates the partitions for the next
+PARTITION_MONTHS_AHEAD months so new flights never land in the DEFAULT
+partition; the archival job drops a month's partition once it has been
+emptied. On SQLite, or before the migration has run, these are no-ops.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import exc, text
+
+PARTITION_MONTHS_AHEAD = 12
+
+
+def month_start(ts: datetime) -> datetime:
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """The first day of the month `months` after (or before) `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"flights_y{month.year}m{month.month:02d}"
+
+
+async def is_partitioned(conn) -> bool:
+    """Whether `flights` is a partitioned table (PostgreSQL after migration 0005)."""
+    if conn.dialect.name != "postgresql":
+        return False
+    result = await conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'flights' AND pg_table_is_visible(c.oid))"
+    ))
+    return bool(result.scalar())
+
+
+async def ensure_partitions(conn, now: Optional[datetime] = None,
+                            months_ahead: int = PARTITION_MONTHS_AHEAD) -> List[str]:
+    """Create any missing partitions from this month to `months_ahead` months on.
+
+    Returns the names of the partitions created. A month that already has
+    rows in the DEFAULT partition cannot get its own partition; it is skipped
+    and its flights stay in the DEFAULT partition.
+    """
+    if not await is_partitioned(conn):
+        return []
+    created = []
+    first = month_start(now or datetime.utcnow())
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        name = partition_name(month)
+        exists = await conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+        if exists.scalar():
+            continue
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF flights "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+        except exc.DBAPIError:
+            continue
+        created.append(name)
+    return created
+
+
+async def drop_partition(conn, month: datetime) -> bool:
+    """Drop the partition for `month` if it exists and is empty. Returns whether it was dropped."""
+    if not await is_partitioned(conn):
+        return False
+    name = partition_name(month)
+    exists = await conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+    if not exists.scalar():
+        return False
+    has_rows = await conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})"))
+    if has_rows.scalar():
+        return False
+    await conn.execute(text(f"DROP TABLE {name}"))
+    return True
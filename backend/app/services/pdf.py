@@ -0,0 +1,168 @@
+"""Minimal streaming PDF writer for tabular reports.
+
+Writes a paginated table (title block, shaded header row, striped rows, page
+footer) using the standard Helvetica fonts, so no PDF library is needed. Each
+page is flushed to the output file as soon as it fills up, which keeps memory
+flat for reports with hundreds of thousands of rows.
+"""
+import math
+from datetime import datetime
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+
+PAGE_LETTER = (612, 792)
+MARGIN = 36
+ROW_HEIGHT = 14
+HEADER_COLOR = (30, 58, 138)  # Blue-900, matches the web app
+ALT_ROW_COLOR = (241, 245, 249)  # Slate-100
+
+# Average Helvetica glyph width as a fraction of the font size
+_AVG_CHAR_WIDTH = 0.52
+
+
+def _rgb(color: Tuple[int, int, int]) -> str:
+    return " ".join(f"{c / 255:.3f}" for c in color)
+
+
+def _escape(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _fit(text: str, width: float, size: float) -> str:
+    """Truncate `text` so it fits in `width` points at font `size`."""
+    max_chars = max(1, int((width - 4) / (size * _AVG_CHAR_WIDTH)))
+    if len(text) <= max_chars:
+        return text
+    return text[: max(1, max_chars - 1)] + "~"
+
+
+class TablePDF:
+    """Write a single table to a PDF file, one page at a time."""
+
+    def __init__(
+        self,
+        fp: BinaryIO,
+        title: str,
+        columns: Sequence[Tuple[str, float]],
+        landscape: bool = True,
+        total_rows: Optional[int] = None,
+        font_size: float = 8,
+    ):
+        self.fp = fp
+        self.title = title
+        self.font_size = font_size
+        self.width, self.height = PAGE_LETTER[::-1] if landscape else PAGE_LETTER
+
+        # Scale relative column widths to the printable width
+        usable = self.width - 2 * MARGIN
+        total_weight = sum(weight for _, weight in columns)
+        self.columns = [(header, usable * weight / total_weight) for header, weight in columns]
+
+        self.table_top = self.height - 90
+        self.rows_per_page = int((self.table_top - MARGIN - 20) // ROW_HEIGHT) - 1
+        self.total_pages = max(1, math.ceil(total_rows / self.rows_per_page)) if total_rows is not None else None
+
+        self._offsets: List[int] = []
+        self._page_ids: List[int] = []
+        self._rows: List[Sequence[str]] = []
+        self._generated = datetime.now().strftime("%B %d, %Y %I:%M %p")
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        # Object ids 1-4 are fixed: catalog, page tree, regular and bold font.
+        # The page tree is written last, once every page id is known.
+        self._object(1, "<< /Type /Catalog /Pages 2 0 R >>")
+        self._offsets.append(0)
+        self._object(3, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        self._object(4, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+    def _write(self, data: bytes) -> None:
+        self.fp.write(data)
+
+    def _object(self, obj_id: int, body: str, stream: Optional[bytes] = None) -> None:
+        offset = self.fp.tell()
+        if obj_id > len(self._offsets):
+            self._offsets.append(offset)
+        else:
+            self._offsets[obj_id - 1] = offset
+        if stream is None:
+            self._write(f"{obj_id} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+        else:
+            self._write(f"{obj_id} 0 obj\n{body}\nstream\n".encode("latin-1"))
+            self._write(stream)
+            self._write(b"\nendstream\nendobj\n")
+
+    def _text(self, x: float, y: float, text: str, size: float, bold: bool = False) -> str:
+        font = "/F2" if bold else "/F1"
+        return f"BT {font} {size} Tf {x:.2f} {y:.2f} Td ({_escape(text)}) Tj ET\n"
+
+    def _render_page(self) -> None:
+        page_number = len(self._page_ids) + 1
+        out = []
+        # Title block
+        out.append(f"{_rgb(HEADER_COLOR)} rg\n")
+        out.append(self._text(MARGIN, self.height - 50, self.title, 18, bold=True))
+        out.append("0.392 0.392 0.392 rg\n")
+        out.append(self._text(MARGIN, self.height - 66, f"Generated: {self._generated}", 9))
+        brand = "Airport Flight Tracker"
+        out.append(self._text(self.width - MARGIN - len(brand) * 9 * _AVG_CHAR_WIDTH, self.height - 66, brand, 9))
+        out.append(f"0.784 0.784 0.784 RG 0.5 w {MARGIN} {self.height - 74} m {self.width - MARGIN} {self.height - 74} l S\n")
+
+        # Header row
+        y = self.table_top
+        out.append(f"{_rgb(HEADER_COLOR)} rg {MARGIN} {y - ROW_HEIGHT:.2f} {self.width - 2 * MARGIN:.2f} {ROW_HEIGHT} re f\n")
+        out.append("1 1 1 rg\n")
+        x = MARGIN
+        for header, width in self.columns:
+            out.append(self._text(x + 2, y - ROW_HEIGHT + 4, _fit(header, width, self.font_size), self.font_size, bold=True))
+            x += width
+
+        # Body rows
+        for index, row in enumerate(self._rows):
+            y -= ROW_HEIGHT
+            if index % 2:
+                out.append(
+                    f"{_rgb(ALT_ROW_COLOR)} rg {MARGIN} {y - ROW_HEIGHT:.2f} "
+                    f"{self.width - 2 * MARGIN:.2f} {ROW_HEIGHT} re f\n"
+                )
+            out.append("0.1 0.1 0.1 rg\n")
+            x = MARGIN
+            for (_, width), value in zip(self.columns, row):
+                out.append(self._text(x + 2, y - ROW_HEIGHT + 4, _fit(value, width, self.font_size), self.font_size))
+                x += width
+
+        # Footer
+        footer = f"Page {page_number}" + (f" of {self.total_pages}" if self.total_pages else "")
+        out.append("0.588 0.588 0.588 rg\n")
+        out.append(self._text(self.width / 2 - len(footer) * 8 * _AVG_CHAR_WIDTH / 2, 20, footer, 8))
+
+        content = "".join(out).encode("latin-1")
+        content_id = len(self._offsets) + 1
+        self._object(content_id, f"<< /Length {len(content)} >>", content)
+        page_id = content_id + 1
+        self._object(
+            page_id,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width} {self.height}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>",
+        )
+        self._page_ids.append(page_id)
+        self._rows = []
+
+    def add_row(self, values: Sequence[object]) -> None:
+        """Append a row; None renders as '-'."""
+        self._rows.append(["-" if v is None or v == "" else str(v) for v in values])
+        if len(self._rows) >= self.rows_per_page:
+            self._render_page()
+
+    def close(self) -> int:
+        """Flush the last page and write the page tree and trailer. Returns page count."""
+        if self._rows or not self._page_ids:
+            self._render_page()
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>")
+
+        xref_offset = self.fp.tell()
+        lines = [f"xref\n0 {len(self._offsets) + 1}\n", "0000000000 65535 f \n"]
+        lines += [f"{offset:010d} 00000 n \n" for offset in self._offsets]
+        lines.append(f"trailer\n<< /Size {len(self._offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        self._write("".join(lines).encode("latin-1"))
+        return len(self._page_ids)
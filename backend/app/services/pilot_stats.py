@@ -0,0 +1,322 @@
+"""Incrementally maintained per-pilot activity statistics.
+
+Each flight counts towards its pilot in command's `pilot_stats` row (flights,
+takeoffs, landings, cross-country flights, passengers, first and last
+flight) and towards one `pilot_stat_breakdowns` row per dimension: year,
+flight type, aircraft category and airport. The flight write routes apply
++1/-1 deltas in the same transaction as the flight change, the same way as
+the traffic rollups, so a pilot's stats page and activity-sorted rosters
+never scan the flights table.
+
+First and last flight times only move forward on an insert. When a
+pilot's first or last flight is removed or moved, they are recomputed for
+that pilot from the (pic_id, actual_time) index and the flight archive.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import Select, case, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Flight, FlightType, Pilot, PilotStatBreakdown, PilotStats
+from app.services.archive import flight_archive
+from app.services.reference_data import reference_cache
+from app.services.versions import FLIGHTS, bump_versions
+
+REBUILD_CHUNK_ROWS = 50_000
+UPSERT_BATCH_ROWS = 1000
+
+DIMENSIONS = ("year", "flight_type", "aircraft_category", "airport")
+_COUNTERS = ("flight_count", "takeoffs", "landings", "cross_country_count", "passengers")
+_BREAKDOWN_KEY = ["pilot_id", "dimension", "key"]
+
+# Placeholder sort value for pilots with no flights, so they sort (and page) last
+NEVER_FLOWN = datetime(1900, 1, 1)
+
+
+class PilotFact(NamedTuple):
+    """The parts of a flight that pilot stats depend on."""
+    pic_id: int
+    aircraft_id: int
+    airport_id: int
+    actual_time: datetime
+    flight_type: FlightType
+    operation: str
+    passengers: int
+
+
+def flight_fact(flight) -> PilotFact:
+    """Snapshot a Flight (or row mapping) for pilot stats bookkeeping."""
+    if isinstance(flight, Mapping):
+        get = flight.__getitem__
+    else:
+        get = lambda name: getattr(flight, name)  # noqa: E731
+    return PilotFact(
+        pic_id=get("pic_id"),
+        aircraft_id=get("aircraft_id"),
+        airport_id=get("airport_id"),
+        actual_time=get("actual_time"),
+        flight_type=FlightType(get("flight_type")),
+        operation=get("operation"),
+        passengers=get("passengers") or 0,
+    )
+
+
+def _upsert(db: AsyncSession):
+    return pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+
+
+async def apply_deltas(
+    db: AsyncSession,
+    added: Iterable[PilotFact] = (),
+    removed: Iterable[PilotFact] = (),
+) -> None:
+    """Add `added` flights to and subtract `removed` flights from the pilot stats."""
+    added, removed = list(added), list(removed)
+    aircraft = await reference_cache.aircraft.fetch_many(db, {fact.aircraft_id for fact in added + removed})
+
+    totals: Dict[int, Counter] = {}
+    first: Dict[int, datetime] = {}
+    last: Dict[int, datetime] = {}
+    breakdowns: Counter = Counter()
+    for facts, sign in ((added, 1), (removed, -1)):
+        for fact in facts:
+            counter = totals.setdefault(fact.pic_id, Counter())
+            counter["flight_count"] += sign
+            # A touch-and-go is a landing and a takeoff
+            counter["takeoffs"] += sign * (fact.operation in ("takeoff", "touch_and_go"))
+            counter["landings"] += sign * (fact.operation in ("landing", "touch_and_go"))
+            counter["cross_country_count"] += sign * (fact.flight_type == FlightType.CROSS_COUNTRY)
+            counter["passengers"] += sign * fact.passengers
+            if sign > 0:
+                first[fact.pic_id] = min(first.get(fact.pic_id, fact.actual_time), fact.actual_time)
+                last[fact.pic_id] = max(last.get(fact.pic_id, fact.actual_time), fact.actual_time)
+            category = aircraft.get(fact.aircraft_id)
+            for dimension, key in (
+                ("year", str(fact.actual_time.year)),
+                ("flight_type", fact.flight_type.value),
+                ("aircraft_category", category.category.value if category else "unknown"),
+                ("airport", str(fact.airport_id)),
+            ):
+                breakdowns[(fact.pic_id, dimension, key)] += sign
+
+    insert = _upsert(db)
+    rows = [
+        {"pilot_id": pilot_id, **{name: counter[name] for name in _COUNTERS},
+         "first_flight_at": first.get(pilot_id), "last_flight_at": last.get(pilot_id)}
+        for pilot_id, counter in totals.items()
+    ]
+    for offset in range(0, len(rows), UPSERT_BATCH_ROWS):
+        stmt = insert(PilotStats).values(rows[offset:offset + UPSERT_BATCH_ROWS])
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["pilot_id"],
+            set_={
+                **{name: getattr(PilotStats, name) + getattr(excluded, name) for name in _COUNTERS},
+                "first_flight_at": case(
+                    (or_(PilotStats.first_flight_at.is_(None), excluded.first_flight_at < PilotStats.first_flight_at),
+                     excluded.first_flight_at),
+                    else_=PilotStats.first_flight_at,
+                ),
+                "last_flight_at": case(
+                    (or_(PilotStats.last_flight_at.is_(None), excluded.last_flight_at > PilotStats.last_flight_at),
+                     excluded.last_flight_at),
+                    else_=PilotStats.last_flight_at,
+                ),
+            },
+        )
+        await db.execute(stmt)
+
+    rows = [
+        {**dict(zip(_BREAKDOWN_KEY, key)), "flight_count": count}
+        for key, count in breakdowns.items()
+        if count
+    ]
+    for offset in range(0, len(rows), UPSERT_BATCH_ROWS):
+        stmt = insert(PilotStatBreakdown).values(rows[offset:offset + UPSERT_BATCH_ROWS])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=_BREAKDOWN_KEY,
+            set_={"flight_count": PilotStatBreakdown.flight_count + stmt.excluded.flight_count},
+        )
+        await db.execute(stmt)
+
+    if removed:
+        await _recompute_first_last(db, removed)
+
+
+async def _recompute_first_last(db: AsyncSession, removed: Sequence[PilotFact]) -> None:
+    """Reset first/last flight times of pilots whose first or last flight was removed.
+
+    Recomputed from the flights table (pending changes are flushed first)
+    and the flight archive.
+    """
+    result = await db.execute(
+        select(PilotStats.pilot_id, PilotStats.first_flight_at, PilotStats.last_flight_at)
+        .where(PilotStats.pilot_id.in_(sorted({fact.pic_id for fact in removed})))
+    )
+    stored = {pilot_id: (first, last) for pilot_id, first, last in result.all()}
+    pilot_ids = sorted({fact.pic_id for fact in removed if fact.actual_time in stored.get(fact.pic_id, ())})
+    if not pilot_ids:
+        return
+    result = await db.execute(
+        select(Flight.pic_id, func.min(Flight.actual_time), func.max(Flight.actual_time))
+        .where(Flight.pic_id.in_(pilot_ids))
+        .group_by(Flight.pic_id)
+    )
+    ranges = {pilot_id: (first, last) for pilot_id, first, last in result.all()}
+    for pilot_id in pilot_ids:
+        first, last = ranges.get(pilot_id, (None, None))
+        archived_first, archived_last = flight_archive.bounds(pilot_id=pilot_id)
+        await db.execute(
+            update(PilotStats)
+            .where(PilotStats.pilot_id == pilot_id)
+            .values(
+                first_flight_at=min(filter(None, (first, archived_first)), default=None),
+                last_flight_at=max(filter(None, (last, archived_last)), default=None),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def record_flight(db: AsyncSession, flight: Flight) -> None:
+    await apply_deltas(db, added=[flight_fact(flight)])
+
+
+async def retract_flight(db: AsyncSession, flight: Flight) -> None:
+    """Subtract a flight; call after db.delete(flight) so first/last are recomputed without it."""
+    await apply_deltas(db, removed=[flight_fact(flight)])
+
+
+async def move_flight(db: AsyncSession, before: PilotFact, flight: Flight) -> None:
+    """Re-count a flight after an update changed its pilot, time, aircraft, etc."""
+    after = flight_fact(flight)
+    if after != before:
+        await apply_deltas(db, added=[after], removed=[before])
+
+
+async def forget_pilot(db: AsyncSession, pilot_id: int) -> None:
+    """Drop a pilot's stats rows, before deleting the pilot."""
+    await db.execute(delete(PilotStatBreakdown).where(PilotStatBreakdown.pilot_id == pilot_id))
+    await db.execute(delete(PilotStats).where(PilotStats.pilot_id == pilot_id))
+
+
+async def rebuild_pilot_stats(db: AsyncSession, chunk_rows: int = REBUILD_CHUNK_ROWS) -> int:
+    """Recompute every pilot's stats from the flights table and the flight archive.
+
+    Returns flights processed. Works through the flights chunk_rows at a time
+    in primary key order and commits each chunk, like rebuild_rollups.
+    """
+    await db.execute(delete(PilotStatBreakdown))
+    await db.execute(delete(PilotStats))
+    await db.commit()
+
+    processed = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(*(Flight.__table__.c[name] for name in PilotFact._fields), Flight.id)
+            .where(Flight.id > last_id)
+            .order_by(Flight.id)
+            .limit(chunk_rows)
+        )
+        rows = result.mappings().all()
+        if not rows:
+            break
+        await apply_deltas(db, added=[flight_fact(row) for row in rows])
+        await db.commit()
+        processed += len(rows)
+        last_id = rows[-1]["id"]
+
+    for rows in flight_archive.batches(chunk_rows):
+        await apply_deltas(db, added=[flight_fact(row) for row in rows])
+        await db.commit()
+        processed += len(rows)
+
+    # GET /pilots responses carry the stats and are tagged by the flights version
+    await bump_versions(db, FLIGHTS)
+    await db.commit()
+    return processed
+
+
+async def pilot_stats(db: AsyncSession, pilot_id: int) -> dict:
+    """A pilot's totals and breakdowns, as a PilotStatsResponse dict."""
+    stats = await db.get(PilotStats, pilot_id)
+    result = await db.execute(
+        select(PilotStatBreakdown.dimension, PilotStatBreakdown.key, PilotStatBreakdown.flight_count)
+        .where(PilotStatBreakdown.pilot_id == pilot_id, PilotStatBreakdown.flight_count > 0)
+    )
+    breakdowns: Dict[str, List[dict]] = {dimension: [] for dimension in DIMENSIONS}
+    for dimension, key, count in result.all():
+        breakdowns[dimension].append({"key": key, "flight_count": count})
+    breakdowns["year"].sort(key=lambda item: item["key"])
+    for dimension in DIMENSIONS[1:]:
+        breakdowns[dimension].sort(key=lambda item: (-item["flight_count"], item["key"]))
+
+    airports = await reference_cache.airports.fetch_many(db, {int(item["key"]) for item in breakdowns["airport"]})
+    for item in breakdowns["airport"]:
+        airport = airports.get(int(item["key"]))
+        item["label"] = airport.icao_code if airport else None
+
+    return {
+        "pilot_id": pilot_id,
+        **{name: getattr(stats, name) if stats else 0 for name in _COUNTERS},
+        "first_flight_at": stats.first_flight_at if stats else None,
+        "last_flight_at": stats.last_flight_at if stats else None,
+        "by_year": breakdowns["year"],
+        "by_flight_type": breakdowns["flight_type"],
+        "by_aircraft_category": breakdowns["aircraft_category"],
+        "by_airport": breakdowns["airport"],
+    }
+
+
+# list_pilots sort keys -> (sort expression, cursor value type); pilots without
+# stats sort as if they had no flights
+SORT_KEYS = {
+    "last_name": (Pilot.last_name, str),
+    "total_flight_hours": (Pilot.total_flight_hours, float),
+    "flight_count": (func.coalesce(PilotStats.flight_count, 0), int),
+    "cross_country_count": (func.coalesce(PilotStats.cross_country_count, 0), int),
+    "last_flight_at": (func.coalesce(PilotStats.last_flight_at, NEVER_FLOWN), datetime),
+}
+SORT_PATTERN = "^-?(id|" + "|".join(SORT_KEYS) + ")$"
+
+
+class PilotListing(NamedTuple):
+    """A pilot roster query and the keyset it pages on."""
+    query: Select
+    columns: Sequence
+    types: Tuple[type, ...]
+    attrs: Tuple[str, ...]
+    descending: bool
+
+
+def pilot_list_query(sort: str = "id") -> PilotListing:
+    """Pilots with their activity totals, ordered by `sort` (prefix "-" for descending).
+
+    Rows carry the Pilot columns plus flight_count, cross_country_count and
+    last_flight_at. Any sort other than id pages on (sort_key, id).
+    """
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    columns = [
+        *Pilot.__table__.c,
+        func.coalesce(PilotStats.flight_count, 0).label("flight_count"),
+        func.coalesce(PilotStats.cross_country_count, 0).label("cross_country_count"),
+        PilotStats.last_flight_at,
+    ]
+    if name == "id":
+        keys, types, attrs = (Pilot.id,), (int,), ("id",)
+    else:
+        expression, value_type = SORT_KEYS[name]
+        sort_key = expression.label("sort_key")
+        columns.append(sort_key)
+        keys, types, attrs = (expression, Pilot.id), (value_type, int), ("sort_key", "id")
+    query = (
+        select(*columns)
+        .outerjoin(PilotStats, PilotStats.pilot_id == Pilot.id)
+        .order_by(*(key.desc() if descending else key for key in keys))
+    )
+    return PilotListing(query, keys, types, attrs, descending)
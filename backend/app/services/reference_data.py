@@ -0,0 +1,312 @@
+"""In-memory reference data: airports, aircraft and pilots.
+
+These tables change rarely and are read on nearly every request: for FK
+checks when logging flights, for natural-key lookups and for the objects
+nested in every FlightResponse. `reference_cache` keeps a validated response
+snapshot of every row, indexed by id and by natural key (ICAO code, tail
+number, certificate number).
+
+The cache is loaded at startup. The create/update/delete routes update it
+after they commit, and it is fully reloaded every REFERENCE_CACHE_REFRESH_SECONDS.
+Each table also remembers the `table_versions` counter it reflects: routes
+call `sync` with the current counters (see versions.conditional) and a table
+that another process (seed script, other worker) has changed since is
+reloaded before the route reads it. The table's own writes advance the
+remembered counter, so they cost no reload.
+A lookup that misses falls back to the database and caches the row it finds.
+
+Each table carries a version that is bumped on every change. A reload or
+miss-fill that overlaps a write is discarded instead of overwriting the
+newer snapshot with an older one.
+
+Every table also keeps a token-prefix search index (see text_index) over its
+searchable text columns, updated together with the snapshots, which backs the
+`search=` list filters and GET /search. Airports additionally keep a spatial
+grid of their positions and per-zoom map clusters (see geo).
+"""
+import asyncio
+from datetime import datetime
+from typing import Dict, Generic, Iterable, Optional, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.core.encoding import dumps
+from app.models.models import Aircraft, Airport, Pilot, TableVersion
+from app.schemas.schemas import AircraftResponse, AirportResponse, PilotResponse
+from app.services.geo import ClusterIndex, GeoGrid
+from app.services.text_index import PrefixIndex
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class ReferenceTable(Generic[T]):
+    """Snapshots of one table, by id and by natural key, plus a search index."""
+
+    def __init__(
+        self,
+        name: str,
+        model,
+        schema: Type[T],
+        key_attr: str,
+        search_fields: Sequence[str] = (),
+        point_fields: Optional[Tuple[str, str]] = None,
+    ):
+        self.name = name
+        self.model = model
+        self.schema = schema
+        self.key_attr = key_attr
+        self.search_fields = tuple(search_fields)
+        self.search = PrefixIndex()
+        self.point_fields = point_fields  # (latitude, longitude) attributes
+        self.spatial: Optional[GeoGrid] = GeoGrid() if point_fields else None
+        self.clusters: Optional[ClusterIndex] = ClusterIndex() if point_fields else None
+        self.version = 0
+        self.db_version = -1  # the table_versions counter the snapshots reflect; -1 until loaded
+        self.hits = 0
+        self.misses = 0
+        self._by_id: Dict[int, T] = {}
+        self._by_key: Dict[str, int] = {}
+        self._fragments: Dict[int, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _search_text(self, snapshot: T) -> list:
+        return [getattr(snapshot, field) for field in self.search_fields]
+
+    def _point(self, snapshot: T) -> Tuple[Optional[float], Optional[float]]:
+        lat_attr, lon_attr = self.point_fields
+        return getattr(snapshot, lat_attr), getattr(snapshot, lon_attr)
+
+    def _store(self, snapshot: T, index: bool = True) -> None:
+        previous = self._by_id.get(snapshot.id)
+        if previous is not None:
+            self._by_key.pop(getattr(previous, self.key_attr), None)
+        self._by_id[snapshot.id] = snapshot
+        self._by_key[getattr(snapshot, self.key_attr)] = snapshot.id
+        self._fragments.pop(snapshot.id, None)
+        if index:
+            self.search.add(snapshot.id, *self._search_text(snapshot))
+            if self.spatial is not None:
+                self.spatial.add(snapshot.id, *self._point(snapshot))
+                self.clusters.add(snapshot.id, *self._point(snapshot))
+
+    def _applied(self, db_version: Optional[int]) -> None:
+        # Only a write directly following the loaded state is known to leave nothing else unseen
+        if db_version is not None and db_version == self.db_version + 1:
+            self.db_version = db_version
+
+    def put(self, obj, db_version: Optional[int] = None) -> T:
+        """Cache (or replace) the snapshot of a committed row.
+
+        `db_version` is the table_versions counter the commit bumped the table to.
+        """
+        snapshot = self.schema.model_validate(obj)
+        self._store(snapshot)
+        self.version += 1
+        self._applied(db_version)
+        return snapshot
+
+    def remove(self, obj_id: int, db_version: Optional[int] = None) -> None:
+        self._fragments.pop(obj_id, None)
+        previous = self._by_id.pop(obj_id, None)
+        if previous is not None:
+            self._by_key.pop(getattr(previous, self.key_attr), None)
+        self.search.remove(obj_id)
+        if self.spatial is not None:
+            self.spatial.remove(obj_id)
+            self.clusters.remove(obj_id)
+        self.version += 1
+        self._applied(db_version)
+
+    def replace_all(self, rows: Iterable, seen_version: int, db_version: Optional[int] = None) -> bool:
+        """Swap in a full reload, unless a write landed since `seen_version`.
+
+        `db_version` is the table_versions counter read before the rows.
+        """
+        if self.version != seen_version:
+            return False
+        self._by_id = {}
+        self._by_key = {}
+        self._fragments = {}
+        for row in rows:
+            self._store(self.schema.model_validate(row), index=False)
+        self.search.build((obj_id, self._search_text(snapshot)) for obj_id, snapshot in self._by_id.items())
+        if self.spatial is not None:
+            points = [(obj_id, *self._point(snapshot)) for obj_id, snapshot in self._by_id.items()]
+            self.spatial.build(points)
+            self.clusters.build(points)
+        self.version += 1
+        if db_version is not None:
+            self.db_version = db_version
+        return True
+
+    def get(self, obj_id: int) -> Optional[T]:
+        return self._by_id.get(obj_id)
+
+    def get_by_key(self, key: str) -> Optional[T]:
+        obj_id = self._by_key.get(key)
+        return self._by_id[obj_id] if obj_id is not None else None
+
+    def fragment(self, obj_id: int) -> bytes:
+        """The snapshot encoded as JSON (b"null" if absent), encoded once per snapshot."""
+        fragment = self._fragments.get(obj_id)
+        if fragment is None:
+            snapshot = self._by_id.get(obj_id)
+            fragment = dumps(snapshot.model_dump(mode="json")) if snapshot is not None else b"null"
+            if snapshot is not None:
+                self._fragments[obj_id] = fragment
+        return fragment
+
+    def json_array(self, snapshots: Iterable[T]) -> bytes:
+        """Snapshots as a JSON array, reusing the cached encoding of current ones."""
+        return b"[" + b",".join(
+            self.fragment(snapshot.id) if self._by_id.get(snapshot.id) is snapshot
+            else dumps(snapshot.model_dump(mode="json"))
+            for snapshot in snapshots
+        ) + b"]"
+
+    async def fetch(self, db: AsyncSession, obj_id: int) -> Optional[T]:
+        """Snapshot by id, falling back to the database on a miss."""
+        found = await self.fetch_many(db, [obj_id])
+        return found.get(obj_id)
+
+    async def fetch_many(self, db: AsyncSession, ids: Iterable[int]) -> Dict[int, T]:
+        """Snapshots for `ids`; ids that do not exist are left out."""
+        found = {}
+        missing = set()
+        for obj_id in ids:
+            snapshot = self._by_id.get(obj_id)
+            if snapshot is None:
+                missing.add(obj_id)
+            else:
+                found[obj_id] = snapshot
+        self.hits += len(found)
+        if missing:
+            self.misses += len(missing)
+            seen_version = self.version
+            result = await db.execute(select(self.model).where(self.model.id.in_(missing)))
+            for row in result.scalars().all():
+                snapshot = self.schema.model_validate(row)
+                if self.version == seen_version:
+                    self._store(snapshot)
+                found[snapshot.id] = snapshot
+        return found
+
+    async def fetch_by_key(self, db: AsyncSession, key: str) -> Optional[T]:
+        """Snapshot by natural key, falling back to the database on a miss."""
+        obj_id = self._by_key.get(key)
+        if obj_id is not None:
+            self.hits += 1
+            return self._by_id[obj_id]
+        self.misses += 1
+        seen_version = self.version
+        result = await db.execute(select(self.model).where(getattr(self.model, self.key_attr) == key))
+        row = result.scalar_one_or_none()
+        if row is None:
+            return None
+        snapshot = self.schema.model_validate(row)
+        if self.version == seen_version:
+            self._store(snapshot)
+        return snapshot
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "db_version": self.db_version,
+            "entries": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "indexed": len(self.search),
+        }
+
+
+class ReferenceCache:
+    """The reference tables, plus helpers for embedding them in flights."""
+
+    def __init__(self):
+        self.airports = ReferenceTable(
+            "airports", Airport, AirportResponse, "icao_code", ("icao_code", "faa_code", "name", "city"),
+            point_fields=("latitude", "longitude"),
+        )
+        self.aircraft = ReferenceTable(
+            "aircraft", Aircraft, AircraftResponse, "tail_number", ("tail_number", "owner_name", "manufacturer", "model")
+        )
+        self.pilots = ReferenceTable(
+            "pilots", Pilot, PilotResponse, "certificate_number", ("first_name", "last_name", "certificate_number")
+        )
+        self.loaded_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._sync_lock = asyncio.Lock()
+
+    @property
+    def tables(self) -> Sequence[ReferenceTable]:
+        return (self.airports, self.aircraft, self.pilots)
+
+    async def load(self, tables: Optional[Sequence[ReferenceTable]] = None) -> None:
+        """(Re)load `tables` (default: every table) from the database."""
+        async with async_session() as db:
+            # Counters first: a write landing during the load leaves the table marked older, not newer
+            db_versions = dict((await db.execute(select(TableVersion.name, TableVersion.version))).all())
+            for table in tables or self.tables:
+                seen_version = table.version
+                result = await db.execute(select(table.model))
+                table.replace_all(result.scalars().all(), seen_version, db_versions.get(table.name, 0))
+        self.loaded_at = datetime.utcnow()
+
+    def _stale(self, db_versions: Dict[str, int]) -> list:
+        return [table for table in self.tables if db_versions.get(table.name, -1) > table.db_version]
+
+    async def sync(self, db_versions: Dict[str, int]) -> None:
+        """Reload the tables whose table_versions counter has moved past their snapshots."""
+        if not self._stale(db_versions):
+            return
+        async with self._sync_lock:
+            stale = self._stale(db_versions)  # another request may have reloaded them meanwhile
+            if stale:
+                await self.load(stale)
+
+    async def refresh_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load()
+                self.last_error = None
+            except Exception as exc:  # keep serving the current copy; retry next interval
+                self.last_error = str(exc) or exc.__class__.__name__
+
+    async def load_related(
+        self, db: AsyncSession, flights: Sequence, embed: Iterable[str] = ("airport", "aircraft", "pilot")
+    ) -> None:
+        """Make sure every airport, aircraft and pilot the flights reference is cached.
+
+        `embed` limits this to the related objects the response will include.
+        """
+        if "airport" in embed:
+            await self.airports.fetch_many(db, {flight.airport_id for flight in flights})
+        if "aircraft" in embed:
+            await self.aircraft.fetch_many(db, {flight.aircraft_id for flight in flights})
+        if "pilot" in embed:
+            await self.pilots.fetch_many(db, {flight.pic_id for flight in flights})
+
+    def related(self, flight) -> dict:
+        """The nested airport/aircraft/pilot of a FlightResponse, from the cache."""
+        return {
+            "airport": self.airports.get(flight.airport_id),
+            "aircraft": self.aircraft.get(flight.aircraft_id),
+            "pilot": self.pilots.get(flight.pic_id),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "loaded_at": self.loaded_at,
+            "last_error": self.last_error,
+            "tables": [table.stats() for table in self.tables],
+        }
+
+
+reference_cache = ReferenceCache()
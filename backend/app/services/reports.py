@@ -0,0 +1,258 @@
+"""Server-side report generation.
+
+Reports (pilot logbooks, airport movement logs, aircraft logs) are rendered to
+PDF in a process pool so the event loop serving API requests never does the
+work. Each worker process opens its own database engine and streams the
+flights it needs, so nothing large is pickled between processes. Archived
+flights in the report's date range are merged in, as in the exports.
+
+Jobs are tracked in memory by id. Identical requests submitted while a job is
+still queued or running share that job instead of rendering twice.
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+from app.models.models import Airport, Aircraft, Pilot
+from app.schemas.schemas import ReportKind
+from app.services.archive import flight_archive
+from app.services.export import EXPORT_CHUNK_ROWS, RelatedLoader, merged_chunks
+from app.services.flight_queries import FLIGHT_ORDER, filter_flights, flight_rows_query
+from app.services.pdf import TablePDF
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_DATE_FORMAT = "%m/%d/%Y %H:%M"
+
+
+def _pilot_name(row, related: RelatedLoader) -> Optional[str]:
+    pilot = related.pilots.get(row["pic_id"])
+    return f"{pilot['first_name']} {pilot['last_name']}" if pilot else None
+
+
+def _enum_value(value):
+    return getattr(value, "value", value)
+
+
+# (header, relative width, value) per report kind
+_COLUMNS = {
+    ReportKind.PILOT_LOGBOOK: [
+        ("Date/Time", 2.2, lambda r, rel: r["actual_time"].strftime(_DATE_FORMAT)),
+        ("Airport", 1.2, lambda r, rel: (rel.airports.get(r["airport_id"]) or {}).get("icao_code")),
+        ("Operation", 1.6, lambda r, rel: r["operation"]),
+        ("Type", 1.6, lambda r, rel: _enum_value(r["flight_type"])),
+        ("Aircraft", 1.4, lambda r, rel: (rel.aircraft.get(r["aircraft_id"]) or {}).get("tail_number")),
+        ("Route", 1.6, lambda r, rel: f"{r['origin_airport'] or '-'} > {r['destination_airport'] or '-'}"),
+        ("Pax", 0.8, lambda r, rel: r["passengers"]),
+        ("Remarks", 4.0, lambda r, rel: r["remarks"]),
+    ],
+    ReportKind.AIRPORT_MOVEMENTS: [
+        ("Date/Time", 2.2, lambda r, rel: r["actual_time"].strftime(_DATE_FORMAT)),
+        ("Airport", 1.2, lambda r, rel: (rel.airports.get(r["airport_id"]) or {}).get("icao_code")),
+        ("Operation", 1.6, lambda r, rel: r["operation"]),
+        ("Type", 1.6, lambda r, rel: _enum_value(r["flight_type"])),
+        ("Aircraft", 1.4, lambda r, rel: (rel.aircraft.get(r["aircraft_id"]) or {}).get("tail_number")),
+        ("Pilot", 2.4, _pilot_name),
+        ("Runway", 1.0, lambda r, rel: r["runway"]),
+        ("Remarks", 3.0, lambda r, rel: r["remarks"]),
+    ],
+    ReportKind.AIRCRAFT: [
+        ("Date/Time", 2.2, lambda r, rel: r["actual_time"].strftime(_DATE_FORMAT)),
+        ("Airport", 1.2, lambda r, rel: (rel.airports.get(r["airport_id"]) or {}).get("icao_code")),
+        ("Operation", 1.6, lambda r, rel: r["operation"]),
+        ("Type", 1.6, lambda r, rel: _enum_value(r["flight_type"])),
+        ("Pilot", 2.4, _pilot_name),
+        ("Pax", 0.8, lambda r, rel: r["passengers"]),
+        ("Fuel (gal)", 1.2, lambda r, rel: f"{r['fuel_gallons']:.1f}" if r["fuel_gallons"] is not None else None),
+        ("Remarks", 3.0, lambda r, rel: r["remarks"]),
+    ],
+}
+
+
+async def _report_title(session: AsyncSession, kind: ReportKind, params: dict) -> str:
+    if kind == ReportKind.PILOT_LOGBOOK:
+        pilot = await session.get(Pilot, params["pilot_id"])
+        return f"Pilot Logbook - {pilot.first_name} {pilot.last_name} ({pilot.certificate_number})"
+    if kind == ReportKind.AIRCRAFT:
+        aircraft = await session.get(Aircraft, params["aircraft_id"])
+        return f"Aircraft Report - {aircraft.tail_number} {aircraft.manufacturer} {aircraft.model}"
+    if params.get("airport_id"):
+        airport = await session.get(Airport, params["airport_id"])
+        return f"Airport Movements - {airport.icao_code} {airport.name}"
+    return "Airport Movements - All Airports"
+
+
+async def _render_report(kind: ReportKind, params: dict, path: str) -> dict:
+    settings = get_settings()
+    engine = create_async_engine(settings.read_database_url or settings.database_url, poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    filters = {
+        "pilot_id": params.get("pilot_id"),
+        "airport_id": params.get("airport_id"),
+        "aircraft_id": params.get("aircraft_id"),
+        "flight_type": params.get("flight_type"),
+        "years_back": params.get("years_back"),
+        "date_from": datetime.fromisoformat(params["date_from"]) if params.get("date_from") else None,
+        "date_to": datetime.fromisoformat(params["date_to"]) if params.get("date_to") else None,
+    }
+    columns = _COLUMNS[kind]
+    related = RelatedLoader()
+    rows = 0
+    tmp_path = f"{path}.part"
+    try:
+        async with session_factory() as session, session_factory() as lookup_session:
+            title = await _report_title(lookup_session, kind, params)
+            query = filter_flights(flight_rows_query(), **filters)
+            total = await lookup_session.scalar(select(func.count()).select_from(query.subquery()))
+            archived = None
+            if flight_archive.reaches(**filters):
+                total += flight_archive.count(**filters)
+                archived = (row._asdict() for row in flight_archive.rows(**filters))
+
+            with open(tmp_path, "wb") as fp:
+                pdf = TablePDF(fp, title, [(header, width) for header, width, _ in columns], total_rows=total)
+                result = await session.stream(
+                    query.order_by(*FLIGHT_ORDER).execution_options(yield_per=EXPORT_CHUNK_ROWS)
+                )
+                partitions = result.mappings().partitions()
+                if archived is not None:
+                    partitions = merged_chunks(partitions, archived, 0, None)
+                async for partition in partitions:
+                    await related.load(lookup_session, partition)
+                    for row in partition:
+                        pdf.add_row([value(row, related) for _, _, value in columns])
+                        rows += 1
+                pages = pdf.close()
+            os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        await engine.dispose()
+    return {"rows": rows, "pages": pages}
+
+
+def render_report(kind: str, params: dict, path: str) -> dict:
+    """Process pool entry point: render one report to `path`."""
+    return asyncio.run(_render_report(ReportKind(kind), params, path))
+
+
+@dataclass
+class ReportJob:
+    """A report render tracked by the ReportManager."""
+    id: str
+    kind: ReportKind
+    params: dict
+    key: str
+    path: str
+    status: str = QUEUED
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    rows: Optional[int] = None
+    pages: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ReportManager:
+    """Queues report jobs onto a process pool and tracks their state."""
+
+    def __init__(self):
+        self._jobs: Dict[str, ReportJob] = {}
+        self._in_flight: Dict[str, str] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            settings = get_settings()
+            # spawn, not fork: workers must not inherit the server's event loop or connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.REPORT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    @staticmethod
+    def job_key(kind: ReportKind, params: dict) -> str:
+        canonical = json.dumps({"kind": kind.value, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def submit(self, kind: ReportKind, params: dict) -> ReportJob:
+        """Queue a report, or return the identical job that is already in flight."""
+        self._prune()
+        key = self.job_key(kind, params)
+        existing = self._in_flight.get(key)
+        if existing:
+            return self._jobs[existing]
+
+        reports_dir = get_settings().REPORTS_DIR
+        os.makedirs(reports_dir, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        job = ReportJob(
+            id=job_id,
+            kind=kind,
+            params=params,
+            key=key,
+            path=os.path.join(reports_dir, f"{kind.value}-{job_id}.pdf"),
+        )
+        self._jobs[job_id] = job
+        self._in_flight[key] = job_id
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: ReportJob) -> None:
+        loop = asyncio.get_running_loop()
+        job.status = RUNNING
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(), render_report, job.kind.value, job.params, job.path
+            )
+            job.rows = result["rows"]
+            job.pages = result["pages"]
+            job.status = DONE
+        except Exception as exc:  # surfaced to the client through the job status
+            job.status = FAILED
+            job.error = str(exc) or exc.__class__.__name__
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._in_flight.pop(job.key, None)
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than REPORT_TTL_SECONDS and delete their files."""
+        ttl = get_settings().REPORT_TTL_SECONDS
+        now = datetime.utcnow()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at and (now - job.finished_at).total_seconds() > ttl:
+                del self._jobs[job_id]
+                if os.path.exists(job.path):
+                    os.remove(job.path)
+
+    async def shutdown(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+report_manager = ReportManager()
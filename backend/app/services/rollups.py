@@ -0,0 +1,210 @@
+"""Incrementally maintained traffic rollups.
+
+Each flight contributes to one `flight_rollups` row per granularity, keyed by
+(granularity, bucket_start, airport_id, flight_type, operation). The flight
+write routes apply +1/-1 deltas in the same transaction as the flight change,
+so dashboard and time-series queries read a table whose size depends on
+airports x buckets rather than on the number of flights ever logged.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, desc, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Airport, Flight, FlightRollup, FlightType
+from app.services.archive import flight_archive
+
+HOUR = "hour"
+DAY = "day"
+GRANULARITIES = (HOUR, DAY)
+
+REBUILD_CHUNK_ROWS = 50_000
+
+_KEY_COLUMNS = ["granularity", "bucket_start", "airport_id", "flight_type", "operation"]
+
+
+class RollupFact(NamedTuple):
+    """The parts of a flight that rollups depend on."""
+    airport_id: int
+    actual_time: datetime
+    flight_type: FlightType
+    operation: str
+    passengers: int
+
+
+def flight_fact(flight) -> RollupFact:
+    """Snapshot a Flight (or row mapping) for rollup bookkeeping."""
+    if isinstance(flight, Mapping):
+        get = flight.__getitem__
+    else:
+        get = lambda name: getattr(flight, name)  # noqa: E731
+    return RollupFact(
+        airport_id=get("airport_id"),
+        actual_time=get("actual_time"),
+        flight_type=FlightType(get("flight_type")),
+        operation=get("operation"),
+        passengers=get("passengers") or 0,
+    )
+
+
+def bucket_start(ts: datetime, granularity: str) -> datetime:
+    """Truncate `ts` to the start of its hour or day bucket."""
+    if granularity == HOUR:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _accumulate(deltas: Dict[Tuple, Counter], fact: RollupFact, sign: int) -> None:
+    for granularity in GRANULARITIES:
+        key = (granularity, bucket_start(fact.actual_time, granularity), fact.airport_id,
+               fact.flight_type, fact.operation)
+        counter = deltas.setdefault(key, Counter())
+        counter["flight_count"] += sign
+        counter["passengers"] += sign * fact.passengers
+
+
+async def apply_deltas(
+    db: AsyncSession,
+    added: Iterable[RollupFact] = (),
+    removed: Iterable[RollupFact] = (),
+) -> None:
+    """Add `added` flights to and subtract `removed` flights from the rollups.
+
+    Deltas are merged per rollup key first, then written with one upsert
+    statement executed for every distinct key (a driver-level executemany,
+    compiled once), however many flights the batch covers.
+    """
+    deltas: Dict[Tuple, Counter] = {}
+    for fact in added:
+        _accumulate(deltas, fact, 1)
+    for fact in removed:
+        _accumulate(deltas, fact, -1)
+    rows = [
+        {**dict(zip(_KEY_COLUMNS, key)), "flight_count": c["flight_count"], "passengers": c["passengers"]}
+        for key, c in deltas.items()
+        if c["flight_count"] or c["passengers"]
+    ]
+    if not rows:
+        return
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(FlightRollup.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=_KEY_COLUMNS,
+        set_={
+            "flight_count": FlightRollup.flight_count + stmt.excluded.flight_count,
+            "passengers": FlightRollup.passengers + stmt.excluded.passengers,
+        },
+    )
+    await db.execute(stmt, rows)
+
+
+async def record_flight(db: AsyncSession, flight: Flight) -> None:
+    await apply_deltas(db, added=[flight_fact(flight)])
+
+
+async def retract_flight(db: AsyncSession, flight: Flight) -> None:
+    await apply_deltas(db, removed=[flight_fact(flight)])
+
+
+async def move_flight(db: AsyncSession, before: RollupFact, flight: Flight) -> None:
+    """Re-bucket a flight after an update changed its time, passengers, etc."""
+    after = flight_fact(flight)
+    if after != before:
+        await apply_deltas(db, added=[after], removed=[before])
+
+
+async def rebuild_rollups(db: AsyncSession, chunk_rows: int = REBUILD_CHUNK_ROWS) -> int:
+    """Recompute every rollup from the flights table. Returns flights processed.
+
+    Flights are read in primary key order, chunk_rows at a time, and each chunk
+    is committed separately so the rebuild never holds one huge transaction.
+    Flights moved to the Parquet archive are counted too.
+    """
+    await db.execute(delete(FlightRollup))
+    await db.commit()
+
+    processed = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(Flight.id, Flight.airport_id, Flight.actual_time, Flight.flight_type,
+                   Flight.operation, Flight.passengers)
+            .where(Flight.id > last_id)
+            .order_by(Flight.id)
+            .limit(chunk_rows)
+        )
+        rows = result.mappings().all()
+        if not rows:
+            break
+        await apply_deltas(db, added=[flight_fact(row) for row in rows])
+        await db.commit()
+        processed += len(rows)
+        last_id = rows[-1]["id"]
+
+    for rows in flight_archive.batches(chunk_rows):
+        await apply_deltas(db, added=[flight_fact(row) for row in rows])
+        await db.commit()
+        processed += len(rows)
+    return processed
+
+
+def busiest_airports_query(start: datetime, limit: int = 5):
+    """Airports ranked by flights since `start` (day-aligned)."""
+    flight_count = func.sum(FlightRollup.flight_count).label("flight_count")
+    return select(
+        Airport.id,
+        Airport.icao_code,
+        Airport.name,
+        flight_count,
+    ).join(FlightRollup, FlightRollup.airport_id == Airport.id).where(
+        FlightRollup.granularity == DAY,
+        FlightRollup.bucket_start >= start,
+    ).group_by(Airport.id, Airport.icao_code, Airport.name).having(
+        func.sum(FlightRollup.flight_count) > 0
+    ).order_by(desc("flight_count")).limit(limit)
+
+
+def airport_activity_query(start: datetime):
+    """Flights per airport since `start` (day-aligned); airports without flights are omitted."""
+    return select(
+        FlightRollup.airport_id,
+        func.sum(FlightRollup.flight_count).label("flight_count"),
+    ).where(
+        FlightRollup.granularity == DAY,
+        FlightRollup.bucket_start >= start,
+    ).group_by(FlightRollup.airport_id)
+
+
+def timeseries_query(
+    granularity: str,
+    date_from: datetime,
+    date_to: datetime,
+    airport_id: Optional[int] = None,
+    flight_type: Optional[str] = None,
+    operation: Optional[str] = None,
+    group_by: Optional[str] = None,
+):
+    """Per-bucket totals between date_from and date_to, optionally split by a key column."""
+    columns = [FlightRollup.bucket_start]
+    if group_by:
+        columns.append(getattr(FlightRollup, group_by).label("group"))
+    query = select(
+        *columns,
+        func.sum(FlightRollup.flight_count).label("flight_count"),
+        func.sum(FlightRollup.passengers).label("passengers"),
+    ).where(
+        FlightRollup.granularity == granularity,
+        FlightRollup.bucket_start >= bucket_start(date_from, granularity),
+        FlightRollup.bucket_start <= date_to,
+    )
+    if airport_id:
+        query = query.where(FlightRollup.airport_id == airport_id)
+    if flight_type:
+        query = query.where(FlightRollup.flight_type == flight_type)
+    if operation:
+        query = query.where(FlightRollup.operation == operation)
+    return query.group_by(*columns).order_by(*columns)
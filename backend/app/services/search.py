@@ -0,0 +1,90 @@
+"""Typeahead search across airports, aircraft and pilots.
+
+Served entirely from the search indexes the reference cache keeps for each
+table, so a query never touches the database. Every word of the query must
+prefix-match some word of the row; whole-word matches rank above prefixes, and
+an exact ICAO code, tail number or certificate number ranks first.
+"""
+import heapq
+from typing import Iterable, List, Optional, Sequence, Set
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam
+
+from app.services.reference_data import ReferenceTable, reference_cache
+
+SEARCH_TYPES = ("airport", "aircraft", "pilot")
+KEY_MATCH_BONUS = 10.0
+
+
+def _airport_result(airport) -> dict:
+    return {"label": f"{airport.icao_code} - {airport.name}", "detail": f"{airport.city}, {airport.state}"}
+
+
+def _aircraft_result(aircraft) -> dict:
+    return {"label": aircraft.tail_number, "detail": f"{aircraft.manufacturer} {aircraft.model} ({aircraft.owner_name})"}
+
+
+def _pilot_result(pilot) -> dict:
+    return {"label": f"{pilot.first_name} {pilot.last_name}", "detail": pilot.certificate_number}
+
+
+# Search type -> (reference table, result builder)
+_SOURCES = {
+    "airport": (reference_cache.airports, _airport_result),
+    "aircraft": (reference_cache.aircraft, _aircraft_result),
+    "pilot": (reference_cache.pilots, _pilot_result),
+}
+
+
+def parse_types(types: Optional[str]) -> Sequence[str]:
+    """Validate a comma-separated `types=` parameter (omitted means all)."""
+    if types is None:
+        return SEARCH_TYPES
+    requested = {part.strip() for part in types.split(",") if part.strip()}
+    unknown = requested.difference(SEARCH_TYPES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(sorted(unknown))}")
+    return tuple(name for name in SEARCH_TYPES if name in requested)
+
+
+def matching_ids(table: ReferenceTable, query: str) -> Set[int]:
+    """Ids of the rows of `table` matching `query`."""
+    return table.search.match(query)
+
+
+def id_in(column, ids: Iterable[int]):
+    """`column IN (ids)` with the ids rendered inline.
+
+    A short query can match thousands of rows; inlining keeps that within the
+    driver's bind parameter limit (32767 on asyncpg).
+    """
+    return column.in_(bindparam(None, sorted(ids), expanding=True, literal_execute=True))
+
+
+def _scored(table: ReferenceTable, query: str) -> dict:
+    scores = table.search.search(query)
+    term = query.strip()
+    for key in {term, term.upper()}:
+        exact = table.get_by_key(key)
+        if exact is not None:
+            scores[exact.id] = scores.get(exact.id, 0.0) + KEY_MATCH_BONUS
+    return scores
+
+
+def search(query: str, types: Sequence[str] = SEARCH_TYPES, limit: int = 10) -> List[dict]:
+    """The best `limit` matches across `types`, highest score first."""
+    candidates = []
+    for name in types:
+        table, _ = _SOURCES[name]
+        best = heapq.nlargest(limit, _scored(table, query).items(), key=lambda item: (item[1], -item[0]))
+        candidates.extend((score, name, obj_id) for obj_id, score in best)
+    candidates.sort(key=lambda candidate: (-candidate[0], SEARCH_TYPES.index(candidate[1]), candidate[2]))
+
+    results = []
+    for score, name, obj_id in candidates[:limit]:
+        table, build = _SOURCES[name]
+        snapshot = table.get(obj_id)
+        if snapshot is not None:
+            results.append({"type": name, "id": obj_id, "score": score, **build(snapshot)})
+    return results
@@ -0,0 +1,532 @@
+"""Reproducible synthetic datasets for load testing.
+
+`generate_synthetic` fills an empty database (or replaces its data) with
+airports, aircraft, pilots and any number of flights, all drawn from numpy
+generators seeded by `SyntheticSpec.seed`: the same spec always produces the
+same rows, whatever the number of worker processes.
+
+Flights follow the patterns real traffic has. Days are weighted by season,
+weekday and a gentle growth trend, and hours by a daytime curve. A few airports
+take most of the traffic, and each pilot mostly flies a handful of aircraft
+from a home airport.
+
+Every day's flight count is fixed up front, so the flights split into chunks of
+FLIGHT_CHUNK_ROWS consecutive flights in time order. A process pool generates
+the chunks, each from its own seeded generator, while this process writes them
+in order. Writes use a Core executemany, or COPY on PostgreSQL, and each chunk
+is committed separately. The rollups and pilot stats are rebuilt afterwards.
+
+`seed_jobs` runs a generation as a background job in a separate process
+(POST /seed/synthetic) and reports its progress. When it finishes, the worker
+that ran it reloads its caches. Other workers reload their airports, aircraft
+and pilots on their next request, as the seed bumps every table version, but
+their analytics column store only catches up at its next
+ANALYTICS_REFRESH_SECONDS reload and their dashboard within
+DASHBOARD_CACHE_TTL_SECONDS.
+"""
+import asyncio
+import multiprocessing
+import queue
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import Table, delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.models.models import (
+    Aircraft, Airport, Flight, FlightRollup, FlightType, Pilot, PilotStatBreakdown, PilotStats,
+)
+from app.services.archive import flight_archive
+from app.services.analytics import flight_columns
+from app.services.cache import dashboard_cache
+from app.services.partitions import ensure_partitions
+from app.services.pilot_stats import rebuild_pilot_stats
+from app.services.reference_data import reference_cache
+from app.services.rollups import rebuild_rollups
+from app.services.versions import TABLES, bump_versions, table_versions
+
+FLIGHT_CHUNK_ROWS = 50_000
+# Chunks generated ahead of the writer, per worker process
+_CHUNKS_AHEAD = 2
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Relative traffic by hour of day (local time), month and weekday (Monday first)
+HOURLY_WEIGHTS = np.array([
+    0.2, 0.1, 0.05, 0.05, 0.1, 0.4, 1.2, 2.6, 4.2, 5.6, 6.4, 6.6,
+    6.0, 6.2, 6.6, 6.8, 6.4, 5.6, 4.4, 3.0, 1.8, 1.0, 0.6, 0.3,
+])
+MONTHLY_WEIGHTS = np.array([0.70, 0.75, 0.90, 1.00, 1.15, 1.25, 1.30, 1.28, 1.15, 1.00, 0.85, 0.72])
+WEEKDAY_WEIGHTS = np.array([0.90, 0.85, 0.85, 0.90, 1.05, 1.30, 1.20])
+# Traffic on the first day of the span relative to the last
+GROWTH_START = 0.6
+
+FLIGHT_TYPE_WEIGHTS = {
+    FlightType.LOCAL: 0.30,
+    FlightType.CROSS_COUNTRY: 0.22,
+    FlightType.TRAINING: 0.22,
+    FlightType.PLEASURE: 0.12,
+    FlightType.BUSINESS: 0.05,
+    FlightType.CHARTER: 0.03,
+    FlightType.CARGO: 0.02,
+    FlightType.MAINTENANCE: 0.02,
+    FlightType.OTHER: 0.02,
+}
+OPERATION_WEIGHTS = {"takeoff": 0.42, "landing": 0.42, "touch_and_go": 0.16}
+# Share of a pilot's flights at their home airport
+HOME_AIRPORT_SHARE = 0.7
+# Aircraft each pilot flies
+AIRCRAFT_PER_PILOT = 3
+
+_STATES = [
+    "AL", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "ID", "IL", "IN", "IA", "KS", "KY", "LA",
+    "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+]
+_TOWN_PREFIXES = ["Oak", "Cedar", "Maple", "River", "Stone", "Pine", "Fair", "Green", "Spring", "Clear", "Elk", "Mill"]
+_TOWN_SUFFIXES = ["ville", "field", "ton", " Falls", " Springs", "wood", " Valley", "port", "burg", " Creek"]
+_AIRPORT_KINDS = ["Municipal Airport", "Regional Airport", "Airpark", "Field", "County Airport"]
+_FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Susan", "Richard", "Jessica", "Joseph", "Sarah", "Thomas", "Karen", "Daniel", "Nancy",
+]
+_LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White",
+]
+# (manufacturer, model, category, engine type, engines, max passengers, share of the fleet)
+_AIRCRAFT_MODELS = [
+    ("Cessna", "172 Skyhawk", "single_engine", "piston", 1, 3, 0.30),
+    ("Cessna", "182 Skylane", "single_engine", "piston", 1, 3, 0.12),
+    ("Piper", "PA-28 Cherokee", "single_engine", "piston", 1, 3, 0.18),
+    ("Cirrus", "SR22", "single_engine", "piston", 1, 4, 0.10),
+    ("Beechcraft", "Baron 58", "multi_engine", "piston", 2, 5, 0.08),
+    ("Piper", "PA-34 Seneca", "multi_engine", "piston", 2, 5, 0.06),
+    ("Cessna", "Citation CJ3", "jet", "turbofan", 2, 9, 0.05),
+    ("Robinson", "R44", "helicopter", "piston", 1, 3, 0.07),
+    ("Schleicher", "ASK 21", "glider", None, 0, 1, 0.04),
+]
+_CERTIFICATE_WEIGHTS = {"student": 0.15, "sport": 0.05, "recreational": 0.02, "private": 0.50,
+                        "commercial": 0.20, "atp": 0.08}
+_MEDICAL_CLASSES = {"student": "Class 3", "sport": None, "recreational": "Class 3", "private": "Class 3",
+                    "commercial": "Class 2", "atp": "Class 1"}
+
+
+@dataclass
+class SyntheticSpec:
+    """What to generate. The same spec always generates the same data."""
+    flights: int = 100_000
+    airports: int = 250
+    aircraft: int = 3_000
+    pilots: int = 10_000
+    years: int = 15
+    seed: int = 42
+    # Flights run up to this day; defaults to today, so pin it for data reproducible across days
+    end_date: Optional[datetime] = None
+    workers: int = field(default_factory=lambda: get_settings().SEED_WORKERS)
+    force: bool = False
+
+
+@dataclass
+class FlightPlan:
+    """Everything a worker needs to generate any flight chunk, sent once per worker."""
+    seed: int
+    flights: int
+    chunk_rows: int
+    day_starts: np.ndarray  # epoch seconds of each day in the span
+    day_ends: np.ndarray  # cumulative flight count through each day
+    airport_weights: np.ndarray
+    airport_codes: List[str]
+    pilot_weights: np.ndarray
+    pilot_home_airport: np.ndarray
+    pilot_aircraft: np.ndarray  # pilots x AIRCRAFT_PER_PILOT aircraft indexes
+    aircraft_max_passengers: np.ndarray
+
+
+def _normalized(weights) -> np.ndarray:
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+
+def _base36(number: int, width: int) -> str:
+    digits = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    out = ""
+    for _ in range(width):
+        number, digit = divmod(number, 36)
+        out = digits[digit] + out
+    return out
+
+
+def _pick(rng: np.random.Generator, options: list, size: int, weights=None) -> list:
+    return [options[i] for i in rng.choice(len(options), size, p=None if weights is None else _normalized(weights))]
+
+
+def _reference_rows(spec: SyntheticSpec, start: datetime) -> Dict[str, Dict[str, list]]:
+    """Airport, aircraft and pilot columns, with ids 1..n."""
+    rng = np.random.default_rng([spec.seed, 0])
+    airports, aircraft, pilots = spec.airports, spec.aircraft, spec.pilots
+
+    towns = [
+        f"{prefix}{suffix}" for prefix, suffix in zip(
+            _pick(rng, _TOWN_PREFIXES, airports), _pick(rng, _TOWN_SUFFIXES, airports)
+        )
+    ]
+    icao = [f"S{_base36(i, 3)}" for i in range(airports)]
+    airport_rows = {
+        "id": list(range(1, airports + 1)),
+        "icao_code": icao,
+        "faa_code": [code[1:] for code in icao],
+        "name": [f"{town} {kind}" for town, kind in zip(towns, _pick(rng, _AIRPORT_KINDS, airports))],
+        "city": towns,
+        "state": _pick(rng, _STATES, airports),
+        "latitude": np.round(rng.uniform(25.0, 49.0, airports), 4).tolist(),
+        "longitude": np.round(rng.uniform(-124.0, -67.0, airports), 4).tolist(),
+        "elevation_ft": rng.integers(0, 6000, airports).tolist(),
+        "airport_type": _pick(rng, ["public", "private", "military"], airports, [0.7, 0.25, 0.05]),
+        "fuel_types": _pick(rng, ["100LL", "100LL, Jet-A", None], airports, [0.5, 0.35, 0.15]),
+        "has_tower": (rng.random(airports) < 0.2).tolist(),
+        "ctaf_frequency": [f"12{digit}.{decimal}" for digit, decimal in zip(
+            rng.integers(0, 4, airports).tolist(), _pick(rng, ["0", "05", "7", "725", "8", "9"], airports)
+        )],
+        "created_at": [start] * airports,
+        "updated_at": [start] * airports,
+    }
+    airport_rows["ownership"] = airport_rows["airport_type"]
+
+    models = [_AIRCRAFT_MODELS[i] for i in rng.choice(
+        len(_AIRCRAFT_MODELS), aircraft, p=_normalized([model[-1] for model in _AIRCRAFT_MODELS])
+    )]
+    owners = _pick(rng, _LAST_NAMES, aircraft)
+    aircraft_rows = {
+        "id": list(range(1, aircraft + 1)),
+        "tail_number": [f"N{1000 + i}S" for i in range(aircraft)],
+        "manufacturer": [model[0] for model in models],
+        "model": [model[1] for model in models],
+        "year_built": rng.integers(1960, start.year + spec.years + 1, aircraft).tolist(),
+        "category": [model[2].upper() for model in models],
+        "engine_type": [model[3] for model in models],
+        "num_engines": [model[4] for model in models],
+        "max_passengers": [model[5] for model in models],
+        "owner_name": [f"{owner} Aviation LLC" for owner in owners],
+        "owner_state": _pick(rng, _STATES, aircraft),
+        "is_active": (rng.random(aircraft) < 0.95).tolist(),
+        "created_at": [start] * aircraft,
+        "updated_at": [start] * aircraft,
+    }
+
+    first_names = _pick(rng, _FIRST_NAMES, pilots)
+    last_names = _pick(rng, _LAST_NAMES, pilots)
+    certificates = _pick(rng, list(_CERTIFICATE_WEIGHTS), pilots, list(_CERTIFICATE_WEIGHTS.values()))
+    end = start + timedelta(days=365 * spec.years)
+    pilot_rows = {
+        "id": list(range(1, pilots + 1)),
+        "certificate_number": [f"S{i:08d}" for i in range(pilots)],
+        "first_name": first_names,
+        "last_name": last_names,
+        "certificate_type": [certificate.upper() for certificate in certificates],
+        "medical_class": [_MEDICAL_CLASSES[certificate] for certificate in certificates],
+        "medical_expiry": [end + timedelta(days=days) for days in rng.integers(-365, 900, pilots).tolist()],
+        "total_flight_hours": np.round(rng.lognormal(5.5, 1.0, pilots), 1).tolist(),
+        "email": [f"{first.lower()}.{last.lower()}{i}@example.com"
+                  for i, (first, last) in enumerate(zip(first_names, last_names))],
+        "state": _pick(rng, _STATES, pilots),
+        "is_active": (rng.random(pilots) < 0.95).tolist(),
+        "created_at": [start] * pilots,
+        "updated_at": [start] * pilots,
+    }
+    return {"airports": airport_rows, "aircraft": aircraft_rows, "pilots": pilot_rows}
+
+
+def _flight_plan(spec: SyntheticSpec, start: datetime, reference: Dict[str, Dict[str, list]]) -> FlightPlan:
+    """Per-day flight counts and the airport/pilot/aircraft draws behind every flight."""
+    rng = np.random.default_rng([spec.seed, 1])
+    days = np.arange(np.datetime64(start.date()), np.datetime64((start + timedelta(days=365 * spec.years)).date()))
+    months = days.astype("datetime64[M]").astype(np.int64) % 12
+    weekdays = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    growth = np.linspace(GROWTH_START, 1.0, len(days))
+    expected = spec.flights * _normalized(MONTHLY_WEIGHTS[months] * WEEKDAY_WEIGHTS[weekdays] * growth)
+    # Largest remainders, so the counts add up to exactly spec.flights
+    counts = np.floor(expected).astype(np.int64)
+    shortfall = spec.flights - int(counts.sum())
+    counts[np.argsort(counts - expected, kind="stable")[:shortfall]] += 1
+
+    # A few busy fields and a long tail of quiet ones, in no particular id order
+    airport_weights = _normalized(1.0 / np.arange(1, spec.airports + 1) ** 0.9)[rng.permutation(spec.airports)]
+    return FlightPlan(
+        seed=spec.seed,
+        flights=spec.flights,
+        chunk_rows=FLIGHT_CHUNK_ROWS,
+        day_starts=days.astype("datetime64[s]").astype(np.int64),
+        day_ends=np.cumsum(counts),
+        airport_weights=airport_weights,
+        airport_codes=reference["airports"]["icao_code"],
+        pilot_weights=_normalized(rng.lognormal(0.0, 1.0, spec.pilots)),
+        pilot_home_airport=rng.choice(spec.airports, spec.pilots, p=airport_weights),
+        pilot_aircraft=rng.integers(0, spec.aircraft, (spec.pilots, AIRCRAFT_PER_PILOT)),
+        aircraft_max_passengers=np.array(reference["aircraft"]["max_passengers"], dtype=np.int64),
+    )
+
+
+_plan: Optional[FlightPlan] = None
+
+
+def _init_worker(plan: FlightPlan) -> None:
+    global _plan
+    _plan = plan
+
+
+_FLIGHT_TYPE_NAMES = [flight_type.name for flight_type in FLIGHT_TYPE_WEIGHTS]
+_OPERATIONS = list(OPERATION_WEIGHTS)
+_RUNWAYS = [f"{number:02d}" for number in range(1, 37)]
+FLIGHT_COLUMNS = (
+    "airport_id", "aircraft_id", "pic_id", "flight_type", "operation", "runway", "actual_time",
+    "origin_airport", "destination_airport", "passengers", "fuel_gallons", "created_at", "updated_at",
+)
+
+
+def generate_flight_chunk(index: int, plan: Optional[FlightPlan] = None) -> Dict[str, list]:
+    """Columns of the `index`-th chunk of flights, in time order (a process pool entry point)."""
+    plan = plan or _plan
+    rng = np.random.default_rng([plan.seed, 2, index])
+    first = index * plan.chunk_rows
+    positions = np.arange(first, min(first + plan.chunk_rows, plan.flights))
+    size = len(positions)
+
+    days = np.searchsorted(plan.day_ends, positions, side="right")
+    seconds = rng.choice(24, size, p=_normalized(HOURLY_WEIGHTS)) * 3600 + rng.integers(0, 3600, size)
+    times = np.sort(plan.day_starts[days] + seconds)
+
+    pilots = rng.choice(len(plan.pilot_weights), size, p=plan.pilot_weights)
+    airports = np.where(
+        rng.random(size) < HOME_AIRPORT_SHARE,
+        plan.pilot_home_airport[pilots],
+        rng.choice(len(plan.airport_weights), size, p=plan.airport_weights),
+    )
+    aircraft = plan.pilot_aircraft[pilots, rng.integers(0, AIRCRAFT_PER_PILOT, size)]
+    flight_types = rng.choice(len(FLIGHT_TYPE_WEIGHTS), size, p=_normalized(list(FLIGHT_TYPE_WEIGHTS.values())))
+    cross_country = flight_types == _FLIGHT_TYPE_NAMES.index(FlightType.CROSS_COUNTRY.name)
+    destinations = rng.choice(len(plan.airport_weights), size, p=plan.airport_weights)
+    destinations = np.where(destinations == airports, (destinations + 1) % len(plan.airport_weights), destinations)
+    destinations = np.where(cross_country, destinations, airports)
+    passengers = np.minimum(rng.integers(0, 4, size), plan.aircraft_max_passengers[aircraft])
+
+    timestamps = times.astype("datetime64[s]").tolist()
+    codes = plan.airport_codes
+    return {
+        "airport_id": (airports + 1).tolist(),
+        "aircraft_id": (aircraft + 1).tolist(),
+        "pic_id": (pilots + 1).tolist(),
+        "flight_type": [_FLIGHT_TYPE_NAMES[i] for i in flight_types.tolist()],
+        "operation": [_OPERATIONS[i] for i in rng.choice(
+            len(_OPERATIONS), size, p=_normalized(list(OPERATION_WEIGHTS.values()))
+        ).tolist()],
+        "runway": [_RUNWAYS[i] for i in rng.integers(0, len(_RUNWAYS), size).tolist()],
+        "actual_time": timestamps,
+        "origin_airport": [codes[i] for i in airports.tolist()],
+        "destination_airport": [codes[i] for i in destinations.tolist()],
+        "passengers": passengers.tolist(),
+        "fuel_gallons": np.round(rng.uniform(10, 80, size), 1).tolist(),
+        "created_at": timestamps,
+        "updated_at": timestamps,
+    }
+
+
+async def _insert(db: AsyncSession, table: Table, columns: Dict[str, list]) -> None:
+    """Write rows given as columns: COPY on PostgreSQL, a Core executemany elsewhere."""
+    rows = zip(*columns.values())
+    if db.bind.dialect.name == "postgresql":
+        connection = await (await db.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(
+            table.name, records=list(rows), columns=list(columns)
+        )
+    else:
+        await db.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+
+async def _reset_sequences(db: AsyncSession, *tables: Table) -> None:
+    """Move PostgreSQL id sequences past rows inserted with explicit ids."""
+    if db.bind.dialect.name != "postgresql":
+        return
+    for table in tables:
+        await db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+        ))
+
+
+def _no_progress(**_) -> None:
+    pass
+
+
+async def generate_synthetic(spec: SyntheticSpec, progress: Callable[..., None] = _no_progress) -> dict:
+    """Generate `spec` into the database. Returns the row counts written.
+
+    Raises ValueError when the database or the flight archive already has
+    data, unless `spec.force` is set, in which case the existing data and
+    archive are deleted first. `progress` is
+    called with keyword arguments `phase` and `flights_written`.
+    """
+    end = datetime.combine((spec.end_date or datetime.utcnow()).date(), datetime.min.time())
+    start = end - timedelta(days=365 * spec.years)
+
+    async with async_session() as db:
+        if await db.scalar(select(func.count(Pilot.id))) or flight_archive.months():
+            if not spec.force:
+                raise ValueError("Database already has data; set force to replace it")
+            progress(phase="clearing", flights_written=0)
+            for model in (FlightRollup, PilotStatBreakdown, PilotStats, Flight, Pilot, Aircraft, Airport):
+                await db.execute(delete(model))
+            await db.commit()
+            # Archived months would otherwise come back with ids reused by the new flights
+            flight_archive.clear()
+
+        progress(phase="reference", flights_written=0)
+        reference = _reference_rows(spec, start)
+        await _insert(db, Airport.__table__, reference["airports"])
+        await _insert(db, Aircraft.__table__, reference["aircraft"])
+        await _insert(db, Pilot.__table__, reference["pilots"])
+        await _reset_sequences(db, Airport.__table__, Aircraft.__table__, Pilot.__table__)
+        await ensure_partitions(await db.connection(), now=start, months_ahead=12 * spec.years + 1)
+        await db.commit()
+
+        plan = _flight_plan(spec, start, reference)
+        chunks = -(-spec.flights // plan.chunk_rows)
+        written = 0
+        progress(phase="flights", flights_written=0)
+        loop = asyncio.get_running_loop()
+        # spawn, not fork: workers must not inherit the event loop or database connections
+        with ProcessPoolExecutor(
+            max_workers=spec.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(plan,),
+        ) as pool:
+            pending = []
+            next_chunk = 0
+            while written < spec.flights:
+                while next_chunk < chunks and len(pending) < spec.workers * _CHUNKS_AHEAD:
+                    pending.append(loop.run_in_executor(pool, generate_flight_chunk, next_chunk))
+                    next_chunk += 1
+                columns = await pending.pop(0)
+                await _insert(db, Flight.__table__, columns)
+                await db.commit()
+                written += len(columns["pic_id"])
+                progress(phase="flights", flights_written=written)
+
+        progress(phase="rollups", flights_written=written)
+        await rebuild_rollups(db)
+        progress(phase="pilot_stats", flights_written=written)
+        await rebuild_pilot_stats(db)
+        await bump_versions(db, *TABLES)
+        await db.commit()
+
+    return {"airports": spec.airports, "aircraft": spec.aircraft, "pilots": spec.pilots, "flights": written}
+
+
+def run_seed_job(spec: dict, updates) -> None:
+    """Seed job process entry point: generate `spec`, putting progress and the outcome on `updates`."""
+    try:
+        result = asyncio.run(generate_synthetic(SyntheticSpec(**spec), progress=lambda **state: updates.put(state)))
+        updates.put({"result": result})
+    except Exception as exc:  # surfaced to the client through the job status
+        updates.put({"error": str(exc) or exc.__class__.__name__})
+
+
+@dataclass
+class SeedJob:
+    """A synthetic data generation tracked by the SeedJobManager."""
+    id: str
+    spec: SyntheticSpec
+    status: str = QUEUED
+    phase: Optional[str] = None
+    flights_written: int = 0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class SeedJobManager:
+    """Runs one seed job at a time in its own process and tracks its progress.
+
+    The job process has its own database engine and worker pool, so the
+    server's event loop only relays progress updates; once the job is done,
+    the in-memory caches are reloaded from the new data.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, SeedJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def running(self) -> Optional[SeedJob]:
+        return next((job for job in self._jobs.values() if job.status in (QUEUED, RUNNING)), None)
+
+    def submit(self, spec: SyntheticSpec) -> SeedJob:
+        """Start a job; the caller checks that none is running."""
+        job = SeedJob(id=uuid.uuid4().hex, spec=spec)
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[SeedJob]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: SeedJob) -> None:
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        updates = context.Queue()
+        self._process = context.Process(target=run_seed_job, args=(asdict(job.spec), updates), daemon=False)
+        job.status = RUNNING
+        outcome = None
+        try:
+            self._process.start()
+            while outcome is None:
+                try:
+                    update = await loop.run_in_executor(None, updates.get, True, 1.0)
+                except queue.Empty:
+                    if not self._process.is_alive():
+                        outcome = {"error": f"Seed process exited with code {self._process.exitcode}"}
+                    continue
+                if "result" in update or "error" in update:
+                    outcome = update
+                else:
+                    job.phase = update["phase"]
+                    job.flights_written = update["flights_written"]
+            await loop.run_in_executor(None, self._process.join)
+            if "error" in outcome:
+                job.status = FAILED
+                job.error = outcome["error"]
+            else:
+                table_versions.expire()
+                dashboard_cache.invalidate()
+                await reference_cache.load()
+                await flight_columns.load()
+                job.phase = DONE
+                job.status = DONE
+        except Exception as exc:  # surfaced to the client through the job status
+            job.status = FAILED
+            job.error = str(exc) or exc.__class__.__name__
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._process = None
+
+    async def shutdown(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+        for task in list(self._tasks):
+            task.cancel()
+
+
+seed_jobs = SeedJobManager()
@@ -0,0 +1,91 @@
+"""Token-prefix inverted index for typeahead search.
+
+Text is split into lowercase alphanumeric tokens. Each token maps to the set
+of document ids containing it, and the vocabulary is kept sorted so that every
+token starting with a query term is found with two binary searches. A query
+matches documents that contain, for every query term, some token starting
+with that term. Whole-token matches rank above prefix matches.
+"""
+import bisect
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+EXACT_WEIGHT = 2.0
+PREFIX_WEIGHT = 1.0
+
+
+def tokenize(*texts: Optional[str]) -> List[str]:
+    return [token for text in texts if text for token in _TOKEN.findall(text.lower())]
+
+
+class PrefixIndex:
+    """Inverted index from tokens to document ids, searchable by token prefix."""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._doc_tokens: Dict[int, FrozenSet[str]] = {}
+        self._vocabulary: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def build(self, documents: Iterable[Tuple[int, Iterable[Optional[str]]]]) -> None:
+        """Replace the whole index with `documents` of (doc_id, texts)."""
+        self._postings = {}
+        self._doc_tokens = {}
+        for doc_id, texts in documents:
+            tokens = frozenset(tokenize(*texts))
+            self._doc_tokens[doc_id] = tokens
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(doc_id)
+        self._vocabulary = sorted(self._postings)
+
+    def add(self, doc_id: int, *texts: Optional[str]) -> None:
+        """Index (or re-index) one document."""
+        self.remove(doc_id)
+        tokens = frozenset(tokenize(*texts))
+        self._doc_tokens[doc_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {doc_id}
+                bisect.insort(self._vocabulary, token)
+            else:
+                postings.add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        for token in self._doc_tokens.pop(doc_id, ()):
+            postings = self._postings[token]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def _tokens_with_prefix(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "￿", start)
+        return self._vocabulary[start:end]
+
+    def search(self, query: str) -> Dict[int, float]:
+        """Score every document matching all terms of `query` (empty query: no matches)."""
+        scores: Optional[Dict[int, float]] = None
+        for term in tokenize(query):
+            term_scores: Dict[int, float] = {}
+            for token in self._tokens_with_prefix(term):
+                weight = EXACT_WEIGHT if token == term else PREFIX_WEIGHT
+                for doc_id in self._postings[token]:
+                    if term_scores.get(doc_id, 0.0) < weight:
+                        term_scores[doc_id] = weight
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: score + term_scores[doc_id] for doc_id, score in scores.items() if doc_id in term_scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+    def match(self, query: str) -> Set[int]:
+        """Ids of the documents matching `query`."""
+        return set(self.search(query))
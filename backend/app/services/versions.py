@@ -0,0 +1,196 @@
+"""Per-table change versions and the ETags derived from them.
+
+Every write route bumps the `table_versions` row of each table it changes,
+in the same transaction as the change, so the counters are shared by every
+worker and only move when the data does. A GET route whose response depends
+only on some tables and its URL declares them with `conditional(...)`:
+
+- the ETag is a hash of the URL, the Accept header and those tables' versions
+- a request whose If-None-Match matches gets a 304 from the dependency,
+  before the route runs any query
+- any other request gets the ETag and Cache-Control headers on its 200
+  response, added by ETagMiddleware; a compressed response gets the tag
+  with its encoding appended (see compression.encoded_etag)
+
+Each process keeps the versions in memory and re-reads them at most every
+ETAG_VERSION_TTL_SECONDS, so a conditional GET normally costs no query. A
+process drops its copy as soon as one of its own writes commits; another
+worker's write reaches it within the TTL.
+
+Airport, aircraft and pilot responses come from the per-process
+reference_cache, so before tagging, `conditional` reloads any of its tables
+older than the versions the tag is built from: a tag never names data the
+body does not show. Routes that answer from the cache without an ETag
+(search, map clusters, exports filtered by pilot name) declare
+`reference_synced(...)` for the same reload.
+
+Routes filtering on a window relative to now (years_back) also mix the
+current hour into the tag, since their results move with the clock.
+"""
+import asyncio
+import hashlib
+import time
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.compression import decoded_etag, encoded_etag
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.models.models import TableVersion
+from app.services.reference_data import reference_cache
+
+settings = get_settings()
+
+AIRPORTS = "airports"
+AIRCRAFT = "aircraft"
+PILOTS = "pilots"
+FLIGHTS = "flights"
+TABLES = (AIRPORTS, AIRCRAFT, PILOTS, FLIGHTS)
+# Flight responses embed the airport, aircraft and pilot
+FLIGHT_RESPONSE_TABLES = (FLIGHTS, AIRPORTS, AIRCRAFT, PILOTS)
+
+
+class TableVersions:
+    """This process's copy of table_versions, re-read when older than the TTL."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._versions: Dict[str, int] = {}
+        self._loaded_at = float("-inf")
+        self._expired_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self.reads = 0
+
+    def _fresh(self) -> bool:
+        return self._loaded_at > self._expired_at and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def expire(self) -> None:
+        """Forget the cached versions; a read already in flight does not count as fresh."""
+        self._expired_at = time.monotonic()
+
+    async def get(self, tables: Sequence[str]) -> Tuple[int, ...]:
+        if not self._fresh():
+            async with self._lock:
+                if not self._fresh():
+                    started = time.monotonic()
+                    async with async_session() as db:
+                        result = await db.execute(select(TableVersion.name, TableVersion.version))
+                        self._versions = dict(result.all())
+                    self._loaded_at = started
+                    self.reads += 1
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+
+table_versions = TableVersions(settings.ETAG_VERSION_TTL_SECONDS)
+
+
+@event.listens_for(Session, "after_commit")
+def _expire_after_commit(session) -> None:
+    if session.info.pop("bumped_table_versions", False):
+        table_versions.expire()
+
+
+async def bump_versions(db: AsyncSession, *tables: str) -> Dict[str, int]:
+    """Increment the versions of `tables` as part of the current transaction; returns the new versions."""
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(TableVersion).values([{"name": table, "version": 1} for table in sorted(set(tables))])
+    stmt = stmt.on_conflict_do_update(index_elements=["name"], set_={"version": TableVersion.version + 1})
+    result = await db.execute(stmt.returning(TableVersion.name, TableVersion.version))
+    db.info["bumped_table_versions"] = True
+    return dict(result.all())
+
+
+def _cache_control() -> str:
+    if settings.ETAG_MAX_AGE_SECONDS > 0:
+        return f"max-age={settings.ETAG_MAX_AGE_SECONDS}, must-revalidate"
+    return "no-cache"
+
+
+def _matching(if_none_match: Optional[str], tag: str) -> Optional[str]:
+    """The client's validator for `tag`, in whichever content coding it was sent, if any."""
+    if not if_none_match:
+        return None
+    for candidate in if_none_match.split(","):
+        # If-None-Match uses the weak comparison: W/"x" matches "x"
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == "*":
+            return tag
+        if decoded_etag(candidate) == tag:
+            return candidate
+    return None
+
+
+async def _synced_versions(tables: Sequence[str]) -> Tuple[int, ...]:
+    versions = await table_versions.get(tables)
+    await reference_cache.sync(dict(zip(tables, versions)))
+    return versions
+
+
+def reference_synced(*tables: str):
+    """Route dependency: reload the reference tables among `tables` that other processes changed."""
+
+    async def sync() -> None:
+        await _synced_versions(tables)
+
+    return Depends(sync)
+
+
+def conditional(*tables: str, clock_relative: bool = False):
+    """Route dependency: ETag the response from `tables`' versions, 304 when the client's copy matches."""
+
+    async def check(request: Request) -> None:
+        versions = await _synced_versions(tables)
+        parts = [
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+            request.headers.get("accept", ""),  # list routes stream NDJSON/CSV on request
+            repr(versions),
+        ]
+        if clock_relative:
+            parts.append(datetime.utcnow().strftime("%Y%m%d%H"))
+        tag = '"' + hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest() + '"'
+        request.state.etag = tag
+        matched = _matching(request.headers.get("if-none-match"), tag)
+        if matched:
+            raise HTTPException(status_code=304, headers={"ETag": matched, "Cache-Control": _cache_control()})
+
+    return Depends(check)
+
+
+class ETagMiddleware:
+    """Add the ETag chosen by `conditional` and Cache-Control to successful responses.
+
+    Pure ASGI so streamed responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                tag = scope.get("state", {}).get("etag")
+                if tag:
+                    encoding = next((value for key, value in message.get("headers", [])
+                                     if key.lower() == b"content-encoding"), None)
+                    if encoding:  # already compressed by the route (precompressed_response)
+                        tag = encoded_etag(tag, encoding.decode("latin-1"))
+                    message = {**message, "headers": [
+                        *message.get("headers", []),
+                        (b"etag", tag.encode()),
+                        (b"cache-control", _cache_control().encode()),
+                    ]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,42 @@
+"""
+Move old flights out of the database into monthly Parquet files.
+
+Every calendar month that ended more than --older-than-years ago is written to
+ARCHIVE_DIR/flights-YYYY-MM.parquet and then deleted from the flights table
+in chunks (on PostgreSQL the emptied monthly partition is dropped). Flight
+queries whose date range reaches back that far keep returning the archived
+flights. Requires pyarrow.
+
+    python archive_flights.py [--older-than-years 10] [--dry-run]
+"""
+import argparse
+import asyncio
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, '.')
+
+from app.core.config import get_settings
+from app.core.database import async_session, create_tables
+from app.services.archive import ARCHIVE_BATCH_ROWS, archive_flights
+
+
+async def main(older_than_years: int, dry_run: bool, batch_rows: int):
+    await create_tables()
+    async with async_session() as db:
+        months = await archive_flights(db, older_than_years, dry_run=dry_run, batch_rows=batch_rows)
+    for month, count in months:
+        print(f"{month:%Y-%m}: {count} flights")
+    verb = "Would archive" if dry_run else "Archived"
+    print(f"{verb} {sum(count for _, count in months)} flights from {len(months)} months")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--older-than-years", type=int, default=get_settings().ARCHIVE_AFTER_YEARS,
+                        help="Archive months that ended more than this many years ago")
+    parser.add_argument("--batch-rows", type=int, default=ARCHIVE_BATCH_ROWS,
+                        help="Flights written and deleted per chunk")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+    args = parser.parse_args()
+    asyncio.run(main(args.older_than_years, args.dry_run, args.batch_rows))
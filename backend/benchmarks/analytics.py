@@ -0,0 +1,85 @@
+"""
+Benchmark flight aggregations over the in-memory column store.
+
+Fills the store with --rows synthetic flights spread over 15 years (no
+database needed) and times app.services.analytics aggregations with a range
+of groupings, buckets and filters:
+
+    python benchmarks/analytics.py
+    python benchmarks/analytics.py --rows 10000000 --iterations 20
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, '.')
+
+from app.services.analytics import FLIGHT_TYPES, FlightColumns, flight_columns
+
+QUERIES = [
+    ("total", {}),
+    ("by type", {"group_by": ["flight_type"]}),
+    ("by operation", {"group_by": ["operation"]}),
+    ("airport x month", {"group_by": ["airport_id"], "bucket": "month"}),
+    ("type x week, 1 airport", {"group_by": ["flight_type"], "bucket": "week", "airport_id": 7}),
+    ("pilot x year", {"group_by": ["pilot_id"], "bucket": "year"}),
+    ("day, last 2 years", {"bucket": "day", "date_from": datetime(2024, 10, 1)}),
+    ("hour x airport x op", {"group_by": ["airport_id", "operation"], "bucket": "hour",
+                             "date_from": datetime(2026, 1, 1)}),
+]
+
+
+def synthetic_columns(rows: int, airports: int, aircraft: int, pilots: int) -> FlightColumns:
+    rng = np.random.default_rng(42)
+    columns = FlightColumns()
+    for operation in ("takeoff", "landing", "touch_and_go"):
+        columns.operation_code(operation)
+    start = int(np.datetime64("2011-10-01", "s").astype(np.int64))
+    end = int(np.datetime64("2026-10-01", "s").astype(np.int64))
+    columns.arrays = {
+        "id": np.arange(1, rows + 1, dtype=np.int32),
+        # Zipf-like airport traffic: a few busy fields, a long tail of quiet ones
+        "airport_id": np.minimum(rng.zipf(1.3, rows), airports).astype(np.int32),
+        "aircraft_id": rng.integers(1, aircraft + 1, rows, dtype=np.int32),
+        "pic_id": rng.integers(1, pilots + 1, rows, dtype=np.int32),
+        "actual_time": np.sort(rng.integers(start, end, rows, dtype=np.int64)),
+        "flight_type": rng.integers(0, len(FLIGHT_TYPES), rows, dtype=np.uint8),
+        "operation": rng.integers(0, 3, rows, dtype=np.uint8),
+        "passengers": rng.integers(0, 6, rows).astype(np.float32),
+        "fuel_gallons": rng.uniform(5, 80, rows).astype(np.float32),
+        "cargo_weight_lbs": rng.uniform(0, 300, rows).astype(np.float32),
+        "live": np.ones(rows, np.bool_),
+    }
+    columns.size = rows
+    return columns
+
+
+def main(rows: int, iterations: int):
+    start = time.perf_counter()
+    flight_columns.columns = synthetic_columns(rows, airports=5000, aircraft=50_000, pilots=50_000)
+    print(f"generated {rows} flights ({flight_columns.columns.nbytes / 2**20:.0f} MiB) "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    print(f"{'query':<26}{'groups':>8}{'median ms':>11}{'p95 ms':>9}")
+    for name, params in QUERIES:
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = flight_columns.aggregate(**params)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        print(f"{name:<26}{len(result):>8}{statistics.median(timings):>11.1f}{p95:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark in-memory flight aggregations")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Synthetic flights")
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+    main(args.rows, args.iterations)
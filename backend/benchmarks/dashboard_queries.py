@@ -0,0 +1,130 @@
+"""
+Benchmark the dashboard refresh: the original seven sequential queries versus
+the consolidated three-statement path in app.services.dashboard.
+
+Run from the backend directory against the configured DATABASE_URL:
+
+    python benchmarks/dashboard_queries.py
+    python benchmarks/dashboard_queries.py --iterations 200 --rtt-ms 2
+
+--rtt-ms adds a simulated network round trip to every statement. This shows
+what the consolidation is worth on a remote PostgreSQL even when
+benchmarking against a local SQLite file.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.util import await_only
+
+from app.core.database import async_session, engine
+from app.models.models import Aircraft, Airport, Flight, FlightRollup, Pilot
+from app.schemas.schemas import DashboardStats
+from app.services import dashboard
+from app.services.rollups import DAY, busiest_airports_query
+
+
+async def legacy_dashboard_stats() -> DashboardStats:
+    """The pre-consolidation route: one statement per counter, selectinload for relationships."""
+    today_start, week_start = dashboard.dashboard_window()
+    async with async_session() as db:
+        async def rollup_total(start):
+            return (await db.execute(
+                select(func.coalesce(func.sum(FlightRollup.flight_count), 0)).where(
+                    FlightRollup.granularity == DAY, FlightRollup.bucket_start >= start
+                )
+            )).scalar() or 0
+
+        total_flights_today = await rollup_total(today_start)
+        total_flights_week = await rollup_total(week_start)
+        total_aircraft = (await db.execute(
+            select(func.count(Aircraft.id)).where(Aircraft.is_active == True)
+        )).scalar() or 0
+        total_pilots = (await db.execute(
+            select(func.count(Pilot.id)).where(Pilot.is_active == True)
+        )).scalar() or 0
+        total_airports = (await db.execute(select(func.count(Airport.id)))).scalar() or 0
+
+        recent = await db.execute(select(Flight).options(
+            selectinload(Flight.airport),
+            selectinload(Flight.aircraft),
+            selectinload(Flight.pilot_in_command)
+        ).order_by(Flight.actual_time.desc()).limit(dashboard.RECENT_FLIGHTS_LIMIT))
+        recent_flights = [
+            {**f.__dict__, "airport": f.airport, "aircraft": f.aircraft, "pilot": f.pilot_in_command}
+            for f in recent.scalars().all()
+        ]
+
+        busiest = await db.execute(busiest_airports_query(week_start, limit=dashboard.BUSIEST_AIRPORTS_LIMIT))
+        busiest_airports = [
+            {"id": r.id, "icao_code": r.icao_code, "name": r.name, "flight_count": r.flight_count}
+            for r in busiest.all()
+        ]
+
+    return DashboardStats(
+        total_flights_today=total_flights_today,
+        total_flights_week=total_flights_week,
+        total_aircraft=total_aircraft,
+        total_pilots=total_pilots,
+        total_airports=total_airports,
+        recent_flights=recent_flights,
+        busiest_airports=busiest_airports,
+    )
+
+
+class StatementCounter:
+    """Counts statements and optionally delays each one by a simulated round trip."""
+
+    def __init__(self, rtt_ms: float):
+        self.rtt = rtt_ms / 1000
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        if self.rtt:
+            # Runs inside SQLAlchemy's greenlet, so this yields to the event loop
+            # and concurrent statements overlap just like real network waits.
+            await_only(asyncio.sleep(self.rtt))
+
+
+async def measure(name: str, compute, iterations: int, counter: StatementCounter) -> DashboardStats:
+    stats = await compute()  # warm the pool and statement caches
+    counter.count = 0
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await compute()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{name:14} statements/refresh {counter.count / iterations:5.1f}   "
+        f"median {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms"
+    )
+    return stats
+
+
+async def main(iterations: int, rtt_ms: float):
+    counter = StatementCounter(rtt_ms)
+    print(f"{engine.dialect.name}, {iterations} iterations, simulated RTT {rtt_ms} ms")
+    legacy = await measure("sequential", legacy_dashboard_stats, iterations, counter)
+    consolidated = await measure("consolidated", dashboard.compute_dashboard_stats, iterations, counter)
+    if legacy.model_dump() != consolidated.model_dump():
+        print("WARNING: consolidated result differs from the sequential one")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dashboard stats queries")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Simulated network latency per statement")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.rtt_ms))
@@ -0,0 +1,549 @@
+"""
+Benchmark the API routes in-process against a seeded database, with baselines.
+
+Drives the app through httpx's ASGITransport (startup included, no server or
+network) against a synthetic dataset of 10k, 1M or 10M flights. A tier's
+SQLite database is generated with app.services.synthetic on first use and
+reused afterwards; --database-url points a tier at a dedicated PostgreSQL
+database instead (seeded when it has no flights):
+
+    python benchmarks/endpoints.py                       # 10k flights
+    python benchmarks/endpoints.py --tier 1m --save-baseline
+    python benchmarks/endpoints.py --tier 1m             # compare with the saved baseline
+    python benchmarks/endpoints.py --tier 10m --routes pilot --requests 50
+
+Every route gets --warmup unmeasured requests, then --requests requests with
+--concurrency in flight. It reports p50/p95/p99 latency, throughput and the
+process's peak RSS while the route ran (Linux; elsewhere the peak so far).
+With a baseline saved for the tier, the run exits with status 1 when a
+route's --metric latency grew, or its throughput fell, by more than
+--threshold, ignoring changes smaller than --min-delta-ms. Baselines are
+only comparable on the same machine and database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, '.')
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+# Dataset sizes; the last day of flights is pinned so every run sees the same rows
+TIERS = {
+    "10k": dict(flights=10_000, airports=50, aircraft=300, pilots=1_000, years=5),
+    "1m": dict(flights=1_000_000, airports=250, aircraft=3_000, pilots=10_000, years=15),
+    "10m": dict(flights=10_000_000, airports=1_000, aircraft=20_000, pilots=50_000, years=15),
+}
+END_DATE = datetime(2026, 10, 1)
+# Routes left out, by path prefix: they hold connections open, replace the dataset or spawn renderers
+EXCLUDED_PREFIXES = {
+    "/api/v1/stream": "long-lived streams",
+    "/api/v1/seed": "replaces the dataset",
+    "/api/v1/reports": "renders PDFs in worker processes",
+}
+SAMPLE_SIZE = 200
+BULK_ROWS = 50
+
+
+@dataclass
+class Sample:
+    """Existing rows the scenarios address, drawn once per run, and rows the write scenarios create."""
+    airports: list
+    aircraft: list
+    pilots: list
+    flight_ids: List[int]
+    latest: datetime
+    run: int  # keeps this run's unique codes apart from leftovers of an interrupted run
+    created: Dict[str, list] = field(default_factory=lambda: {
+        "flights": [], "bulk": [], "airports": [], "aircraft": [], "pilots": []
+    })
+
+    def pick(self, rows: list, index: int):
+        return rows[index % len(rows)]
+
+
+@dataclass
+class Scenario:
+    """One benchmarked request shape; `build` returns httpx.request kwargs for the i-th request."""
+    name: str
+    method: str
+    route: str  # the route path, to report routes no scenario covers
+    build: Callable[[Sample, int], dict]
+    max_requests: Optional[int] = None  # cap for routes too slow for --requests on the large tiers
+
+
+def _get(path: str, **params) -> dict:
+    return {"method": "GET", "url": path, "params": params}
+
+
+def _flight_body(sample: Sample, index: int) -> dict:
+    airport_id, _ = sample.pick(sample.airports, index)
+    aircraft_id, _ = sample.pick(sample.aircraft, index * 7)
+    pilot_id, _, _ = sample.pick(sample.pilots, index * 13)
+    return {
+        "airport_id": airport_id,
+        "aircraft_id": aircraft_id,
+        "pic_id": pilot_id,
+        "flight_type": ("local", "training", "cross_country")[index % 3],
+        "operation": ("takeoff", "landing", "touch_and_go")[index % 3],
+        "runway": "27",
+        "actual_time": (sample.latest - timedelta(minutes=index)).isoformat(),
+        "passengers": index % 4,
+    }
+
+
+def _created(sample: Sample, kind: str, response: httpx.Response) -> None:
+    sample.created[kind].append(response.json()["id"])
+
+
+def _pop(sample: Sample, kind: str) -> int:
+    if not sample.created[kind]:
+        raise RuntimeError(f"no {kind} left to delete; run the matching create scenario first")
+    return sample.created[kind].pop()
+
+
+def scenarios() -> List[Scenario]:
+    api = "/api/v1"
+    return [
+        Scenario("health", "GET", "/health", lambda s, i: _get("/health")),
+        # Flights
+        Scenario("flights: list", "GET", f"{api}/flights", lambda s, i: _get(f"{api}/flights")),
+        Scenario("flights: filter airport+dates", "GET", f"{api}/flights", lambda s, i: _get(
+            f"{api}/flights", airport_id=s.pick(s.airports, i)[0],
+            date_from=(s.latest - timedelta(days=30)).isoformat(), date_to=s.latest.isoformat(),
+        )),
+        Scenario("flights: filter type+operation", "GET", f"{api}/flights", lambda s, i: _get(
+            f"{api}/flights", flight_type="cross_country", operation=("takeoff", "landing")[i % 2],
+        )),
+        Scenario("flights: filter pilot name", "GET", f"{api}/flights", lambda s, i: _get(
+            f"{api}/flights", pilot_name=s.pick(s.pilots, i)[2][:4],
+        )),
+        Scenario("flights: trimmed fields", "GET", f"{api}/flights", lambda s, i: _get(
+            f"{api}/flights", limit=1000, fields="id,actual_time,operation", embed="",
+        )),
+        Scenario("flights: get", "GET", f"{api}/flights/{{flight_id}}", lambda s, i: _get(
+            f"{api}/flights/{s.pick(s.flight_ids, i)}",
+        )),
+        Scenario("flights: get empty fieldset", "GET", f"{api}/flights/{{flight_id}}", lambda s, i: _get(
+            f"{api}/flights/{s.pick(s.flight_ids, i)}", fields="", embed="",
+        ), max_requests=50),
+        Scenario("flights: pilot history", "GET", f"{api}/flights/pilot-history/{{pilot_id}}", lambda s, i: _get(
+            f"{api}/flights/pilot-history/{s.pick(s.pilots, i)[0]}", years_back=50,
+        )),
+        Scenario("flights: export pilot ndjson", "GET", f"{api}/flights/export", lambda s, i: _get(
+            f"{api}/flights/export", pilot_id=s.pick(s.pilots, i)[0],
+        ), max_requests=50),
+        Scenario("flights: create", "POST", f"{api}/flights", lambda s, i: {
+            "method": "POST", "url": f"{api}/flights", "json": _flight_body(s, i),
+            "on_response": lambda r: _created(s, "flights", r),
+        }),
+        Scenario("flights: bulk create", "POST", f"{api}/flights/bulk", lambda s, i: {
+            "method": "POST", "url": f"{api}/flights/bulk",
+            "json": {"flights": [_flight_body(s, i * BULK_ROWS + row) for row in range(BULK_ROWS)]},
+            "on_response": lambda r: s.created["bulk"].extend(r.json()["ids"]),
+        }, max_requests=20),
+        Scenario("flights: update", "PATCH", f"{api}/flights/{{flight_id}}", lambda s, i: {
+            "method": "PATCH", "url": f"{api}/flights/{s.pick(s.created['flights'], i)}",
+            "json": {"remarks": f"bench {i}", "passengers": i % 4},
+        }),
+        Scenario("flights: delete", "DELETE", f"{api}/flights/{{flight_id}}", lambda s, i: {
+            "method": "DELETE", "url": f"{api}/flights/{_pop(s, 'flights')}",
+        }),
+        # Airports
+        Scenario("airports: list", "GET", f"{api}/airports", lambda s, i: _get(f"{api}/airports")),
+        Scenario("airports: search", "GET", f"{api}/airports", lambda s, i: _get(
+            f"{api}/airports", search=s.pick(s.airports, i)[1][:3],
+        )),
+        Scenario("airports: get", "GET", f"{api}/airports/{{airport_id}}", lambda s, i: _get(
+            f"{api}/airports/{s.pick(s.airports, i)[0]}",
+        )),
+        Scenario("airports: by code", "GET", f"{api}/airports/code/{{icao_code}}", lambda s, i: _get(
+            f"{api}/airports/code/{s.pick(s.airports, i)[1]}",
+        )),
+        Scenario("airports: nearby", "GET", f"{api}/airports/nearby", lambda s, i: _get(
+            f"{api}/airports/nearby", lat=30 + i % 15, lon=-120 + i % 50, radius_nm=150,
+        )),
+        Scenario("airports: within bbox", "GET", f"{api}/airports/within", lambda s, i: _get(
+            f"{api}/airports/within", bbox="-125,24,-66,50",
+        )),
+        Scenario("airports: clusters", "GET", f"{api}/airports/clusters", lambda s, i: _get(
+            f"{api}/airports/clusters", bbox="-125,24,-66,50", zoom=3 + i % 6,
+        )),
+        Scenario("airports: create", "POST", f"{api}/airports", lambda s, i: {
+            "method": "POST", "url": f"{api}/airports", "json": {
+                "icao_code": f"X{(s.run + i) % 4096:03X}", "name": f"Bench Field {i}", "city": "Benchton",
+                "state": "CO", "latitude": 40.0, "longitude": -105.0,
+            },
+            "on_response": lambda r: _created(s, "airports", r),
+        }),
+        Scenario("airports: update", "PATCH", f"{api}/airports/{{airport_id}}", lambda s, i: {
+            "method": "PATCH", "url": f"{api}/airports/{s.pick(s.created['airports'], i)}",
+            "json": {"fuel_types": "100LL", "has_tower": bool(i % 2)},
+        }),
+        Scenario("airports: delete", "DELETE", f"{api}/airports/{{airport_id}}", lambda s, i: {
+            "method": "DELETE", "url": f"{api}/airports/{_pop(s, 'airports')}",
+        }),
+        # Aircraft
+        Scenario("aircraft: list", "GET", f"{api}/aircraft", lambda s, i: _get(f"{api}/aircraft")),
+        Scenario("aircraft: search", "GET", f"{api}/aircraft", lambda s, i: _get(
+            f"{api}/aircraft", search=("cessna", "piper", "beech", "cirrus")[i % 4],
+        )),
+        Scenario("aircraft: get", "GET", f"{api}/aircraft/{{aircraft_id}}", lambda s, i: _get(
+            f"{api}/aircraft/{s.pick(s.aircraft, i)[0]}",
+        )),
+        Scenario("aircraft: by tail", "GET", f"{api}/aircraft/tail/{{tail_number}}", lambda s, i: _get(
+            f"{api}/aircraft/tail/{s.pick(s.aircraft, i)[1]}",
+        )),
+        Scenario("aircraft: create", "POST", f"{api}/aircraft", lambda s, i: {
+            "method": "POST", "url": f"{api}/aircraft", "json": {
+                "tail_number": f"NB{s.run:03X}{i}", "manufacturer": "Cessna", "model": "172S",
+                "category": "single_engine", "owner_name": "Bench Flying Club",
+            },
+            "on_response": lambda r: _created(s, "aircraft", r),
+        }),
+        Scenario("aircraft: update", "PATCH", f"{api}/aircraft/{{aircraft_id}}", lambda s, i: {
+            "method": "PATCH", "url": f"{api}/aircraft/{s.pick(s.created['aircraft'], i)}",
+            "json": {"owner_city": "Boulder", "is_active": bool(i % 2)},
+        }),
+        Scenario("aircraft: delete", "DELETE", f"{api}/aircraft/{{aircraft_id}}", lambda s, i: {
+            "method": "DELETE", "url": f"{api}/aircraft/{_pop(s, 'aircraft')}",
+        }),
+        # Pilots
+        Scenario("pilots: list", "GET", f"{api}/pilots", lambda s, i: _get(f"{api}/pilots")),
+        Scenario("pilots: list by flight count", "GET", f"{api}/pilots", lambda s, i: _get(
+            f"{api}/pilots", sort="-flight_count",
+        )),
+        Scenario("pilots: search", "GET", f"{api}/pilots", lambda s, i: _get(
+            f"{api}/pilots", search=s.pick(s.pilots, i)[2][:3],
+        )),
+        Scenario("pilots: currency", "GET", f"{api}/pilots/currency", lambda s, i: _get(
+            f"{api}/pilots/currency", days=3660, is_current=bool(i % 2),
+        ), max_requests=50),
+        Scenario("pilots: get", "GET", f"{api}/pilots/{{pilot_id}}", lambda s, i: _get(
+            f"{api}/pilots/{s.pick(s.pilots, i)[0]}",
+        )),
+        Scenario("pilots: stats", "GET", f"{api}/pilots/{{pilot_id}}/stats", lambda s, i: _get(
+            f"{api}/pilots/{s.pick(s.pilots, i)[0]}/stats",
+        )),
+        Scenario("pilots: by certificate", "GET", f"{api}/pilots/certificate/{{certificate_number}}", lambda s, i: _get(
+            f"{api}/pilots/certificate/{s.pick(s.pilots, i)[1]}",
+        )),
+        Scenario("pilots: create", "POST", f"{api}/pilots", lambda s, i: {
+            "method": "POST", "url": f"{api}/pilots", "json": {
+                "certificate_number": f"BENCH-{s.run:03X}-{i}", "first_name": "Bench", "last_name": f"Pilot{i}",
+                "certificate_type": "private",
+            },
+            "on_response": lambda r: _created(s, "pilots", r),
+        }),
+        Scenario("pilots: update", "PATCH", f"{api}/pilots/{{pilot_id}}", lambda s, i: {
+            "method": "PATCH", "url": f"{api}/pilots/{s.pick(s.created['pilots'], i)}",
+            "json": {"total_flight_hours": float(i), "ratings": "ASEL"},
+        }),
+        Scenario("pilots: delete", "DELETE", f"{api}/pilots/{{pilot_id}}", lambda s, i: {
+            "method": "DELETE", "url": f"{api}/pilots/{_pop(s, 'pilots')}",
+        }),
+        # Aggregates and reference data
+        Scenario("dashboard", "GET", f"{api}/dashboard", lambda s, i: _get(f"{api}/dashboard")),
+        Scenario("stats: daily timeseries", "GET", f"{api}/stats/timeseries", lambda s, i: _get(
+            f"{api}/stats/timeseries", date_from=(s.latest - timedelta(days=90)).isoformat(),
+            date_to=s.latest.isoformat(), group_by="flight_type",
+        )),
+        Scenario("stats: hourly timeseries", "GET", f"{api}/stats/timeseries", lambda s, i: _get(
+            f"{api}/stats/timeseries", granularity="hour", airport_id=s.pick(s.airports, i)[0],
+            date_from=(s.latest - timedelta(days=2)).isoformat(), date_to=s.latest.isoformat(),
+        )),
+        Scenario("analytics: type x month", "GET", f"{api}/analytics/flights", lambda s, i: _get(
+            f"{api}/analytics/flights", group_by="flight_type", bucket="month",
+        )),
+        Scenario("analytics: airport x operation", "GET", f"{api}/analytics/flights", lambda s, i: _get(
+            f"{api}/analytics/flights", group_by="airport_id,operation",
+            date_from=(s.latest - timedelta(days=365)).isoformat(),
+        )),
+        Scenario("search", "GET", f"{api}/search", lambda s, i: _get(
+            f"{api}/search", q=s.pick(s.pilots, i)[2][:3],
+        )),
+        Scenario("metrics: cache", "GET", f"{api}/metrics/cache", lambda s, i: _get(f"{api}/metrics/cache")),
+        Scenario("metrics: reference data", "GET", f"{api}/metrics/reference-data",
+                 lambda s, i: _get(f"{api}/metrics/reference-data")),
+        Scenario("metrics: db pool", "GET", f"{api}/metrics/db-pool", lambda s, i: _get(f"{api}/metrics/db-pool")),
+        Scenario("metrics: analytics", "GET", f"{api}/metrics/analytics",
+                 lambda s, i: _get(f"{api}/metrics/analytics")),
+        Scenario("metrics: stream", "GET", f"{api}/metrics/stream", lambda s, i: _get(f"{api}/metrics/stream")),
+    ]
+
+
+def _reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")  # resets VmHWM to the current RSS
+    except OSError:
+        pass
+
+
+def _peak_rss_mib() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+async def _send(client: httpx.AsyncClient, scenario: Scenario, sample: Sample, index: int) -> None:
+    request = scenario.build(sample, index)
+    on_response = request.pop("on_response", None)
+    response = await client.request(**request)
+    if response.status_code >= 400:
+        raise RuntimeError(f"{scenario.name}: HTTP {response.status_code} {response.text[:200]}")
+    if on_response:
+        on_response(response)
+
+
+async def measure(client: httpx.AsyncClient, scenario: Scenario, sample: Sample,
+                  requests: int, warmup: int, concurrency: int) -> dict:
+    if scenario.max_requests:
+        requests = min(requests, scenario.max_requests)
+    for index in range(warmup):
+        await _send(client, scenario, sample, index)
+
+    latencies: List[float] = []
+    indexes = iter(range(warmup, warmup + requests))
+
+    async def worker():
+        for index in indexes:  # shared by the workers: each request is sent once
+            start = time.perf_counter()
+            await _send(client, scenario, sample, index)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    _reset_peak_rss()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": requests,
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "throughput_rps": round(requests / elapsed, 2),
+        "peak_rss_mib": round(_peak_rss_mib(), 1),
+    }
+
+
+def regressions(results: Dict[str, dict], baseline: dict, metric: str,
+                threshold: float, min_delta_ms: float) -> List[str]:
+    """Routes slower than the baseline by more than `threshold` (and `min_delta_ms`)."""
+    found = []
+    for name, current in results.items():
+        before = baseline["routes"].get(name)
+        if before is None:
+            continue
+        key = f"{metric}_ms"
+        if (current[key] > before[key] * (1 + threshold)
+                and current[key] - before[key] > min_delta_ms):
+            found.append(f"{name}: {metric} {before[key]:.2f} -> {current[key]:.2f} ms")
+        # Throughput as wall time per request, so the same noise floor applies
+        before_ms, current_ms = 1000 / before["throughput_rps"], 1000 / current["throughput_rps"]
+        if current_ms > before_ms * (1 + threshold) and current_ms - before_ms > min_delta_ms:
+            found.append(f"{name}: throughput {before['throughput_rps']:.1f} -> "
+                         f"{current['throughput_rps']:.1f} req/s")
+    return found
+
+
+def uncovered_routes(app, covered: List[Scenario]) -> List[str]:
+    """Routes of the app no scenario exercises, other than the excluded ones."""
+    from fastapi.routing import APIRoute
+
+    exercised = {(scenario.method, scenario.route) for scenario in covered}
+    missing = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or route.path.startswith(tuple(EXCLUDED_PREFIXES)):
+            continue
+        for method in sorted(route.methods - {"HEAD"}):
+            if (method, route.path) not in exercised and route.include_in_schema:
+                missing.append(f"{method} {route.path}")
+    return missing
+
+
+async def ensure_dataset(tier: str, workers: int, reseed: bool) -> int:
+    """Seed the tier's dataset when the database has no flights (or --reseed); returns the flight count."""
+    from sqlalchemy import func, select
+
+    from app.core.database import async_session, create_tables
+    from app.models.models import Flight
+    from app.services.synthetic import SyntheticSpec, generate_synthetic
+
+    await create_tables()
+    async with async_session() as db:
+        flights = (await db.execute(select(func.count(Flight.id)))).scalar() or 0
+    if flights and not reseed:
+        return flights
+
+    spec = SyntheticSpec(**TIERS[tier], end_date=END_DATE, workers=workers, force=True)
+    print(f"seeding {spec.flights:,} flights for tier {tier} (one-off)...", flush=True)
+    started = time.perf_counter()
+    result = await generate_synthetic(spec)
+    print(f"seeded in {time.perf_counter() - started:.0f}s", flush=True)
+    return result["flights"]
+
+
+async def draw_sample(run: int) -> Sample:
+    from sqlalchemy import func, select
+
+    from app.core.database import async_session
+    from app.models.models import Aircraft, Airport, Flight, Pilot
+
+    rng = random.Random(42)
+    async with async_session() as db:
+        airports = (await db.execute(select(Airport.id, Airport.icao_code).order_by(Airport.id))).all()
+        aircraft = (await db.execute(select(Aircraft.id, Aircraft.tail_number).order_by(Aircraft.id))).all()
+        pilots = (await db.execute(
+            select(Pilot.id, Pilot.certificate_number, Pilot.last_name).order_by(Pilot.id)
+        )).all()
+        max_id, latest = (await db.execute(select(func.max(Flight.id), func.max(Flight.actual_time)))).one()
+        candidates = rng.sample(range(1, max_id + 1), min(SAMPLE_SIZE * 2, max_id))
+        flight_ids = sorted((await db.execute(select(Flight.id).where(Flight.id.in_(candidates)))).scalars())
+
+    def sample(rows):
+        return [tuple(row) for row in rng.sample(list(rows), min(SAMPLE_SIZE, len(rows)))]
+
+    rng.shuffle(flight_ids)
+    return Sample(
+        airports=sample(airports),
+        aircraft=sample(aircraft),
+        pilots=sample(pilots),
+        flight_ids=flight_ids,
+        latest=latest,
+        run=run,
+    )
+
+
+async def clean_up(client: httpx.AsyncClient, sample: Sample) -> None:
+    """Delete rows the write scenarios created and did not delete themselves."""
+    paths = {"flights": "flights", "bulk": "flights", "airports": "airports", "aircraft": "aircraft", "pilots": "pilots"}
+    for kind, ids in sample.created.items():
+        for row_id in ids:
+            if row_id is not None:
+                await client.delete(f"/api/v1/{paths[kind]}/{row_id}")
+        ids.clear()
+
+
+async def main(args) -> int:
+    from app.services.analytics import flight_columns
+    from main import app
+
+    flights = await ensure_dataset(args.tier, args.workers, args.reseed)
+    selected = [s for s in scenarios() if not args.routes or any(p in s.name for p in args.routes)]
+
+    async with app.router.lifespan_context(app):
+        while not flight_columns.is_loaded:  # /analytics would otherwise measure the initial load
+            await asyncio.sleep(0.1)
+        sample = await draw_sample(run=int(time.time()) % 4096)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            print(f"tier {args.tier}: {flights:,} flights, {app_database()} database, "
+                  f"{args.requests} requests per route, concurrency {args.concurrency}")
+            print(f"{'route':<34}{'n':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'RSS MiB':>9}")
+            results: Dict[str, dict] = {}
+            try:
+                for scenario in selected:
+                    result = await measure(client, scenario, sample, args.requests, args.warmup, args.concurrency)
+                    results[scenario.name] = result
+                    print(f"{scenario.name:<34}{result['requests']:>5}{result['p50_ms']:>9.2f}"
+                          f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                          f"{result['throughput_rps']:>9.1f}{result['peak_rss_mib']:>9.0f}", flush=True)
+            finally:
+                await clean_up(client, sample)
+
+    missing = uncovered_routes(app, scenarios())
+    if missing and not args.routes:
+        print("not benchmarked (add a scenario): " + ", ".join(missing))
+
+    report = {
+        "tier": args.tier,
+        "flights": flights,
+        "database": app_database(),
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "routes": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline_path = Path(args.baseline or BENCHMARKS_DIR / "baselines" / f"endpoints-{args.tier}.json")
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        if baseline_path.exists() and args.routes:  # keep the routes this run skipped
+            report["routes"] = {**json.loads(baseline_path.read_text())["routes"], **results}
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"baseline saved to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --save-baseline to record one")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    for setting in ("flights", "database", "concurrency"):
+        if baseline.get(setting) != report[setting]:
+            print(f"warning: baseline {setting} was {baseline.get(setting)}, this run {report[setting]}")
+    found = regressions(results, baseline, args.metric, args.threshold, args.min_delta_ms)
+    if found:
+        print(f"{len(found)} regression(s) beyond {args.threshold:.0%} of {baseline_path}:")
+        for line in found:
+            print(f"  {line}")
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%} of {baseline_path}")
+    return 0
+
+
+def app_database() -> str:
+    from app.core.database import engine
+
+    return engine.dialect.name
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API routes against a seeded database")
+    parser.add_argument("--tier", choices=list(TIERS), default="10k", help="Dataset size")
+    parser.add_argument("--database-url", help="Dedicated database for the tier (default: benchmarks/data/<tier>.db)")
+    parser.add_argument("--reseed", action="store_true", help="Regenerate the tier's dataset first")
+    parser.add_argument("--workers", type=int, default=4, help="Processes generating the dataset")
+    parser.add_argument("--routes", nargs="*", help="Only routes whose name contains one of these")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per route")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per route")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baselines/endpoints-<tier>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the baseline")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    parser.add_argument("--metric", choices=["p50", "p95", "p99"], default="p95", help="Latency compared")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown, as a fraction")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    # The app reads DATABASE_URL on import, so it is set before anything under app/ is imported
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        (BENCHMARKS_DIR / "data").mkdir(exist_ok=True)
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{BENCHMARKS_DIR / 'data' / args.tier}.db"
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,82 @@
+"""
+Benchmark typeahead search over synthetic reference data held in memory.
+
+Loads --records pilots, aircraft and airports each into the reference cache
+(no database needed) and times app.services.search.search for a mix of
+short prefixes, full words, multi-word names and exact natural keys:
+
+    python benchmarks/search_index.py
+    python benchmarks/search_index.py --records 200000 --iterations 500
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, '.')
+
+from app.services.reference_data import reference_cache
+from app.services.search import search
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Susan",
+               "William", "Karen", "Richard", "Nancy", "Thomas", "Lisa", "Charles", "Betty", "Daniel", "Sandra"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Wilson", "Anderson", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Thompson"]
+MAKES = [("Cessna", "172S"), ("Piper", "PA-28-181"), ("Beechcraft", "Bonanza G36"), ("Cirrus", "SR22"),
+         ("Diamond", "DA40"), ("Mooney", "M20J"), ("Robinson", "R44")]
+CITIES = ["Frederick", "Gaithersburg", "Hagerstown", "Leesburg", "Manassas", "Winchester", "Cumberland", "Easton"]
+
+
+def synthetic_rows(count: int):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    stamps = {"created_at": now, "updated_at": now}
+    pilots, aircraft, airports = [], [], []
+    for i in range(1, count + 1):
+        pilots.append({
+            "id": i, "certificate_number": f"{3000000 + i}", "first_name": rng.choice(FIRST_NAMES),
+            "last_name": f"{rng.choice(LAST_NAMES)}{'' if i % 4 else rng.randint(1, 999)}",
+            "certificate_type": "private", **stamps,
+        })
+        make, model = rng.choice(MAKES)
+        aircraft.append({
+            "id": i, "tail_number": f"N{i}", "manufacturer": make, "model": model, "category": "single_engine",
+            "owner_name": f"{rng.choice(LAST_NAMES)} Aviation {i % 5000}", **stamps,
+        })
+        airports.append({
+            "id": i, "icao_code": f"{i % 65536:04X}", "name": f"{rng.choice(CITIES)} Field {i}",
+            "city": rng.choice(CITIES), "state": "MD", "latitude": 39.0, "longitude": -77.0, **stamps,
+        })
+    return pilots, aircraft, airports
+
+
+def main(records: int, iterations: int):
+    pilots, aircraft, airports = synthetic_rows(records)
+    for table, rows in ((reference_cache.pilots, pilots), (reference_cache.aircraft, aircraft),
+                        (reference_cache.airports, airports)):
+        start = time.perf_counter()
+        table.replace_all(rows, table.version)
+        print(f"indexed {len(table)} {table.name} in {time.perf_counter() - start:.2f}s")
+
+    queries = ["j", "jo", "smi", "john smith", "cessna 172", "N12345", "frederick", "gar 12", "3000042", "zzz"]
+    print(f"{'query':<14}{'results':>8}{'median ms':>11}{'p95 ms':>9}")
+    for query in queries:
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            results = search(query, limit=10)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{query:<14}{len(results):>8}{statistics.median(timings):>11.2f}{p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark in-memory typeahead search")
+    parser.add_argument("--records", type=int, default=100_000, help="Rows per reference table")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+    main(args.records, args.iterations)
@@ -0,0 +1,119 @@
+"""
+Report which index each hot route query uses.
+
+Runs EXPLAIN against the configured database for the queries behind the
+flight listing, pilot history and dashboard routes, and prints the indexes
+the planner picked along with any full scans or explicit sorts.
+
+    python check_indexes.py            # print the report
+    python check_indexes.py --strict   # exit 1 if a hot query scans or sorts flights/rollups
+"""
+import asyncio
+import json
+import re
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, '.')
+
+from sqlalchemy import select
+
+from app.core.database import engine
+from app.models.models import Flight
+from app.services.flight_queries import FLIGHT_ORDER, filter_flights
+from app.services.dashboard import counters_query, recent_flights_query
+from app.services.rollups import DAY, busiest_airports_query, timeseries_query
+
+
+def hot_queries(dialect_name: str):
+    """(name, statement, in_index_order) for the queries issued by the API routes.
+
+    `in_index_order` is False where a sort is expected, e.g. ordering groups
+    by an aggregate.
+    """
+    now = datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = today_start - timedelta(days=7)
+    page = select(Flight)
+
+    yield "GET /flights", filter_flights(page).order_by(*FLIGHT_ORDER).limit(100), True
+    yield "GET /flights?cursor", filter_flights(page, after=(now, 1)).order_by(*FLIGHT_ORDER).limit(100), True
+    yield "GET /flights?airport_id", filter_flights(page, airport_id=1).order_by(*FLIGHT_ORDER).limit(100), True
+    yield "GET /flights?aircraft_id", filter_flights(page, aircraft_id=1).order_by(*FLIGHT_ORDER).limit(100), True
+    yield "GET /flights?pilot_id", filter_flights(page, pilot_id=1).order_by(*FLIGHT_ORDER).limit(100), True
+    yield "GET /flights?flight_type", filter_flights(page, flight_type="LOCAL").order_by(*FLIGHT_ORDER).limit(100), True
+    yield "GET /flights?operation", filter_flights(page, operation="landing").order_by(*FLIGHT_ORDER).limit(100), True
+    yield "GET /flights/pilot-history", (
+        filter_flights(page, pilot_id=1, years_back=10).order_by(*FLIGHT_ORDER).limit(500)
+    ), True
+    yield "GET /dashboard (counters)", counters_query(today_start, week_start, dialect_name), True
+    yield "GET /dashboard (recent)", recent_flights_query(), True
+    yield "GET /dashboard (busiest)", busiest_airports_query(week_start), False
+    yield "GET /stats/timeseries", timeseries_query(DAY, week_start, now, airport_id=1), True
+
+
+def _sqlite_plan(rows):
+    details = [row[-1] for row in rows]
+    indexes = []
+    for detail in details:
+        match = re.search(r"USING (?:COVERING )?INDEX (\w+)", detail)
+        if match:
+            indexes.append(match.group(1))
+    full_scan = any(re.match(r"SCAN (flights|flight_rollups)\b", d) and "INDEX" not in d for d in details)
+    sort = any("TEMP B-TREE FOR ORDER BY" in d for d in details)
+    return indexes, full_scan, sort, details
+
+
+def _postgres_plan(rows):
+    plan = rows[0][0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    indexes, nodes = [], []
+
+    def walk(node):
+        nodes.append(node["Node Type"] + (f" on {node['Relation Name']}" if "Relation Name" in node else ""))
+        if "Index Name" in node:
+            indexes.append(node["Index Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    full_scan = any(n in ("Seq Scan on flights", "Seq Scan on flight_rollups") for n in nodes)
+    sort = any(n.startswith("Sort") for n in nodes)
+    return indexes, full_scan, sort, nodes
+
+
+async def check_indexes(strict: bool = False) -> int:
+    """Explain every hot query and print a report. Returns the exit code."""
+    problems = 0
+    async with engine.connect() as conn:
+        dialect = conn.dialect
+        for name, statement, in_index_order in hot_queries(dialect.name):
+            sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            if dialect.name == "postgresql":
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+                indexes, full_scan, sort, details = _postgres_plan(result.all())
+            else:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+                indexes, full_scan, sort, details = _sqlite_plan(result.all())
+
+            flags = []
+            if full_scan:
+                flags.append("FULL SCAN")
+            if sort and in_index_order:
+                flags.append("SORT")
+            if flags:
+                problems += 1
+            print(f"{name:28} {', '.join(indexes) or '-':40} {' '.join(flags)}")
+            for detail in details:
+                print(f"    {detail}")
+    await engine.dispose()
+
+    if problems:
+        print(f"\n{problems} hot queries scan or sort the flights table")
+    return 1 if strict and problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(check_indexes(strict="--strict" in sys.argv)))
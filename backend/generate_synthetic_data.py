@@ -0,0 +1,55 @@
+"""
+Generate a reproducible synthetic dataset for load testing.
+
+The same arguments always produce the same rows (pin --end-date to reproduce
+a dataset on another day). The database must be empty unless --force is given:
+
+    python generate_synthetic_data.py --flights 1000000 --end-date 2026-10-01
+    python generate_synthetic_data.py --flights 10000000 --workers 8 --force
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, '.')
+
+from app.core.database import create_tables
+from app.services.synthetic import SyntheticSpec, generate_synthetic
+
+
+async def main(spec: SyntheticSpec):
+    await create_tables()
+    started = time.perf_counter()
+    last_phase = None
+
+    def progress(phase: str, flights_written: int) -> None:
+        nonlocal last_phase
+        if phase != last_phase or phase == "flights":
+            elapsed = time.perf_counter() - started
+            print(f"[{elapsed:7.1f}s] {phase}: {flights_written:,}/{spec.flights:,} flights", flush=True)
+        last_phase = phase
+
+    result = await generate_synthetic(spec, progress=progress)
+    elapsed = time.perf_counter() - started
+    print(f"Generated {result['airports']:,} airports, {result['aircraft']:,} aircraft, "
+          f"{result['pilots']:,} pilots and {result['flights']:,} flights in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    defaults = SyntheticSpec()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flights", type=int, default=defaults.flights)
+    parser.add_argument("--airports", type=int, default=defaults.airports)
+    parser.add_argument("--aircraft", type=int, default=defaults.aircraft)
+    parser.add_argument("--pilots", type=int, default=defaults.pilots)
+    parser.add_argument("--years", type=int, default=defaults.years, help="Years of history ending at --end-date")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--end-date", type=datetime.fromisoformat, default=None,
+                        help="Last day of flights, YYYY-MM-DD (default: today)")
+    parser.add_argument("--workers", type=int, default=defaults.workers, help="Flight generator processes")
+    parser.add_argument("--force", action="store_true", help="Delete existing data first")
+    args = parser.parse_args()
+    asyncio.run(main(SyntheticSpec(**vars(args))))
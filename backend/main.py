@@ -1,12 +1,22 @@
 """Airport Flight Tracker - FastAPI Backend"""
+import asyncio
 import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core.database import create_tables
+from app.core.compression import CompressionMiddleware
+from app.core.database import LAST_WRITE_HEADER, LastWriteMiddleware, create_tables, engine, read_engine
 from app.core.config import get_settings
-from app.api.routes import airports, flights, aircraft, pilots, dashboard
+from app.api.routes import airports, flights, aircraft, pilots, dashboard, reports, stats, metrics, search, analytics, stream, seed
+from app.services.analytics import flight_columns
+from app.services.cache import dashboard_cache
+from app.services.pagination import NEXT_CURSOR_HEADER
+from app.services.partitions import ensure_partitions
+from app.services.reference_data import reference_cache
+from app.services.reports import report_manager
+from app.services.synthetic import seed_jobs
+from app.services.versions import ETagMiddleware
 
 settings = get_settings()
 
@@ -16,9 +26,21 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     await create_tables()
+    async with engine.begin() as conn:
+        await ensure_partitions(conn)
+    await reference_cache.load()
+    # The flight column store loads in the background; /analytics waits for it
+    background = [asyncio.create_task(flight_columns.keep_loaded(settings.ANALYTICS_REFRESH_SECONDS))]
+    if settings.REFERENCE_CACHE_REFRESH_SECONDS > 0:
+        background.append(asyncio.create_task(
+            reference_cache.refresh_periodically(settings.REFERENCE_CACHE_REFRESH_SECONDS)
+        ))
     yield
     # Shutdown
-    pass
+    for task in background:
+        task.cancel()
+    await report_manager.shutdown()
+    await seed_jobs.shutdown()
 
 
 app = FastAPI(
@@ -38,12 +60,22 @@ allowed_origins = [
 if os.environ.get("RAILWAY_PUBLIC_DOMAIN"):
     allowed_origins.append(f"https://{os.environ.get('RAILWAY_PUBLIC_DOMAIN')}")
 
+# With a read replica, tag write responses so clients can keep reading their own writes
+if read_engine is not engine:
+    app.add_middleware(LastWriteMiddleware)
+
+app.add_middleware(ETagMiddleware)
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, LAST_WRITE_HEADER, "ETag"],
 )
 
 # Include routers
@@ -52,6 +84,13 @@ app.include_router(flights.router, prefix="/api/v1")
 app.include_router(aircraft.router, prefix="/api/v1")
 app.include_router(pilots.router, prefix="/api/v1")
 app.include_router(dashboard.router, prefix="/api/v1")
+app.include_router(reports.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
+app.include_router(metrics.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1")
+app.include_router(analytics.router, prefix="/api/v1")
+app.include_router(stream.router, prefix="/api/v1")
+app.include_router(seed.router, prefix="/api/v1")
 
 
 @app.get("/health")
@@ -65,4 +104,7 @@ async def seed_database(force: bool = False):
     """Seed the database with sample data. Use force=true to clear and reseed."""
     from seed_data import seed_database as run_seed
     await run_seed(force=force)
+    await reference_cache.load()
+    await flight_columns.load()
+    dashboard_cache.invalidate()
     return {"status": "success", "message": "Database seeded with sample data", "force": force}
@@ -0,0 +1,157 @@
+"""Baseline schema: airports, aircraft, pilots and flights.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+Mirrors the tables that create_tables() has always built at startup. Each
+table is only created when missing, so existing databases can be brought
+under Alembic with a plain `alembic upgrade head`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    if op.get_context().as_sql:  # offline --sql mode has no database to inspect
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("airports"):
+        op.create_table(
+            "airports",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("icao_code", sa.String(4), nullable=False),
+            sa.Column("faa_code", sa.String(4), nullable=True),
+            sa.Column("name", sa.String(200), nullable=False),
+            sa.Column("city", sa.String(100), nullable=False),
+            sa.Column("state", sa.String(2), nullable=False),
+            sa.Column("county", sa.String(100), nullable=True),
+            sa.Column("latitude", sa.Float(), nullable=False),
+            sa.Column("longitude", sa.Float(), nullable=False),
+            sa.Column("elevation_ft", sa.Integer(), nullable=True),
+            sa.Column("airport_type", sa.String(50), nullable=False),
+            sa.Column("ownership", sa.String(50), nullable=True),
+            sa.Column("runways", sa.Text(), nullable=True),
+            sa.Column("fuel_types", sa.String(100), nullable=True),
+            sa.Column("has_tower", sa.Boolean(), nullable=False),
+            sa.Column("ctaf_frequency", sa.String(20), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_airports_id", "airports", ["id"])
+        op.create_index("ix_airports_icao_code", "airports", ["icao_code"], unique=True)
+        op.create_index("ix_airports_faa_code", "airports", ["faa_code"])
+
+    if not _has_table("aircraft"):
+        op.create_table(
+            "aircraft",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("tail_number", sa.String(10), nullable=False),
+            sa.Column("manufacturer", sa.String(100), nullable=False),
+            sa.Column("model", sa.String(100), nullable=False),
+            sa.Column("year_built", sa.Integer(), nullable=True),
+            sa.Column(
+                "category",
+                sa.Enum(
+                    "SINGLE_ENGINE", "MULTI_ENGINE", "JET", "HELICOPTER", "GLIDER", "BALLOON", "OTHER",
+                    name="aircraftcategory",
+                ),
+                nullable=False,
+            ),
+            sa.Column("engine_type", sa.String(50), nullable=True),
+            sa.Column("num_engines", sa.Integer(), nullable=False),
+            sa.Column("max_passengers", sa.Integer(), nullable=True),
+            sa.Column("owner_name", sa.String(200), nullable=False),
+            sa.Column("owner_address", sa.Text(), nullable=True),
+            sa.Column("owner_city", sa.String(100), nullable=True),
+            sa.Column("owner_state", sa.String(2), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_aircraft_id", "aircraft", ["id"])
+        op.create_index("ix_aircraft_tail_number", "aircraft", ["tail_number"], unique=True)
+
+    if not _has_table("pilots"):
+        op.create_table(
+            "pilots",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("certificate_number", sa.String(20), nullable=False),
+            sa.Column("first_name", sa.String(100), nullable=False),
+            sa.Column("last_name", sa.String(100), nullable=False),
+            sa.Column(
+                "certificate_type",
+                sa.Enum(
+                    "STUDENT", "SPORT", "RECREATIONAL", "PRIVATE", "COMMERCIAL", "ATP",
+                    name="pilotcertificate",
+                ),
+                nullable=False,
+            ),
+            sa.Column("ratings", sa.Text(), nullable=True),
+            sa.Column("medical_class", sa.String(20), nullable=True),
+            sa.Column("medical_expiry", sa.DateTime(), nullable=True),
+            sa.Column("total_flight_hours", sa.Float(), nullable=False),
+            sa.Column("email", sa.String(200), nullable=True),
+            sa.Column("phone", sa.String(20), nullable=True),
+            sa.Column("city", sa.String(100), nullable=True),
+            sa.Column("state", sa.String(2), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_pilots_id", "pilots", ["id"])
+        op.create_index("ix_pilots_certificate_number", "pilots", ["certificate_number"], unique=True)
+
+    if not _has_table("flights"):
+        op.create_table(
+            "flights",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("airport_id", sa.Integer(), sa.ForeignKey("airports.id"), nullable=False),
+            sa.Column("aircraft_id", sa.Integer(), sa.ForeignKey("aircraft.id"), nullable=False),
+            sa.Column("pic_id", sa.Integer(), sa.ForeignKey("pilots.id"), nullable=False),
+            sa.Column(
+                "flight_type",
+                sa.Enum(
+                    "LOCAL", "CROSS_COUNTRY", "TRAINING", "PLEASURE", "BUSINESS",
+                    "CHARTER", "CARGO", "MAINTENANCE", "OTHER",
+                    name="flighttype",
+                ),
+                nullable=False,
+            ),
+            sa.Column("operation", sa.String(20), nullable=False),
+            sa.Column("runway", sa.String(10), nullable=True),
+            sa.Column("scheduled_time", sa.DateTime(), nullable=True),
+            sa.Column("actual_time", sa.DateTime(), nullable=False),
+            sa.Column("origin_airport", sa.String(4), nullable=True),
+            sa.Column("destination_airport", sa.String(4), nullable=True),
+            sa.Column("passengers", sa.Integer(), nullable=False),
+            sa.Column("cargo_weight_lbs", sa.Float(), nullable=True),
+            sa.Column("fuel_gallons", sa.Float(), nullable=True),
+            sa.Column("remarks", sa.Text(), nullable=True),
+            sa.Column("squawk_code", sa.String(4), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_flights_id", "flights", ["id"])
+        op.create_index("ix_flights_airport_id", "flights", ["airport_id"])
+        op.create_index("ix_flights_aircraft_id", "flights", ["aircraft_id"])
+        op.create_index("ix_flights_pic_id", "flights", ["pic_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("flights")
+    op.drop_table("pilots")
+    op.drop_table("aircraft")
+    op.drop_table("airports")
@@ -0,0 +1,76 @@
+"""Composite indexes for the hot flight access paths.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+Every flight listing orders by (actual_time, id) and usually filters on one of
+pic_id, airport_id, aircraft_id, flight_type or operation. These indexes let
+those queries walk the index in order instead of scanning and sorting. The
+composites lead with the foreign key columns, so the old single-column FK
+indexes become redundant and are dropped.
+
+On PostgreSQL the indexes are built with CREATE INDEX CONCURRENTLY, which
+cannot run inside a transaction, so the work happens in an autocommit block.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COMPOSITE_INDEXES = [
+    ("ix_flights_actual_time_id", ["actual_time", "id"], {"postgresql_include": ["airport_id"]}),
+    ("ix_flights_pic_id_actual_time", ["pic_id", "actual_time", "id"], {}),
+    ("ix_flights_airport_id_actual_time", ["airport_id", "actual_time", "id"], {}),
+    ("ix_flights_aircraft_id_actual_time", ["aircraft_id", "actual_time", "id"], {}),
+    ("ix_flights_flight_type_actual_time", ["flight_type", "actual_time", "id"], {}),
+    ("ix_flights_operation_actual_time", ["operation", "actual_time", "id"], {}),
+]
+
+SUPERSEDED_INDEXES = [
+    ("ix_flights_pic_id", ["pic_id"]),
+    ("ix_flights_airport_id", ["airport_id"]),
+    ("ix_flights_aircraft_id", ["aircraft_id"]),
+]
+
+
+def _online() -> dict:
+    """Extra index options for building without locking the table."""
+    if op.get_bind().dialect.name == "postgresql":
+        return {"postgresql_concurrently": True}
+    return {}
+
+
+def _run(fn) -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            fn()
+    else:
+        fn()
+
+
+def upgrade() -> None:
+    def build():
+        for name, columns, options in COMPOSITE_INDEXES:
+            op.create_index(name, "flights", columns, if_not_exists=True, **options, **_online())
+        for name, _ in SUPERSEDED_INDEXES:
+            op.drop_index(name, table_name="flights", if_exists=True, **_online())
+
+    _run(build)
+
+
+def downgrade() -> None:
+    def restore():
+        for name, columns in SUPERSEDED_INDEXES:
+            op.create_index(name, "flights", columns, if_not_exists=True, **_online())
+        for name, _, _ in COMPOSITE_INDEXES:
+            op.drop_index(name, table_name="flights", if_exists=True, **_online())
+
+    _run(restore)
@@ -0,0 +1,59 @@
+"""Traffic rollup table for the dashboard and time series.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00.000000
+
+The table starts empty; backfill it from the flights table afterwards with
+`python rebuild_rollups.py`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    if op.get_context().as_sql:  # offline --sql mode has no database to inspect
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if _has_table("flight_rollups"):
+        return
+    op.create_table(
+        "flight_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("granularity", sa.String(4), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("airport_id", sa.Integer(), sa.ForeignKey("airports.id"), nullable=False),
+        sa.Column(
+            "flight_type",
+            sa.Enum(
+                "LOCAL", "CROSS_COUNTRY", "TRAINING", "PLEASURE", "BUSINESS",
+                "CHARTER", "CARGO", "MAINTENANCE", "OTHER",
+                name="flighttype",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("operation", sa.String(20), nullable=False),
+        sa.Column("flight_count", sa.Integer(), nullable=False),
+        sa.Column("passengers", sa.Integer(), nullable=False),
+        sa.UniqueConstraint(
+            "granularity", "bucket_start", "airport_id", "flight_type", "operation",
+            name="uq_flight_rollups_key",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("flight_rollups")
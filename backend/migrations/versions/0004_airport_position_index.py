@@ -0,0 +1,30 @@
+"""Index airport positions for bounding-box lookups.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 14:00:00.000000
+
+The /airports/nearby and /airports/within endpoints are served from an
+in-memory grid; when it is not loaded they fall back to a latitude/longitude
+range query, which this index serves.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_airports_latitude_longitude", "airports", ["latitude", "longitude"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_airports_latitude_longitude", table_name="airports", if_exists=True)
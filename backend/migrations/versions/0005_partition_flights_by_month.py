@@ -0,0 +1,149 @@
+"""Partition the flights table by month (PostgreSQL only).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 16:00:00.000000
+
+Rebuilds `flights` as a table range-partitioned on actual_time with one
+partition per calendar month (flights_yYYYYmMM), from the oldest flight to
+PARTITION_MONTHS_AHEAD months from now, plus a DEFAULT partition for anything
+outside that range. The application creates the partitions for upcoming
+months at startup (app/services/partitions.py), and archive_flights.py drops
+a month's partition once its rows have been moved to Parquet.
+
+A partitioned table's primary key must include the partition column, so the
+key becomes (id, actual_time); ids still come from the same sequence and
+stay unique. Every row is copied, so run this during a maintenance window on
+a large database. SQLite has no partitioning and is left unchanged.
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITION_MONTHS_AHEAD = 12
+
+# Same definitions as 0001/0002 and the Flight model
+INDEXES = [
+    "CREATE INDEX ix_flights_id ON flights (id)",
+    "CREATE INDEX ix_flights_actual_time_id ON flights (actual_time, id) INCLUDE (airport_id)",
+    "CREATE INDEX ix_flights_pic_id_actual_time ON flights (pic_id, actual_time, id)",
+    "CREATE INDEX ix_flights_airport_id_actual_time ON flights (airport_id, actual_time, id)",
+    "CREATE INDEX ix_flights_aircraft_id_actual_time ON flights (aircraft_id, actual_time, id)",
+    "CREATE INDEX ix_flights_flight_type_actual_time ON flights (flight_type, actual_time, id)",
+    "CREATE INDEX ix_flights_operation_actual_time ON flights (operation, actual_time, id)",
+]
+FOREIGN_KEYS = [
+    ("airport_id", "airports"),
+    ("aircraft_id", "aircraft"),
+    ("pic_id", "pilots"),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _is_partitioned() -> bool:
+    if op.get_context().as_sql:  # offline --sql mode has no database to inspect
+        return False
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'flights' AND pg_table_is_visible(c.oid))"
+    )).scalar())
+
+
+def _months(first: datetime, last: datetime):
+    month = first.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    while month <= last:
+        following = datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+        yield month, following
+        month = following
+
+
+def _oldest_flight() -> datetime:
+    if op.get_context().as_sql:
+        return datetime.utcnow()
+    oldest = op.get_bind().execute(sa.text("SELECT min(actual_time) FROM flights_unpartitioned")).scalar()
+    return oldest or datetime.utcnow()
+
+
+def _copy_structure(source: str, target: str, partitioned: bool) -> None:
+    op.execute(
+        f"CREATE TABLE {target} (LIKE {source} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        + (" PARTITION BY RANGE (actual_time)" if partitioned else "")
+    )
+
+
+def _drop_indexes(table: str) -> None:
+    for statement in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {statement.split()[2]}")
+    op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS flights_pkey")
+
+
+def _add_keys(primary_key: str) -> None:
+    op.execute(f"ALTER TABLE flights ADD CONSTRAINT flights_pkey PRIMARY KEY ({primary_key})")
+    for column, referenced in FOREIGN_KEYS:
+        op.execute(
+            f"ALTER TABLE flights ADD CONSTRAINT flights_{column}_fkey "
+            f"FOREIGN KEY ({column}) REFERENCES {referenced} (id)"
+        )
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    if not _is_postgresql() or _is_partitioned():
+        return
+
+    op.execute("ALTER TABLE flights RENAME TO flights_unpartitioned")
+    # The id sequence must outlive the old table
+    op.execute("ALTER SEQUENCE flights_id_seq OWNED BY NONE")
+    _drop_indexes("flights_unpartitioned")
+    for column, _ in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE flights_unpartitioned DROP CONSTRAINT IF EXISTS flights_{column}_fkey")
+
+    _copy_structure("flights_unpartitioned", "flights", partitioned=True)
+    now = datetime.utcnow()
+    last = datetime(now.year + (now.month - 1 + PARTITION_MONTHS_AHEAD) // 12,
+                    (now.month - 1 + PARTITION_MONTHS_AHEAD) % 12 + 1, 1)
+    for month, following in _months(_oldest_flight(), last):
+        op.execute(
+            f"CREATE TABLE flights_y{month.year}m{month.month:02d} PARTITION OF flights "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+    op.execute("CREATE TABLE flights_default PARTITION OF flights DEFAULT")
+    _add_keys("id, actual_time")
+
+    op.execute("INSERT INTO flights SELECT * FROM flights_unpartitioned")
+    op.execute("DROP TABLE flights_unpartitioned")
+    op.execute("ALTER SEQUENCE flights_id_seq OWNED BY flights.id")
+    op.execute("ANALYZE flights")
+
+
+def downgrade() -> None:
+    if not _is_postgresql() or not _is_partitioned():
+        return
+
+    op.execute("ALTER TABLE flights RENAME TO flights_partitioned")
+    op.execute("ALTER SEQUENCE flights_id_seq OWNED BY NONE")
+    _drop_indexes("flights_partitioned")
+    for column, _ in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE flights_partitioned DROP CONSTRAINT IF EXISTS flights_{column}_fkey")
+
+    _copy_structure("flights_partitioned", "flights", partitioned=False)
+    _add_keys("id")
+
+    op.execute("INSERT INTO flights SELECT * FROM flights_partitioned")
+    # Dropping the parent drops every partition with it
+    op.execute("DROP TABLE flights_partitioned")
+    op.execute("ALTER SEQUENCE flights_id_seq OWNED BY flights.id")
+    op.execute("ANALYZE flights")
@@ -0,0 +1,63 @@
+"""Per-pilot activity stats tables.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 18:00:00.000000
+
+The tables start empty; backfill them from the flights table and the flight
+archive afterwards with `python rebuild_pilot_stats.py`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    if op.get_context().as_sql:  # offline --sql mode has no database to inspect
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("pilot_stats"):
+        op.create_table(
+            "pilot_stats",
+            sa.Column("pilot_id", sa.Integer(), sa.ForeignKey("pilots.id"), primary_key=True),
+            sa.Column("flight_count", sa.Integer(), nullable=False),
+            sa.Column("takeoffs", sa.Integer(), nullable=False),
+            sa.Column("landings", sa.Integer(), nullable=False),
+            sa.Column("cross_country_count", sa.Integer(), nullable=False),
+            sa.Column("passengers", sa.Integer(), nullable=False),
+            sa.Column("first_flight_at", sa.DateTime(), nullable=True),
+            sa.Column("last_flight_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_pilot_stats_flight_count", "pilot_stats", ["flight_count", "pilot_id"])
+        op.create_index("ix_pilot_stats_cross_country_count", "pilot_stats", ["cross_country_count", "pilot_id"])
+        op.create_index("ix_pilot_stats_last_flight_at", "pilot_stats", ["last_flight_at", "pilot_id"])
+
+    if not _has_table("pilot_stat_breakdowns"):
+        op.create_table(
+            "pilot_stat_breakdowns",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("pilot_id", sa.Integer(), sa.ForeignKey("pilots.id"), nullable=False),
+            sa.Column("dimension", sa.String(20), nullable=False),
+            sa.Column("key", sa.String(20), nullable=False),
+            sa.Column("flight_count", sa.Integer(), nullable=False),
+            sa.UniqueConstraint("pilot_id", "dimension", "key", name="uq_pilot_stat_breakdowns_key"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("pilot_stat_breakdowns")
+    op.drop_index("ix_pilot_stats_last_flight_at", table_name="pilot_stats")
+    op.drop_index("ix_pilot_stats_cross_country_count", table_name="pilot_stats")
+    op.drop_index("ix_pilot_stats_flight_count", table_name="pilot_stats")
+    op.drop_table("pilot_stats")
@@ -0,0 +1,38 @@
+"""Per-table change versions for ETags.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 20:00:00.000000
+
+Tables without a row are at version 0; the first write to each inserts it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    if op.get_context().as_sql:  # offline --sql mode has no database to inspect
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("table_versions"):
+        op.create_table(
+            "table_versions",
+            sa.Column("name", sa.String(50), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("table_versions")
@@ -0,0 +1,32 @@
+"""
+Rebuild the per-pilot activity stats from the flights table and the archive.
+
+Run after upgrading an existing database, or whenever the stats are
+suspected to have drifted:
+
+    python rebuild_pilot_stats.py [--chunk-rows 50000]
+"""
+import argparse
+import asyncio
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, '.')
+
+from app.core.database import async_session, create_tables
+from app.services.pilot_stats import REBUILD_CHUNK_ROWS, rebuild_pilot_stats
+
+
+async def main(chunk_rows: int):
+    await create_tables()
+    async with async_session() as db:
+        processed = await rebuild_pilot_stats(db, chunk_rows=chunk_rows)
+    print(f"Rebuilt pilot stats from {processed} flights")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-rows", type=int, default=REBUILD_CHUNK_ROWS,
+                        help="Flights read and committed per chunk")
+    args = parser.parse_args()
+    asyncio.run(main(args.chunk_rows))
@@ -0,0 +1,32 @@
+"""
+Rebuild the flight traffic rollups from the raw flights table.
+
+Run after upgrading an existing database, or whenever the rollups are
+suspected to have drifted:
+
+    python rebuild_rollups.py [--chunk-rows 50000]
+"""
+import argparse
+import asyncio
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, '.')
+
+from app.core.database import async_session, create_tables
+from app.services.rollups import REBUILD_CHUNK_ROWS, rebuild_rollups
+
+
+async def main(chunk_rows: int):
+    await create_tables()
+    async with async_session() as db:
+        processed = await rebuild_rollups(db, chunk_rows=chunk_rows)
+    print(f"Rebuilt rollups from {processed} flights")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-rows", type=int, default=REBUILD_CHUNK_ROWS,
+                        help="Flights read and committed per chunk")
+    args = parser.parse_args()
+    asyncio.run(main(args.chunk_rows))
@@ -12,7 +12,11 @@ import sys
 sys.path.insert(0, '.')
 
 from app.core.database import async_session, engine
-from app.models.models import Base, Airport, Aircraft, Pilot, Flight
+from app.models.models import Base, Airport, Aircraft, Pilot, Flight, FlightRollup, PilotStats, PilotStatBreakdown
+from app.services.archive import flight_archive
+from app.services.pilot_stats import rebuild_pilot_stats
+from app.services.rollups import rebuild_rollups
+from app.services.versions import TABLES, bump_versions
 
 
 async def seed_database(force: bool = False):
@@ -29,11 +33,17 @@ async def seed_database(force: bool = False):
         if force:
             # Clear existing data
             print("Force reseed - clearing existing data...")
+            await db.execute(delete(FlightRollup))
+            await db.execute(delete(PilotStatBreakdown))
+            await db.execute(delete(PilotStats))
             await db.execute(delete(Flight))
             await db.execute(delete(Pilot))
             await db.execute(delete(Aircraft))
             await db.execute(delete(Airport))
+            await bump_versions(db, *TABLES)
             await db.commit()
+            # Archived months would otherwise come back with ids reused by the new flights
+            flight_archive.clear()
         else:
             result = await db.execute(select(func.count(Pilot.id)))
             if result.scalar() > 0:
@@ -705,9 +715,16 @@ async def seed_database(force: bool = False):
         for flight in flights:
             db.add(flight)
         
+        await bump_versions(db, *TABLES)
         await db.commit()
         print(f"  Added {len(flights)} flights")
         
+        await rebuild_rollups(db)
+        print("  Rebuilt traffic rollups")
+        
+        await rebuild_pilot_stats(db)
+        print("  Rebuilt pilot stats")
+        
         # Summary
         jack_flights = [f for f in flights if f.pic_id == jack.id]
         print(f"\nDatabase seeded successfully!")
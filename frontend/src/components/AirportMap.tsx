@@ -1,6 +1,7 @@
-import { useState, useCallback, useRef } from 'react';
+import { useState, useCallback, useEffect, useMemo, useRef } from 'react';
 import { GoogleMap, useJsApiLoader, Marker, InfoWindow } from '@react-google-maps/api';
-import type { Airport } from '../types';
+import { airportApi } from '../services/api';
+import type { Airport, AirportCluster } from '../types';
 
 const mapContainerStyle = {
   width: '100%',
@@ -55,8 +56,14 @@ interface AirportMapProps {
 export default function AirportMap({ airports, onAirportSelect, onMapClick }: AirportMapProps) {
   const [selectedAirport, setSelectedAirport] = useState<Airport | null>(null);
   const [map, setMap] = useState<google.maps.Map | null>(null);
+  const [clusters, setClusters] = useState<AirportCluster[]>([]);
   const searchBoxRef = useRef<HTMLInputElement>(null);
 
+  const airportsById = useMemo(
+    () => new Map(airports.map((airport) => [airport.id, airport])),
+    [airports]
+  );
+
   const { isLoaded, loadError } = useJsApiLoader({
     googleMapsApiKey: import.meta.env.VITE_GOOGLE_MAPS_API_KEY || '',
     libraries: ['places'],
@@ -79,6 +86,24 @@ export default function AirportMap({ airports, onAirportSelect, onMapClick }: Ai
     setMap(null);
   }, []);
 
+  // Markers come pre-clustered from the backend for the visible area and zoom
+  const loadClusters = useCallback(() => {
+    const bounds = map?.getBounds();
+    const zoom = map?.getZoom();
+    if (!bounds || zoom === undefined) return;
+    const sw = bounds.getSouthWest();
+    const ne = bounds.getNorthEast();
+    airportApi
+      .clusters([sw.lng(), sw.lat(), ne.lng(), ne.lat()], Math.round(zoom))
+      .then(setClusters)
+      .catch(() => setClusters([]));
+  }, [map]);
+
+  // Reload after airports are added or removed
+  useEffect(() => {
+    loadClusters();
+  }, [airports, loadClusters]);
+
   const handleMarkerClick = (airport: Airport) => {
     setSelectedAirport(airport);
     if (onAirportSelect) {
@@ -86,6 +111,12 @@ export default function AirportMap({ airports, onAirportSelect, onMapClick }: Ai
     }
   };
 
+  const handleClusterClick = (cluster: AirportCluster) => {
+    if (!map) return;
+    map.panTo({ lat: cluster.latitude, lng: cluster.longitude });
+    map.setZoom((map.getZoom() ?? 4) + 2);
+  };
+
   const handleMapClick = (e: google.maps.MapMouseEvent) => {
     setSelectedAirport(null);
     if (onMapClick && e.latLng) {
@@ -125,6 +156,15 @@ export default function AirportMap({ airports, onAirportSelect, onMapClick }: Ai
     };
   };
 
+  const getClusterIcon = (cluster: AirportCluster): google.maps.Symbol => ({
+    path: google.maps.SymbolPath.CIRCLE,
+    fillColor: '#f59e0b',
+    fillOpacity: 0.85,
+    strokeColor: '#ffffff',
+    strokeWeight: 2,
+    scale: 12 + Math.min(18, Math.log2(cluster.count) * 3),
+  });
+
   if (loadError) {
     return (
       <div className="bg-slate-800 rounded-lg p-8 text-center">
@@ -179,18 +219,34 @@ export default function AirportMap({ airports, onAirportSelect, onMapClick }: Ai
         zoom={4}
         onLoad={onLoad}
         onUnmount={onUnmount}
+        onIdle={loadClusters}
         onClick={handleMapClick}
         options={mapOptions}
       >
-        {airports.map((airport) => (
-          <Marker
-            key={airport.id}
-            position={{ lat: airport.latitude, lng: airport.longitude }}
-            icon={getMarkerIcon(airport)}
-            onClick={() => handleMarkerClick(airport)}
-            title={`${airport.icao_code} - ${airport.name}`}
-          />
-        ))}
+        {clusters.map((cluster) => {
+          const airport = cluster.count === 1 ? airportsById.get(cluster.busiest.id) : undefined;
+          if (airport) {
+            return (
+              <Marker
+                key={`airport-${airport.id}`}
+                position={{ lat: airport.latitude, lng: airport.longitude }}
+                icon={getMarkerIcon(airport)}
+                onClick={() => handleMarkerClick(airport)}
+                title={`${airport.icao_code} - ${airport.name}`}
+              />
+            );
+          }
+          return (
+            <Marker
+              key={`cluster-${cluster.busiest.id}`}
+              position={{ lat: cluster.latitude, lng: cluster.longitude }}
+              icon={getClusterIcon(cluster)}
+              label={{ text: String(cluster.count), color: '#ffffff', fontWeight: 'bold' }}
+              onClick={() => handleClusterClick(cluster)}
+              title={`${cluster.count} airports, busiest ${cluster.busiest.icao_code} (${cluster.weight} flights)`}
+            />
+          );
+        })}
 
         {selectedAirport && (
           <InfoWindow
@@ -1,16 +1,34 @@
-import { useQuery } from '@tanstack/react-query';
+import { useEffect } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { useNavigate } from 'react-router-dom';
 import { Plane, Users, ClipboardList, TrendingUp } from 'lucide-react';
-import { dashboardApi } from '../services/api';
+import { dashboardApi, movementApi } from '../services/api';
 import { format } from 'date-fns';
 
 export default function Dashboard() {
   const navigate = useNavigate();
+  const queryClient = useQueryClient();
   const { data: stats, isLoading, error } = useQuery({
     queryKey: ['dashboard'],
     queryFn: dashboardApi.getStats,
   });
 
+  // Refresh when movements are logged (at most every few seconds) instead of polling
+  useEffect(() => {
+    let pending: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = movementApi.subscribe(() => {
+      if (pending) return;
+      pending = setTimeout(() => {
+        pending = undefined;
+        queryClient.invalidateQueries({ queryKey: ['dashboard'] });
+      }, 5000);
+    });
+    return () => {
+      unsubscribe();
+      clearTimeout(pending);
+    };
+  }, [queryClient]);
+
   if (isLoading) {
     return (
       <div className="flex items-center justify-center h-64">
@@ -3,7 +3,7 @@ import { useQuery } from '@tanstack/react-query';
 import { Plus, Search, Plane, Calendar, FileDown } from 'lucide-react';
 import { format } from 'date-fns';
 import { flightApi, airportApi } from '../services/api';
-import { exportFlightsPDF } from '../utils/pdfExport';
+import { exportFlightsReport } from '../utils/pdfExport';
 
 export default function Flights() {
   const [search, setSearch] = useState('');
@@ -19,9 +19,28 @@ export default function Flights() {
       airport_id: airportId ? parseInt(airportId) : undefined,
       date_from: dateFrom || undefined,
       date_to: dateTo || undefined,
+      fields: 'id,actual_time,origin_airport,destination_airport,flight_type,passengers,operation',
+      embed: 'airport,aircraft,pilot',
     }),
   });
 
+  const [exporting, setExporting] = useState(false);
+
+  const handleExport = async () => {
+    setExporting(true);
+    try {
+      await exportFlightsReport({
+        kind: 'airport_movements',
+        airport_id: airportId ? parseInt(airportId) : undefined,
+        flight_type: flightType || undefined,
+        date_from: dateFrom ? `${dateFrom}T00:00:00` : undefined,
+        date_to: dateTo ? `${dateTo}T23:59:59` : undefined,
+      });
+    } finally {
+      setExporting(false);
+    }
+  };
+
   const { data: airports } = useQuery({
     queryKey: ['airports'],
     queryFn: () => airportApi.list({}),
@@ -33,12 +52,12 @@ export default function Flights() {
         <h1 className="text-3xl font-bold text-white">Flight Logs</h1>
         <div className="flex gap-2">
           <button 
-            onClick={() => flights && exportFlightsPDF(flights)}
-            disabled={!flights || flights.length === 0}
+            onClick={handleExport}
+            disabled={exporting || !flights || flights.length === 0}
             className="flex items-center gap-2 bg-slate-600 hover:bg-slate-500 disabled:opacity-50 disabled:cursor-not-allowed text-white px-4 py-2 rounded-lg transition-colors"
           >
             <FileDown className="w-5 h-5" />
-            Export PDF
+            {exporting ? 'Generating...' : 'Export PDF'}
           </button>
           <button className="flex items-center gap-2 bg-blue-600 hover:bg-blue-700 text-white px-4 py-2 rounded-lg transition-colors">
             <Plus className="w-5 h-5" />
@@ -4,7 +4,7 @@ import { Plus, Search, User, Clock, Plane, FileDown } from 'lucide-react';
 import { format } from 'date-fns';
 import { pilotApi, flightApi } from '../services/api';
 import type { Pilot } from '../types';
-import { exportFlightsPDF } from '../utils/pdfExport';
+import { exportFlightsReport } from '../utils/pdfExport';
 
 export default function Pilots() {
   const [pilotSearch, setPilotSearch] = useState('');
@@ -25,10 +25,29 @@ export default function Pilots() {
   // Get flight history for selected pilot
   const { data: pilotFlights, isLoading: flightsLoading, isFetching } = useQuery({
     queryKey: ['pilot-flights', selectedPilot?.id, yearsBack],
-    queryFn: () => flightApi.getPilotHistory(selectedPilot!.id, parseInt(yearsBack), 500),
+    queryFn: () => flightApi.getPilotHistory(selectedPilot!.id, parseInt(yearsBack), 500, {
+      fields: 'id,actual_time,origin_airport,destination_airport,flight_type,operation,passengers',
+      embed: 'airport,aircraft',
+    }),
     enabled: !!selectedPilot,
   });
 
+  const [exporting, setExporting] = useState(false);
+
+  const handleExport = async () => {
+    if (!selectedPilot) return;
+    setExporting(true);
+    try {
+      await exportFlightsReport({
+        kind: 'pilot_logbook',
+        pilot_id: selectedPilot.id,
+        years_back: parseInt(yearsBack),
+      });
+    } finally {
+      setExporting(false);
+    }
+  };
+
   const handlePilotSelect = (pilot: Pilot) => {
     setSelectedPilot(pilot);
   };
@@ -180,12 +199,12 @@ export default function Pilots() {
                   <span className="text-slate-400 text-sm">Loading flight history...</span>
                 )}
                 <button 
-                  onClick={() => pilotFlights && exportFlightsPDF(pilotFlights)}
-                  disabled={!pilotFlights || pilotFlights.length === 0}
+                  onClick={handleExport}
+                  disabled={exporting || !pilotFlights || pilotFlights.length === 0}
                   className="flex items-center gap-2 bg-slate-600 hover:bg-slate-500 disabled:opacity-50 disabled:cursor-not-allowed text-white px-3 py-1.5 rounded-lg transition-colors text-sm"
                 >
                   <FileDown className="w-4 h-4" />
-                  Export PDF
+                  {exporting ? 'Generating...' : 'Export PDF'}
                 </button>
               </div>
             </div>
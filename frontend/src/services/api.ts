@@ -4,14 +4,21 @@
 import axios from 'axios';
 import type {
   Airport,
+  AirportCluster,
+  NearbyAirport,
   Aircraft,
   Pilot,
+  PilotListItem,
+  PilotStats,
+  PilotCurrency,
   Flight,
   AirportCreate,
   AircraftCreate,
   PilotCreate,
   FlightCreate,
   DashboardStats,
+  ReportRequest,
+  ReportJob,
 } from '../types';
 
 // Use environment variable for API URL, fallback to relative path for production
@@ -24,6 +31,21 @@ const api = axios.create({
   },
 });
 
+// Read-your-writes with a read replica: echo the stamp of our last write so the
+// backend serves the following reads from the primary until the replica catches up
+let lastWrite: string | undefined;
+
+api.interceptors.response.use((res) => {
+  const stamp = res.headers['x-last-write'];
+  if (stamp) lastWrite = stamp;
+  return res;
+});
+
+api.interceptors.request.use((config) => {
+  if (lastWrite) config.headers['X-Last-Write'] = lastWrite;
+  return config;
+});
+
 // Airports
 export const airportApi = {
   list: (params?: { state?: string; search?: string }) =>
@@ -35,6 +57,20 @@ export const airportApi = {
   getByCode: (icaoCode: string) =>
     api.get<Airport>(`/airports/code/${icaoCode}`).then((res) => res.data),
   
+  nearby: (lat: number, lon: number, radiusNm: number = 50, limit: number = 10) =>
+    api.get<NearbyAirport[]>('/airports/nearby', {
+      params: { lat, lon, radius_nm: radiusNm, limit }
+    }).then((res) => res.data),
+  
+  // bbox: [min_lon, min_lat, max_lon, max_lat]
+  within: (bbox: [number, number, number, number]) =>
+    api.get<Airport[]>('/airports/within', { params: { bbox: bbox.join(',') } }).then((res) => res.data),
+  
+  clusters: (bbox: [number, number, number, number], zoom: number) =>
+    api.get<AirportCluster[]>('/airports/clusters', {
+      params: { bbox: bbox.join(','), zoom }
+    }).then((res) => res.data),
+  
   create: (data: AirportCreate) =>
     api.post<Airport>('/airports', data).then((res) => res.data),
   
@@ -68,12 +104,20 @@ export const aircraftApi = {
 
 // Pilots
 export const pilotApi = {
-  list: (params?: { certificate_type?: string; search?: string; is_active?: boolean }) =>
-    api.get<Pilot[]>('/pilots', { params }).then((res) => res.data),
+  // sort: id, last_name, total_flight_hours, flight_count, cross_country_count
+  // or last_flight_at, prefixed with - for descending
+  list: (params?: { certificate_type?: string; search?: string; is_active?: boolean; sort?: string }) =>
+    api.get<PilotListItem[]>('/pilots', { params }).then((res) => res.data),
   
   get: (id: number) =>
     api.get<Pilot>(`/pilots/${id}`).then((res) => res.data),
   
+  getStats: (id: number) =>
+    api.get<PilotStats>(`/pilots/${id}/stats`).then((res) => res.data),
+  
+  currency: (params?: { days?: number; takeoffs?: number; landings?: number; require_medical?: boolean; is_current?: boolean }) =>
+    api.get<PilotCurrency[]>('/pilots/currency', { params }).then((res) => res.data),
+  
   getByCertificate: (certificateNumber: string) =>
     api.get<Pilot>(`/pilots/certificate/${certificateNumber}`).then((res) => res.data),
   
@@ -88,6 +132,13 @@ export const pilotApi = {
 };
 
 // Flights
+// `fields` / `embed` trim each flight to the listed columns and related objects;
+// omitted keys are simply absent from the returned objects.
+export interface FlightFieldset {
+  fields?: string;
+  embed?: string;
+}
+
 export const flightApi = {
   list: (params?: {
     airport_id?: number;
@@ -100,15 +151,15 @@ export const flightApi = {
     date_to?: string;
     years_back?: number;
     limit?: number;
-  }) =>
+  } & FlightFieldset) =>
     api.get<Flight[]>('/flights', { params }).then((res) => res.data),
   
-  get: (id: number) =>
-    api.get<Flight>(`/flights/${id}`).then((res) => res.data),
+  get: (id: number, fieldset?: FlightFieldset) =>
+    api.get<Flight>(`/flights/${id}`, { params: fieldset }).then((res) => res.data),
   
-  getPilotHistory: (pilotId: number, yearsBack: number = 10, limit: number = 500) =>
+  getPilotHistory: (pilotId: number, yearsBack: number = 10, limit: number = 500, fieldset?: FlightFieldset) =>
     api.get<Flight[]>(`/flights/pilot-history/${pilotId}`, { 
-      params: { years_back: yearsBack, limit } 
+      params: { years_back: yearsBack, limit, ...fieldset } 
     }).then((res) => res.data),
   
   create: (data: FlightCreate) =>
@@ -127,4 +178,39 @@ export const dashboardApi = {
     api.get<DashboardStats>('/dashboard').then((res) => res.data),
 };
 
+// Live movements
+// Server-Sent Events from /stream/movements. EventSource reconnects on its own,
+// sending the last event id so missed movements are replayed; after a `reset`
+// the caller should refetch whatever it shows.
+export type MovementEvent = 'created' | 'updated' | 'deleted' | 'reset';
+
+export const movementApi = {
+  subscribe: (
+    onEvent: (event: MovementEvent, flight: Flight | null) => void,
+    params?: { airport_id?: number; aircraft_id?: number; pilot_id?: number },
+  ) => {
+    const query = new URLSearchParams();
+    Object.entries(params ?? {}).forEach(([key, value]) => {
+      if (value !== undefined) query.set(key, String(value));
+    });
+    const source = new EventSource(`${API_BASE_URL}/stream/movements?${query}`);
+    (['created', 'updated', 'deleted', 'reset'] as MovementEvent[]).forEach((event) =>
+      source.addEventListener(event, (message) => onEvent(event, JSON.parse((message as MessageEvent).data))),
+    );
+    return () => source.close();
+  },
+};
+
+// Reports
+export const reportApi = {
+  create: (data: ReportRequest) =>
+    api.post<ReportJob>('/reports', data).then((res) => res.data),
+  
+  get: (jobId: string) =>
+    api.get<ReportJob>(`/reports/${jobId}`).then((res) => res.data),
+  
+  download: (jobId: string) =>
+    api.get<Blob>(`/reports/${jobId}/download`, { responseType: 'blob' }).then((res) => res.data),
+};
+
 export default api;
@@ -52,6 +52,23 @@ export interface Airport {
   updated_at: string;
 }
 
+export interface NearbyAirport extends Airport {
+  distance_nm: number;
+}
+
+export interface AirportCluster {
+  latitude: number;
+  longitude: number;
+  count: number;
+  weight: number;
+  busiest: {
+    id: number;
+    icao_code: string;
+    name: string;
+    flight_count: number;
+  };
+}
+
 export interface Aircraft {
   id: number;
   tail_number: string;
@@ -90,6 +107,49 @@ export interface Pilot {
   updated_at: string;
 }
 
+// A pilot as listed by GET /pilots, with activity totals
+export interface PilotListItem extends Pilot {
+  flight_count: number;
+  cross_country_count: number;
+  last_flight_at?: string;
+}
+
+export interface PilotStatCount {
+  key: string;
+  label?: string;
+  flight_count: number;
+}
+
+export interface PilotStats {
+  pilot_id: number;
+  flight_count: number;
+  takeoffs: number;
+  landings: number;
+  cross_country_count: number;
+  passengers: number;
+  first_flight_at?: string;
+  last_flight_at?: string;
+  by_year: PilotStatCount[];
+  by_flight_type: PilotStatCount[];
+  by_aircraft_category: PilotStatCount[];
+  by_airport: PilotStatCount[];
+}
+
+// Recency (takeoffs/landings in the window) and medical status of an active pilot
+export interface PilotCurrency {
+  pilot_id: number;
+  first_name: string;
+  last_name: string;
+  certificate_number: string;
+  takeoffs: number;
+  landings: number;
+  takeoffs_current_until?: string;
+  landings_current_until?: string;
+  medical_expiry?: string;
+  is_current: boolean;
+  current_until?: string;
+}
+
 export interface Flight {
   id: number;
   airport_id: number;
@@ -183,3 +243,29 @@ export interface DashboardStats {
     flight_count: number;
   }[];
 }
+
+// Reports
+export type ReportKind = 'pilot_logbook' | 'airport_movements' | 'aircraft';
+
+export interface ReportRequest {
+  kind: ReportKind;
+  pilot_id?: number;
+  airport_id?: number;
+  aircraft_id?: number;
+  flight_type?: string;
+  date_from?: string;
+  date_to?: string;
+  years_back?: number;
+}
+
+export interface ReportJob {
+  id: string;
+  kind: ReportKind;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  created_at: string;
+  finished_at?: string;
+  rows?: number;
+  pages?: number;
+  error?: string;
+  download_url?: string;
+}
@@ -4,7 +4,8 @@
 import jsPDF from 'jspdf';
 import autoTable from 'jspdf-autotable';
 import { format } from 'date-fns';
-import type { Airport, Aircraft, Pilot, Flight } from '../types';
+import { reportApi } from '../services/api';
+import type { Airport, Aircraft, Pilot, ReportRequest } from '../types';
 
 const HEADER_COLOR: [number, number, number] = [30, 58, 138]; // Blue-900
 const ALT_ROW_COLOR: [number, number, number] = [241, 245, 249]; // Slate-100
@@ -112,30 +113,27 @@ export function exportPilotsPDF(pilots: Pilot[]) {
   doc.save(`pilots-report-${format(new Date(), 'yyyy-MM-dd')}.pdf`);
 }
 
-export function exportFlightsPDF(flights: Flight[]) {
-  const doc = new jsPDF('landscape');
-  addHeader(doc, 'Flights Report');
+const REPORT_POLL_INTERVAL_MS = 1000;
 
-  autoTable(doc, {
-    startY: 40,
-    head: [['Date/Time', 'Airport', 'Operation', 'Aircraft', 'Pilot', 'Runway', 'Remarks']],
-    body: flights.map(flight => [
-      format(new Date(flight.actual_time), 'MM/dd/yyyy HH:mm'),
-      flight.airport?.icao_code || '-',
-      flight.operation,
-      flight.aircraft?.tail_number || '-',
-      flight.pilot ? `${flight.pilot.last_name}` : '-',
-      flight.runway || '-',
-      flight.remarks || '-'
-    ]),
-    headStyles: { fillColor: HEADER_COLOR },
-    alternateRowStyles: { fillColor: ALT_ROW_COLOR },
-    styles: { fontSize: 8 },
-    columnStyles: {
-      6: { cellWidth: 50 } // Remarks column wider
-    }
-  });
+/**
+ * Flight reports are rendered by the backend so large logbooks never have to
+ * be pulled into the browser. Queues the report, waits for it and downloads it.
+ */
+export async function exportFlightsReport(request: ReportRequest) {
+  let job = await reportApi.create(request);
+  while (job.status === 'queued' || job.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, REPORT_POLL_INTERVAL_MS));
+    job = await reportApi.get(job.id);
+  }
+  if (job.status === 'failed') {
+    throw new Error(job.error || 'Report generation failed');
+  }
 
-  addFooter(doc);
-  doc.save(`flights-report-${format(new Date(), 'yyyy-MM-dd')}.pdf`);
+  const blob = await reportApi.download(job.id);
+  const url = URL.createObjectURL(blob);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = `${request.kind.replace(/_/g, '-')}-${format(new Date(), 'yyyy-MM-dd')}.pdf`;
+  link.click();
+  URL.revokeObjectURL(url);
 }